@@ -1,13 +1,192 @@
+from __future__ import annotations
+
+from typing import Any
+
+from PyQt6.QtCore import QAbstractListModel, QAbstractProxyModel, QModelIndex, QObject, Qt
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
-    QListWidget,
+    QListView,
     QDialogButtonBox,
     QLabel,
     QLineEdit,
 )
 
 
+def _advance(text: str, chars: str, pos: int, first: int, gaps: int) -> tuple[int, int, int] | None:
+    """Continue matching ``chars`` in order in ``text`` from ``pos``.
+
+    Returns the new scan position, the index of the first matched
+    character and the number of characters skipped after it, or ``None``
+    if some character is missing.
+    """
+    for char in chars:
+        index = text.find(char, pos)
+        if index < 0:
+            return None
+        if first < 0:
+            first = index
+        else:
+            gaps += index - pos
+        pos = index + 1
+    return pos, first, gaps
+
+
+def _rank(text: str, query: str, first: int, gaps: int) -> tuple[int, int, int]:
+    found = text.find(query)
+    if found >= 0:
+        return 0, found, len(text)
+    return 1 + gaps, first, len(text)
+
+
+def fuzzy_key(query: str, text: str) -> tuple[int, int, int] | None:
+    """Return a sort key ranking ``text`` for ``query``, or ``None`` if it does not match.
+
+    ``query`` matches when its characters appear in order, ignoring case.
+    Substring matches rank first, then matches with fewer skipped
+    characters between them, then earlier and shorter ones.
+    """
+    query = query.lower()
+    text = text.lower()
+    scanned = _advance(text, query, 0, -1, 0)
+    if scanned is None:
+        return None
+    return _rank(text, query, scanned[1], scanned[2])
+
+
+class BranchListModel(QAbstractListModel):
+    """Flat list of branch names."""
+
+    def __init__(self, branches: list[str] | None = None, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._branches = list(branches or [])
+
+    def branches(self) -> list[str]:
+        return self._branches
+
+    def set_branches(self, branches: list[str]) -> None:
+        self.beginResetModel()
+        self._branches = list(branches)
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._branches)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and 0 <= index.row() < len(self._branches):
+            return self._branches[index.row()]
+        return None
+
+
+class FuzzyFilterProxyModel(QAbstractProxyModel):
+    """Rows of a :class:`BranchListModel` matching a fuzzy query, best first.
+
+    Scoring is incremental: while the query only grows, just the rows that
+    matched the previous query are scored again, and the subsequence scan
+    of each resumes where the previous query ended.
+    """
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._query = ""
+        # source rows shown, best match first
+        self._rows: list[int] = []
+        self._positions: dict[int, int] | None = None
+        # per matching source row: lower-cased text, scan position, first match and skipped characters
+        self._scan: dict[int, tuple[str, int, int, int]] = {}
+
+    def setSourceModel(self, model: Any) -> None:
+        old = self.sourceModel()
+        if old is not None:
+            old.modelReset.disconnect(self._on_source_reset)
+        super().setSourceModel(model)
+        if model is not None:
+            model.modelReset.connect(self._on_source_reset)
+        self._on_source_reset()
+
+    def query(self) -> str:
+        return self._query
+
+    def set_query(self, query: str) -> None:
+        """Filter by ``query``, reusing the work done for the query it extends."""
+        extends = bool(self._query) and query.startswith(self._query)
+        self.beginResetModel()
+        if extends:
+            self._narrow(query[len(self._query):])
+        else:
+            self._narrow_all(query)
+        self._query = query
+        self._sort()
+        self.endResetModel()
+
+    def _branches(self) -> list[str]:
+        model = self.sourceModel()
+        return model.branches() if isinstance(model, BranchListModel) else []
+
+    def _narrow_all(self, query: str) -> None:
+        self._scan = {row: (text.lower(), 0, -1, 0) for row, text in enumerate(self._branches())}
+        if query:
+            self._narrow(query)
+
+    def _narrow(self, extra: str) -> None:
+        extra = extra.lower()
+        scan: dict[int, tuple[str, int, int, int]] = {}
+        for row, (text, pos, first, gaps) in self._scan.items():
+            scanned = _advance(text, extra, pos, first, gaps)
+            if scanned is not None:
+                scan[row] = (text, *scanned)
+        self._scan = scan
+
+    def _sort(self) -> None:
+        query = self._query.lower()
+        if query:
+            scan = self._scan
+            self._rows = sorted(scan, key=lambda row: (*_rank(scan[row][0], query, scan[row][2], scan[row][3]), row))
+        else:
+            self._rows = sorted(self._scan)
+        self._positions = None
+
+    def _on_source_reset(self) -> None:
+        self.beginResetModel()
+        self._narrow_all(self._query)
+        self._sort()
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else 1
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or column != 0 or not 0 <= row < len(self._rows):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, *args: Any) -> Any:
+        if args:
+            return QModelIndex()
+        return super().parent()
+
+    def mapToSource(self, proxyIndex: QModelIndex) -> QModelIndex:
+        model = self.sourceModel()
+        if model is None or not proxyIndex.isValid() or not 0 <= proxyIndex.row() < len(self._rows):
+            return QModelIndex()
+        return model.index(self._rows[proxyIndex.row()], 0)
+
+    def mapFromSource(self, sourceIndex: QModelIndex) -> QModelIndex:
+        if not sourceIndex.isValid():
+            return QModelIndex()
+        if self._positions is None:
+            self._positions = {row: i for i, row in enumerate(self._rows)}
+        position = self._positions.get(sourceIndex.row())
+        return QModelIndex() if position is None else self.index(position, 0)
+
+    def text(self, row: int) -> str:
+        """Return the branch shown in ``row``."""
+        return self._branches()[self._rows[row]]
+
+
 class BranchDialog(QDialog):
     """Dialog listing branches for selection."""
 
@@ -17,7 +196,9 @@ class BranchDialog(QDialog):
         self.resize(650, 400)
         layout = QVBoxLayout(self)
 
-        self.branches = list(branches)
+        self.model = BranchListModel(branches, self)
+        self.proxy = FuzzyFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
 
         layout.addWidget(QLabel("Search:"))
         self.search_edit = QLineEdit()
@@ -25,8 +206,10 @@ class BranchDialog(QDialog):
         layout.addWidget(self.search_edit)
 
         layout.addWidget(QLabel("Branch:"))
-        self.list_widget = QListWidget()
-        layout.addWidget(self.list_widget)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.proxy)
+        layout.addWidget(self.list_view)
 
         self.update_filter("")
 
@@ -38,17 +221,33 @@ class BranchDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
 
-        self.list_widget.itemDoubleClicked.connect(lambda *_: self.accept())
+        self.list_view.doubleClicked.connect(lambda *_: self.accept())
+
+    @property
+    def branches(self) -> list[str]:
+        return self.model.branches()
+
+    def set_branches(self, branches: list[str]) -> None:
+        """Replace the offered branches, keeping the search and selection."""
+        selected = self.get_branch()
+        self.model.set_branches(branches)
+        self._select(selected)
 
     def update_filter(self, text: str):
-        self.list_widget.clear()
-        text = text.lower()
-        for branch in self.branches:
-            if text in branch.lower():
-                self.list_widget.addItem(branch)
-        if self.list_widget.count() > 0:
-            self.list_widget.setCurrentRow(0)
+        self.proxy.set_query(text)
+        self._select("")
+
+    def _select(self, branch: str) -> None:
+        """Select ``branch`` if it is shown, else the best match."""
+        row = 0
+        if branch:
+            source = self.model.branches()
+            if branch in source:
+                found = self.proxy.mapFromSource(self.model.index(source.index(branch), 0))
+                row = found.row() if found.isValid() else 0
+        if self.proxy.rowCount() > 0:
+            self.list_view.setCurrentIndex(self.proxy.index(row, 0))
 
     def get_branch(self) -> str:
-        item = self.list_widget.currentItem()
-        return item.text() if item else ""
+        index = self.list_view.currentIndex()
+        return self.proxy.text(index.row()) if index.isValid() else ""
@@ -5,9 +5,41 @@ from copy import deepcopy
 # Path used to store user settings
 CONFIG_FILE = Path.home() / ".fusor_config.json"
 
+# Directory for data Fusor can rebuild, such as log indexes
+CACHE_DIR = Path.home() / ".cache" / "fusor"
+
 # Default maximum number of log lines stored per project
 DEFAULT_MAX_LOG_LINES = 1000
 
+# Maximum number of lines kept in the shared console output view
+DEFAULT_MAX_OUTPUT_LINES = 5000
+
+# Worker threads per background job lane.  ``service`` hosts long-running
+# processes such as the dev server, ``command`` runs one-off tool invocations,
+# ``io`` handles background reads and searches for the UI, ``index`` runs
+# bulk passes over whole log files so they never hold up the ``io`` lane and
+# ``follow`` streams container logs; a stopped stream may still be winding
+# down while the next one starts.
+# Override with a ``job_lanes`` mapping in the config file.
+DEFAULT_JOB_LANES = {
+    "service": 2,
+    "command": 4,
+    "io": 2,
+    "index": 1,
+    "follow": 2,
+}
+
+# Maximum number of jobs running at once for the same resource kind within a
+# project.  Kinds without an entry are unlimited.  Override with a
+# ``resource_limits`` mapping in the config file.
+DEFAULT_RESOURCE_LIMITS = {
+    "composer": 1,
+    "npm": 1,
+    "git": 8,
+    # background log refreshes share tail state and must not overlap
+    "logs": 1,
+}
+
 # Default per-project settings
 DEFAULT_PROJECT_SETTINGS = {
     "framework": "Laravel",
@@ -26,6 +58,10 @@ DEFAULT_PROJECT_SETTINGS = {
     "compose_profile": "",
     "auto_refresh_secs": 5,
     "open_browser": False,
+    # keep a searchable history of the project's logs
+    "index_logs": False,
+    # {path: [inode, offset, time]} read up to when the Logs tab was last open
+    "log_bookmarks": {},
     "max_log_lines": DEFAULT_MAX_LOG_LINES,
     "enable_terminal": False,
 }
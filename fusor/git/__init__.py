@@ -0,0 +1,38 @@
+from .diff import DiffFile, DiffSection, DiffStream, Hunk, header_path, parse_name_status
+from .diff_viewer import DiffModel, DiffViewerDialog
+from .remotes import RemoteHeads, RemoteHeadsCache, ls_remote_heads
+from .service import GitService, git_command, parse_progress
+from .state import BranchInfo, GitState, parse_branches, probe_git_state
+from .status import StatusEntry, WorkingTreeStatus, parse_status, probe_status, status_options
+from .watcher import GitWatcher, WorkTreeWatcher, git_dirs, git_watch_paths, worktree_watch_paths
+
+__all__ = [
+    "DiffFile",
+    "DiffSection",
+    "DiffStream",
+    "Hunk",
+    "header_path",
+    "parse_name_status",
+    "DiffModel",
+    "DiffViewerDialog",
+    "RemoteHeads",
+    "RemoteHeadsCache",
+    "ls_remote_heads",
+    "GitService",
+    "git_command",
+    "parse_progress",
+    "BranchInfo",
+    "GitState",
+    "parse_branches",
+    "probe_git_state",
+    "StatusEntry",
+    "WorkingTreeStatus",
+    "parse_status",
+    "probe_status",
+    "status_options",
+    "GitWatcher",
+    "WorkTreeWatcher",
+    "git_dirs",
+    "git_watch_paths",
+    "worktree_watch_paths",
+]
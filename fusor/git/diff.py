@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, NamedTuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+# Files whose diff has more lines than this start collapsed
+COLLAPSE_LINES = 1000
+
+# Seconds between batches of finished files sent to the UI
+BATCH_INTERVAL = 0.1
+
+# Bytes of diff output buffered before they are written to the spool
+SPOOL_CHUNK = 1 << 16
+
+_FILE_STARTS = (b"diff --git ", b"diff --cc ", b"diff --combined ")
+
+# A path git wrapped in double quotes, with C-style escapes inside
+_QUOTED_PATH = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+# One escape in a quoted path: an octal byte or an escaped character
+_ESCAPE = re.compile(rb"\\([0-7]{1,3}|.)", re.DOTALL)
+
+_ESCAPES = {b"a": 7, b"b": 8, b"t": 9, b"n": 10, b"v": 11, b"f": 12, b"r": 13}
+
+
+class DiffFile(NamedTuple):
+    path: str
+    # name-status letter: "M", "A", "D", "R", ...
+    status: str
+    # source of a rename or copy
+    old_path: str = ""
+
+
+class Hunk(NamedTuple):
+    # spool offset of the "@@" line
+    offset: int
+    # bytes and lines up to the next hunk or file
+    size: int
+    lines: int
+
+
+class DiffSection(NamedTuple):
+    """The diff of one file, stored in the spool of a :class:`DiffStream`."""
+
+    # first line, e.g. "diff --git a/app.py b/app.py"
+    header: str
+    hunks: tuple[Hunk, ...] = ()
+    added: int = 0
+    removed: int = 0
+    binary: bool = False
+    # file named by the header, after the change
+    path: str = ""
+
+    @property
+    def lines(self) -> int:
+        return sum(h.lines for h in self.hunks)
+
+    @property
+    def huge(self) -> bool:
+        return self.lines > COLLAPSE_LINES
+
+
+def parse_name_status(output: bytes) -> list[DiffFile]:
+    """Parse ``git diff --name-status -z``."""
+    fields = output.split(b"\0")
+    files: list[DiffFile] = []
+    i = 0
+    while i < len(fields):
+        status = fields[i].decode("utf-8", "replace")
+        i += 1
+        if not status:
+            continue
+        if status[0] in "RC" and i + 1 < len(fields):
+            old, new = fields[i].decode("utf-8", "replace"), fields[i + 1].decode("utf-8", "replace")
+            files.append(DiffFile(new, status[0], old))
+            i += 2
+        elif i < len(fields):
+            files.append(DiffFile(fields[i].decode("utf-8", "replace"), status[0]))
+            i += 1
+    return files
+
+
+def _unquote(text: str) -> str:
+    """Undo the C-style escapes of a path git quoted, e.g. ``\\303\\244``."""
+
+    def unescape(match: re.Match) -> bytes:
+        code = match.group(1)
+        if code[:1].isdigit():
+            return bytes([int(code, 8) & 0xFF])
+        return bytes([_ESCAPES.get(code, code[0])])
+
+    return _ESCAPE.sub(unescape, text.encode("utf-8")).decode("utf-8", "replace")
+
+
+def header_path(header: str) -> str:
+    """Return the path a file header such as ``diff --git a/x b/x`` names after the change.
+
+    The diff must be produced with the ``a/`` and ``b/`` prefixes.
+    """
+    for start in ("diff --cc ", "diff --combined "):
+        if header.startswith(start):
+            path = header[len(start):]
+            return _unquote(path[1:-1]) if path.startswith('"') else path
+    names = header.removeprefix("diff --git ")
+    if names.endswith('"'):
+        return _unquote(_QUOTED_PATH.findall(names)[-1]).removeprefix("b/")
+    if names.startswith('"'):
+        match = _QUOTED_PATH.match(names)
+        if match is not None:
+            return names[match.end():].lstrip().removeprefix("b/")
+    # the names may contain spaces; unless renamed both halves are equal
+    half = len(names) // 2
+    if names[half:half + 1] == " " and names[2:half] == names[half + 3:]:
+        return names[half + 3:]
+    return names.rpartition(" b/")[2]
+
+
+class _SectionBuilder:
+    """Collect the hunks of one file while its diff streams past."""
+
+    def __init__(self, header: bytes) -> None:
+        self.header = header.rstrip(b"\r\n").decode("utf-8", "replace")
+        self.path = header_path(self.header)
+        self.hunks: list[Hunk] = []
+        self.added = 0
+        self.removed = 0
+        self.binary = False
+        self._hunk: tuple[int, int] | None = None
+
+    def continues(self, header: bytes, offset: int) -> bool:
+        """Take over the file starting at ``header`` if it is this file again.
+
+        A type change, e.g. a file replaced by a symlink, is shown as the
+        removal of the old file followed by the addition of the new one.
+        """
+        if header_path(header.rstrip(b"\r\n").decode("utf-8", "replace")) != self.path:
+            return False
+        self._close_hunk(offset)
+        return True
+
+    def add(self, line: bytes, offset: int) -> None:
+        if line.startswith(b"@@"):
+            self._close_hunk(offset)
+            self._hunk = (offset, 0)
+        if self._hunk is None:
+            if line.startswith(b"Binary files ") or line.startswith(b"GIT binary patch"):
+                self.binary = True
+            return
+        self._hunk = (self._hunk[0], self._hunk[1] + 1)
+        if line.startswith(b"+"):
+            self.added += 1
+        elif line.startswith(b"-"):
+            self.removed += 1
+
+    def _close_hunk(self, end: int) -> None:
+        if self._hunk is not None:
+            start, lines = self._hunk
+            self.hunks.append(Hunk(start, end - start, lines))
+            self._hunk = None
+
+    def finish(self, end: int) -> DiffSection:
+        self._close_hunk(end)
+        return DiffSection(self.header, tuple(self.hunks), self.added, self.removed, self.binary, self.path)
+
+
+class DiffStream(QObject):
+    """Stream ``git diff`` into a temporary spool file, one file at a time.
+
+    :attr:`listed` reports the changed files from ``--name-status`` before
+    any diff is produced; :attr:`sections` then delivers the finished
+    files in order, in batches.  Only the byte ranges of files and hunks
+    are kept in memory; their text is read back with :meth:`read` when
+    it is displayed.  Signals are delivered on the UI thread.
+    """
+
+    # list[DiffFile]
+    listed = pyqtSignal(object)
+    # list[DiffSection]
+    sections = pyqtSignal(object)
+    # True if git exited successfully
+    finished = pyqtSignal(bool)
+
+    def __init__(self, path: str, args: list[str] | None = None, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.path = path
+        self.args = list(args or [])
+        self._lock = threading.Lock()
+        self._spool: Any = tempfile.TemporaryFile()
+        self._process: subprocess.Popen | None = None
+        self._closed = False
+
+    def start(self, executor: Any = None) -> None:
+        """Run git on ``executor``, or right away without one."""
+        if executor is None:
+            self._run()
+        else:
+            executor.submit(self._run, resource=f"git:{self.path}")
+
+    def read(self, offset: int, size: int) -> bytes:
+        """Return ``size`` bytes of diff output starting at ``offset``."""
+        with self._lock:
+            if self._closed:
+                return b""
+            self._spool.seek(offset)
+            return self._spool.read(size)
+
+    def close(self) -> None:
+        """Stop git if it still runs and drop the spool."""
+        with self._lock:
+            self._closed = True
+            process = self._process
+            self._spool.close()
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+    def _write(self, data: bytes | bytearray) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            self._spool.seek(0, 2)
+            self._spool.write(data)
+            self._spool.flush()
+            return True
+
+    def _run(self) -> None:
+        ok = False
+        try:
+            ok = self._stream()
+        except OSError as e:
+            print(f"Failed to run git diff: {e}")
+        finally:
+            self.finished.emit(ok)
+
+    def _stream(self) -> bool:
+        listing = subprocess.run(
+            ["git", "diff", "--name-status", "-z", *self.args],
+            capture_output=True,
+            cwd=self.path,
+        )
+        if listing.returncode != 0:
+            print(listing.stderr.decode("utf-8", "replace").strip())
+            return False
+        self.listed.emit(parse_name_status(listing.stdout))
+
+        process = subprocess.Popen(
+            # fixed prefixes whatever diff.noprefix or diff.mnemonicPrefix say
+            ["git", "diff", "--no-color", "--no-ext-diff", "--src-prefix=a/", "--dst-prefix=b/", *self.args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.path,
+        )
+        with self._lock:
+            self._process = process
+            if self._closed:
+                process.terminate()
+        offset = 0
+        buffer = bytearray()
+        current: _SectionBuilder | None = None
+        done: list[DiffSection] = []
+        sent = time.monotonic()
+        stdout = process.stdout
+        if stdout is not None:
+            for line in iter(stdout.readline, b""):
+                if line.startswith(_FILE_STARTS):
+                    if current is None or not current.continues(line, offset):
+                        if current is not None:
+                            done.append(current.finish(offset))
+                        current = _SectionBuilder(line)
+                elif current is not None:
+                    current.add(line, offset)
+                buffer += line
+                offset += len(line)
+                # a batch may only refer to bytes already in the spool
+                if len(buffer) >= SPOOL_CHUNK or (done and time.monotonic() - sent >= BATCH_INTERVAL):
+                    if not self._write(buffer):
+                        break
+                    buffer.clear()
+                    if done and time.monotonic() - sent >= BATCH_INTERVAL:
+                        self.sections.emit(done)
+                        done = []
+                        sent = time.monotonic()
+            stdout.close()
+        if current is not None:
+            done.append(current.finish(offset))
+        if self._write(buffer) and done:
+            self.sections.emit(done)
+        returncode = process.wait()
+        with self._lock:
+            self._process = None
+        return returncode == 0 and not self._closed
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import bisect
+from array import array
+from collections import Counter, OrderedDict
+from typing import Any
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor, QFont, QFontDatabase
+from PyQt6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QHBoxLayout,
+    QLabel,
+    QListView,
+    QPushButton,
+    QVBoxLayout,
+)
+
+from ..logs.viewer import MAX_DISPLAY_CHARS
+from .diff import DiffFile, DiffSection, DiffStream
+
+# Hunks whose line offsets are kept after they scrolled out of view
+CACHED_HUNKS = 64
+
+# Text colors of diff lines by their first character
+LINE_COLORS = {
+    "+": Qt.GlobalColor.darkGreen,
+    "-": Qt.GlobalColor.red,
+    "@": Qt.GlobalColor.darkCyan,
+}
+
+
+class DiffModel(QAbstractListModel):
+    """Rows of a streamed diff: a header per file followed by its lines.
+
+    Files appear as soon as they are listed and gain their lines once
+    their diff has streamed in; diffs are matched to listed files by path.
+    Huge and binary files start collapsed; clicking a header row toggles
+    it with :meth:`toggle`.  The lines of a hunk are located in the spool
+    only when one of them is painted.
+    """
+
+    def __init__(self, stream: DiffStream, parent=None) -> None:
+        super().__init__(parent)
+        self._stream = stream
+        # listed files in row order: those loaded first, then those loading
+        self._files: list[DiffFile] = []
+        # listed files per path whose diff has not arrived yet
+        self._pending: Counter[str] = Counter()
+        self._sections: list[DiffSection] = []
+        # lines added and removed in the streamed sections
+        self._added = 0
+        self._removed = 0
+        self._expanded: list[bool] = []
+        # first row of every file whose diff has arrived; the headers of
+        # the files still loading follow them one row each
+        self._starts: list[int] = []
+        self._loaded_rows = 0
+        self._rows = 0
+        # first line of every hunk, per file
+        self._hunk_starts: list[list[int]] = []
+        # line offsets within hunks, least recently painted first
+        self._offsets: OrderedDict[tuple[int, int], array] = OrderedDict()
+        self.complete = False
+        self._bold = QFont()
+        self._bold.setBold(True)
+        stream.listed.connect(self._on_listed)
+        stream.sections.connect(self._on_sections)
+        stream.finished.connect(self._on_finished)
+
+    def file_count(self) -> int:
+        return len(self._expanded)
+
+    def totals(self) -> tuple[int, int]:
+        """Return the lines added and removed in the files streamed so far."""
+        return self._added, self._removed
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def start(self, file: int) -> int:
+        """Return the row of the header of ``file``."""
+        if file < len(self._starts):
+            return self._starts[file]
+        return self._loaded_rows + file - len(self._starts)
+
+    def locate(self, row: int) -> tuple[int, int]:
+        """Return the file shown at ``row`` and its line there, ``-1`` for the header."""
+        if row >= self._loaded_rows:
+            return len(self._starts) + row - self._loaded_rows, -1
+        file = bisect.bisect_right(self._starts, row) - 1
+        return file, row - self._starts[file] - 1
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < self._rows:
+            return None
+        file, line = self.locate(index.row())
+        if line < 0:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._header_text(file)
+            if role == Qt.ItemDataRole.FontRole:
+                return self._bold
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._line_text(file, line)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            color = LINE_COLORS.get(self._line_text(file, line)[:1])
+            return QColor(color) if color is not None else None
+        return None
+
+    def is_expanded(self, file: int) -> bool:
+        return self._expanded[file]
+
+    def toggle(self, row: int) -> None:
+        """Expand or collapse the file whose header is at ``row``."""
+        file, line = self.locate(row)
+        if line < 0:
+            self.set_expanded(file, not self._expanded[file])
+
+    def set_expanded(self, file: int, expanded: bool) -> None:
+        """Show or hide the lines of ``file`` once its diff has arrived."""
+        if file >= len(self._sections) or self._expanded[file] == expanded:
+            return
+        lines = self._sections[file].lines
+        first = self._starts[file] + 1
+        if lines and expanded:
+            self.beginInsertRows(QModelIndex(), first, first + lines - 1)
+        elif lines:
+            self.beginRemoveRows(QModelIndex(), first, first + lines - 1)
+        self._expanded[file] = expanded
+        self._relayout(file + 1)
+        if lines and expanded:
+            self.endInsertRows()
+        elif lines:
+            self.endRemoveRows()
+        header = self.index(first - 1, 0)
+        self.dataChanged.emit(header, header)
+
+    def set_all_expanded(self, expanded: bool) -> None:
+        self.beginResetModel()
+        for file in range(len(self._sections)):
+            self._expanded[file] = expanded
+        self._relayout(0)
+        self.endResetModel()
+
+    def _file_rows(self, file: int) -> int:
+        return 1 + self._sections[file].lines if self._expanded[file] else 1
+
+    def _relayout(self, first: int) -> None:
+        """Recompute the rows of the loaded files from ``first`` on."""
+        del self._starts[first:]
+        row = self._starts[-1] + self._file_rows(first - 1) if self._starts else 0
+        for file in range(first, len(self._sections)):
+            self._starts.append(row)
+            row += self._file_rows(file)
+        self._loaded_rows = row
+        self._rows = row + len(self._expanded) - len(self._sections)
+
+    def _on_listed(self, files: list[DiffFile]) -> None:
+        self._files = list(files)
+        self._pending = Counter(f.path for f in files)
+        count = len(files) - len(self._expanded)
+        if count > 0:
+            self.beginInsertRows(QModelIndex(), self._rows, self._rows + count - 1)
+            self._expanded += [False] * count
+            self._rows += count
+            self.endInsertRows()
+
+    def _on_sections(self, sections: list[DiffSection]) -> None:
+        for section in sections:
+            file = len(self._sections)
+            start = self._loaded_rows
+            if not self._take_listed(section.path, file):
+                # not listed, e.g. changed after the listing
+                self.beginInsertRows(QModelIndex(), start, start)
+                self._files.insert(file, DiffFile(section.path, ""))
+                self._expanded.insert(file, False)
+                self._rows += 1
+                self.endInsertRows()
+            expanded = not (section.huge or section.binary)
+            lines = section.lines if expanded else 0
+            if lines:
+                self.beginInsertRows(QModelIndex(), start + 1, start + lines)
+            starts = []
+            line = 0
+            for hunk in section.hunks:
+                starts.append(line)
+                line += hunk.lines
+            self._hunk_starts.append(starts)
+            self._sections.append(section)
+            self._added += section.added
+            self._removed += section.removed
+            self._expanded[file] = expanded
+            self._starts.append(start)
+            self._loaded_rows = start + 1 + lines
+            self._rows += lines
+            if lines:
+                self.endInsertRows()
+            header = self.index(start, 0)
+            self.dataChanged.emit(header, header)
+
+    def _take_listed(self, path: str, file: int) -> bool:
+        """Move the listed entry of ``path`` still loading to position ``file``."""
+        if not self._pending[path]:
+            return False
+        self._pending[path] -= 1
+        found = next(i for i in range(file, len(self._files)) if self._files[i].path == path)
+        if found != file:
+            self._files.insert(file, self._files.pop(found))
+            # the headers of the files still loading in between moved down
+            self.dataChanged.emit(self.index(self._loaded_rows, 0), self.index(self._loaded_rows + found - file, 0))
+        return True
+
+    def _on_finished(self, _ok: bool) -> None:
+        self.complete = True
+        # files listed but missing from the diff now read "no changes"
+        if self._loaded_rows < self._rows:
+            self.dataChanged.emit(self.index(self._loaded_rows, 0), self.index(self._rows - 1, 0))
+
+    def _header_text(self, file: int) -> str:
+        entry = self._files[file]
+        if entry.status:
+            name = f"{entry.old_path} → {entry.path}" if entry.old_path else entry.path
+            text = f"{entry.status} {name}"
+        else:
+            text = self._sections[file].header
+        if file >= len(self._sections):
+            return f"  {text}  {'(no changes)' if self.complete else '(loading…)'}"
+        section = self._sections[file]
+        marker = "▾" if self._expanded[file] else "▸"
+        if section.binary:
+            return f"{marker} {text}  (binary)"
+        summary = f"+{section.added} −{section.removed}"
+        if not self._expanded[file] and section.huge:
+            summary += f", {section.lines} lines collapsed"
+        return f"{marker} {text}  {summary}"
+
+    def _line_text(self, file: int, line: int) -> str:
+        starts = self._hunk_starts[file]
+        number = bisect.bisect_right(starts, line) - 1
+        hunk = self._sections[file].hunks[number]
+        offsets = self._hunk_offsets(file, number)
+        row = line - starts[number]
+        start = offsets[row]
+        end = offsets[row + 1] if row + 1 < len(offsets) else hunk.size
+        data = self._stream.read(hunk.offset + start, min(end - start, MAX_DISPLAY_CHARS * 4))
+        return data.rstrip(b"\r\n").decode("utf-8", "replace")[:MAX_DISPLAY_CHARS]
+
+    def _hunk_offsets(self, file: int, number: int) -> array:
+        key = (file, number)
+        offsets = self._offsets.get(key)
+        if offsets is not None:
+            self._offsets.move_to_end(key)
+            return offsets
+        hunk = self._sections[file].hunks[number]
+        data = self._stream.read(hunk.offset, hunk.size)
+        offsets = array("q", [0])
+        pos = data.find(b"\n")
+        while pos != -1 and len(offsets) < hunk.lines:
+            offsets.append(pos + 1)
+            pos = data.find(b"\n", pos + 1)
+        self._offsets[key] = offsets
+        if len(self._offsets) > CACHED_HUNKS:
+            self._offsets.popitem(last=False)
+        return offsets
+
+
+class DiffViewerDialog(QDialog):
+    """Browse ``git diff`` output of any size while it is still streaming."""
+
+    def __init__(self, path: str, args: list[str] | None = None, executor: Any = None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diff")
+        self.resize(1000, 700)
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel("Loading…")
+        layout.addWidget(self.summary_label)
+
+        # not parented to the dialog: a worker may still emit after it closes
+        self.stream = DiffStream(path, args)
+        self.model = DiffModel(self.stream, self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.list_view.setModel(self.model)
+        self.list_view.clicked.connect(lambda index: self.model.toggle(index.row()))
+        layout.addWidget(self.list_view)
+
+        nav_layout = QHBoxLayout()
+        expand_btn = QPushButton("Expand All")
+        expand_btn.clicked.connect(lambda: self.model.set_all_expanded(True))
+        nav_layout.addWidget(expand_btn)
+        collapse_btn = QPushButton("Collapse All")
+        collapse_btn.clicked.connect(lambda: self.model.set_all_expanded(False))
+        nav_layout.addWidget(collapse_btn)
+        nav_layout.addStretch(1)
+        layout.addLayout(nav_layout)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.model.rowsInserted.connect(self.update_summary)
+        self.model.dataChanged.connect(self.update_summary)
+        self.stream.finished.connect(lambda _ok: self.update_summary())
+        self.finished.connect(lambda _result: self.stream.close())
+        self.stream.start(executor)
+
+    def update_summary(self, *_args: Any) -> None:
+        added, removed = self.model.totals()
+        files = self.model.file_count()
+        text = f"{files} file{'s' if files != 1 else ''} changed, +{added} −{removed}"
+        if not self.model.complete:
+            text += " …"
+        self.summary_label.setText(text)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import builtins
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from ..config import CACHE_DIR
+
+# allow tests to monkeypatch file operations easily
+open = builtins.open
+
+# Where remote branch lists survive between sessions
+REMOTE_HEADS_FILE = CACHE_DIR / "remote_heads.json"
+
+# Age in seconds after which a cached remote branch list is fetched again
+REMOTE_HEADS_TTL = 300
+
+
+class RemoteHeads(NamedTuple):
+    """Branches of a remote and when they were listed."""
+
+    branches: tuple[str, ...]
+    fetched: float
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) - self.fetched < REMOTE_HEADS_TTL
+
+
+def ls_remote_heads(path: str, remote: str) -> list[str] | None:
+    """Return the branch names of ``remote``, or ``None`` if listing failed."""
+    try:
+        result = subprocess.run(
+            ["git", "ls-remote", "--heads", remote],
+            capture_output=True,
+            text=True,
+            cwd=path,
+        )
+    except FileNotFoundError:
+        print("Command not found: git")
+        return None
+    if result.returncode != 0:
+        if result.stderr:
+            print(result.stderr.strip())
+        return None
+    branches = []
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[1].startswith("refs/heads/"):
+            branches.append(parts[1].split("/", 2)[2])
+    return branches
+
+
+class RemoteHeadsCache:
+    """Remote branch lists per project and remote, stored as JSON on disk.
+
+    The file is read on first use and rewritten whenever a list is
+    stored; entries older than ``REMOTE_HEADS_TTL`` stay usable but report
+    themselves stale so callers refetch them in the background.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path if path is not None else REMOTE_HEADS_FILE
+        self._entries: dict[str, dict[str, RemoteHeads]] | None = None
+
+    def _load(self) -> dict[str, dict[str, RemoteHeads]]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self._entries
+        if not isinstance(data, dict):
+            return self._entries
+        for project, remotes in data.items():
+            if not isinstance(remotes, dict):
+                continue
+            for remote, entry in remotes.items():
+                try:
+                    heads = RemoteHeads(tuple(str(b) for b in entry["branches"]), float(entry["fetched"]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+                self._entries.setdefault(project, {})[remote] = heads
+        return self._entries
+
+    def get(self, project: str, remote: str) -> RemoteHeads | None:
+        return self._load().get(project, {}).get(remote)
+
+    def put(self, project: str, remote: str, branches: list[str], fetched: float | None = None) -> RemoteHeads:
+        heads = RemoteHeads(tuple(branches), fetched if fetched is not None else time.time())
+        self._load().setdefault(project, {})[remote] = heads
+        self.save()
+        return heads
+
+    def expire(self, project: str) -> None:
+        """Mark every list of ``project`` stale, keeping it for display."""
+        remotes = self._load().get(project, {})
+        for remote, heads in remotes.items():
+            remotes[remote] = heads._replace(fetched=0.0)
+        if remotes:
+            self.save()
+
+    def save(self) -> None:
+        data = {
+            project: {remote: {"branches": list(h.branches), "fetched": h.fetched} for remote, h in remotes.items()}
+            for project, remotes in self._load().items()
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Failed to write remote branch cache: {e}")
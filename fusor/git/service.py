@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import re
+import subprocess
+import threading
+from collections import deque
+from typing import Any, Callable
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from ..jobs import COMMAND_TAIL_LINES, CommandResult, stream_command
+from .remotes import RemoteHeads, RemoteHeadsCache, ls_remote_heads
+from .state import GitState, probe_git_state
+from .status import WorkingTreeStatus, forget_fsmonitor, probe_status
+from .watcher import GitWatcher, WorkTreeWatcher
+
+# Subcommands that report transfer progress when given ``--progress``
+PROGRESS_COMMANDS = frozenset({"checkout", "clone", "fetch", "pull", "push"})
+
+# Subcommands after which cached remote branch lists may be outdated
+REMOTE_COMMANDS = frozenset({"fetch", "pull", "push"})
+
+# "Receiving objects:  45% (123/456), 1.20 MiB | 2.40 MiB/s"
+PROGRESS_PATTERN = re.compile(r"(?:remote: )?(?P<phase>[A-Za-z][A-Za-z ]*?):\s+(?P<percent>\d{1,3})%")
+
+
+def parse_progress(line: str) -> tuple[str, int] | None:
+    """Return the phase and percentage of a git ``--progress`` line."""
+    match = PROGRESS_PATTERN.match(line)
+    if match is None:
+        return None
+    return match.group("phase"), min(int(match.group("percent")), 100)
+
+
+def git_command(args: list[str]) -> list[str]:
+    """Return the git command line for ``args``, asking for progress where supported."""
+    if args and args[0] in PROGRESS_COMMANDS and "--progress" not in args:
+        return ["git", args[0], "--progress", *args[1:]]
+    return ["git", *args]
+
+
+def _changed_paths(status: WorkingTreeStatus) -> list[str]:
+    return [e.path for e in (*status.staged, *status.unstaged, *status.untracked, *status.conflicted)]
+
+
+class GitService(QObject):
+    """Run git for the UI on worker threads.
+
+    Commands that change the repository run one at a time; :attr:`busy`
+    is ``True`` while one is active and :meth:`cancel` terminates it.
+    Their output is printed line by line, except ``--progress`` updates
+    which are reported through :attr:`progress`.  Read-only lookups go
+    through :meth:`query`.  The branch and remote state of the repository
+    passed to :meth:`watch` is probed once and then served from memory
+    until its HEAD, refs or index change on disk; other repositories are
+    probed on every request.  Remote branch lists are fetched in the
+    background and kept in a :class:`RemoteHeadsCache` on disk.  The work
+    tree status is probed on request through :meth:`refresh_status`;
+    edits around its pending changes are reported by
+    :attr:`worktree_changed`.
+    Callbacks are always invoked on the UI thread.
+    """
+
+    # phase and percentage of the running command
+    progress = pyqtSignal(str, int)
+    # emitted when a command starts and when it finishes
+    busy_changed = pyqtSignal(bool)
+    # work tree path of the watched repository after its state changed
+    state_changed = pyqtSignal(str)
+    # work tree path and remote whose branch list was fetched
+    remote_heads_changed = pyqtSignal(str, str)
+    # work tree path whose status was probed
+    status_changed = pyqtSignal(str)
+    # work tree path of the watched repository after files changed in it
+    worktree_changed = pyqtSignal(str)
+    _done = pyqtSignal(int, object)
+    _answered = pyqtSignal(int, object)
+
+    def __init__(self, executor: Any = None, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._process: subprocess.Popen | None = None
+        self._cancelled = False
+        self._jobs = 0
+        self._running: int | None = None
+        self._callbacks: dict[int, Callable[[Any], None] | None] = {}
+        self._states: dict[str, GitState] = {}
+        # epoch and waiting callbacks of the probe in flight, per repository
+        self._probing: dict[str, tuple[int, list[Callable[[GitState | None], None]]]] = {}
+        # bumped by invalidate() so probes started before are not cached
+        self._epoch = 0
+        self.remote_heads_cache = RemoteHeadsCache()
+        self._listing: set[tuple[str, str]] = set()
+        self._watcher = GitWatcher(self)
+        self._watcher.changed.connect(self._on_repository_changed)
+        self._statuses: dict[str, WorkingTreeStatus] = {}
+        # whether another status probe was requested while one runs, per work tree
+        self._status_running: dict[str, bool] = {}
+        self._worktree = WorkTreeWatcher(self)
+        self._worktree.changed.connect(lambda: self.worktree_changed.emit(self._worktree.path))
+        self._done.connect(self._on_done)
+        self._answered.connect(self._on_answered)
+
+    @property
+    def busy(self) -> bool:
+        return self._running is not None
+
+    def run(
+        self,
+        args: list[str],
+        cwd: str,
+        callback: Callable[[CommandResult | None], None] | None = None,
+    ) -> bool:
+        """Run ``git args`` in ``cwd`` and pass the result to ``callback``.
+
+        Returns ``False`` without running anything while another command
+        is still active.  The result is ``None`` if git could not start.
+        """
+        if self.busy:
+            print("Another git command is still running")
+            return False
+        command = git_command(args)
+        self._jobs += 1
+        job = self._jobs
+        self._running = job
+        self._cancelled = False
+        self._callbacks[job] = callback
+        self.busy_changed.emit(True)
+
+        def task() -> None:
+            result = None
+            try:
+                result = self._execute(command, cwd)
+            except FileNotFoundError:
+                print("Command not found: git")
+            finally:
+                self._done.emit(job, (cwd, command[1] if len(command) > 1 else "", result))
+
+        print(f"$ {' '.join(command)}")
+        if self.executor is None:
+            task()
+        else:
+            self.executor.submit(task, resource=f"git:{cwd}")
+        return True
+
+    def cancel(self) -> None:
+        """Terminate the running command, or stop it as soon as it starts."""
+        if not self.busy:
+            return
+        print("Cancelling git command")
+        with self._lock:
+            process = self._process
+            # a command still queued is terminated by _execute once started
+            self._cancelled = True
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+    def query(self, fn: Callable[[], Any], callback: Callable[[Any], None], lane: str = "io") -> None:
+        """Call ``fn`` on a worker of ``lane`` and pass its return value to ``callback``."""
+        self._jobs += 1
+        job = self._jobs
+        self._callbacks[job] = callback
+
+        def task() -> None:
+            result = None
+            try:
+                result = fn()
+            finally:
+                self._answered.emit(job, result)
+
+        if self.executor is None:
+            task()
+        else:
+            self.executor.submit(task, lane=lane)
+
+    def state(
+        self,
+        path: str,
+        callback: Callable[[GitState | None], None],
+        refresh: bool = False,
+    ) -> None:
+        """Pass the state of the repository at ``path`` to ``callback``.
+
+        The cached state is used unless ``refresh`` is set or the
+        repository is not watched; callers asking while a probe is in
+        flight share its result.
+        """
+        if not refresh and self.is_watched(path) and path in self._states:
+            callback(self._states[path])
+            return
+        pending = self._probing.get(path)
+        if pending is not None and pending[0] == self._epoch:
+            pending[1].append(callback)
+            return
+        epoch = self._epoch
+        callbacks = [callback]
+        self._probing[path] = (epoch, callbacks)
+
+        def done(state: GitState | None) -> None:
+            if self._probing.get(path, (0, None))[1] is callbacks:
+                del self._probing[path]
+            if state is not None and epoch == self._epoch:
+                self._states[path] = state
+            for waiting in callbacks:
+                waiting(state)
+
+        self.query(lambda: probe_git_state(path), done)
+
+    def cached_state(self, path: str) -> GitState | None:
+        return self._states.get(path)
+
+    def watch(self, path: str) -> None:
+        """Keep the cached state of the repository at ``path`` current; empty stops watching."""
+        if path != self._watcher.path:
+            # changes made while it was not watched went unnoticed
+            self.invalidate(path)
+        self._watcher.watch(path)
+        status = self._statuses.get(path)
+        self._worktree.watch(path, _changed_paths(status) if status is not None else ())
+
+    def is_watched(self, path: str) -> bool:
+        """Return ``True`` if every change of ``path`` invalidates its cached state."""
+        return bool(path) and path == self._watcher.path and self._watcher.is_reliable()
+
+    def _on_repository_changed(self) -> None:
+        path = self._watcher.path
+        self.invalidate(path)
+        self.state_changed.emit(path)
+
+    def invalidate(self, path: str | None = None) -> None:
+        """Forget the cached state of ``path`` or of every repository."""
+        self._epoch += 1
+        forget_fsmonitor()
+        if path is None:
+            self._states.clear()
+        else:
+            self._states.pop(path, None)
+
+    def refresh_status(self, path: str, write_index: bool = False) -> None:
+        """Probe the work tree status of ``path`` and emit :attr:`status_changed`.
+
+        Requests made while a probe runs are folded into a single probe
+        after it.  ``write_index`` lets git store refreshed file stats and
+        the untracked cache in the index, which speeds up later probes.
+        """
+        if path in self._status_running:
+            self._status_running[path] = True
+            return
+        self._status_running[path] = False
+
+        def done(status: WorkingTreeStatus | None) -> None:
+            again = self._status_running.pop(path, False)
+            if status is not None:
+                self._statuses[path] = status
+                if path == self._worktree.path:
+                    self._worktree.watch(path, _changed_paths(status))
+                self.status_changed.emit(path)
+            if again:
+                self.refresh_status(path)
+
+        self.query(lambda: probe_status(path, write_index), done)
+
+    def cached_status(self, path: str) -> WorkingTreeStatus | None:
+        return self._statuses.get(path)
+
+    def remote_heads(self, path: str, remote: str) -> RemoteHeads | None:
+        """Return the cached branches of ``remote``, possibly stale."""
+        if not path or not remote:
+            return None
+        return self.remote_heads_cache.get(path, remote)
+
+    def prefetch_remote_heads(self, path: str, remote: str, force: bool = False) -> None:
+        """List the branches of ``remote`` in the background unless the cached list is fresh.
+
+        :attr:`remote_heads_changed` is emitted once the new list is cached.
+        """
+        if not path or not remote:
+            return
+        key = (path, remote)
+        cached = self.remote_heads_cache.get(path, remote)
+        if key in self._listing or (not force and cached is not None and cached.is_fresh()):
+            return
+        self._listing.add(key)
+
+        def done(branches: list[str] | None) -> None:
+            self._listing.discard(key)
+            if branches is None:
+                return
+            self.remote_heads_cache.put(path, remote, branches)
+            self.remote_heads_changed.emit(path, remote)
+
+        # a network round trip, kept off the lane serving log refreshes
+        self.query(lambda: ls_remote_heads(path, remote), done, lane="command")
+
+    def _execute(self, command: list[str], cwd: str) -> CommandResult:
+        tail: deque[str] = deque(maxlen=COMMAND_TAIL_LINES)
+        last: tuple[str, int] | None = None
+
+        def started(process: subprocess.Popen) -> None:
+            with self._lock:
+                self._process = process
+                if self._cancelled:
+                    process.terminate()
+
+        def on_line(line: str) -> None:
+            nonlocal last
+            line = line.strip()
+            if not line:
+                return
+            progress = parse_progress(line)
+            if progress is None:
+                tail.append(line)
+                print(line)
+            elif progress != last:
+                last = progress
+                self.progress.emit(*progress)
+
+        try:
+            # the tail leaves out progress lines, so it is collected here
+            result = stream_command(command, on_line, cwd=cwd, tail_lines=0, on_start=started)
+        finally:
+            with self._lock:
+                self._process = None
+                if self._cancelled:
+                    print(f"Cancelled: {' '.join(command)}")
+        return CommandResult(result.returncode, list(tail))
+
+    def _on_done(self, job: int, payload: tuple[str, str, CommandResult | None]) -> None:
+        cwd, subcommand, result = payload
+        # the command may have moved HEAD, created branches or added remotes
+        self.invalidate(cwd)
+        if subcommand in REMOTE_COMMANDS:
+            self.remote_heads_cache.expire(cwd)
+        callback = self._callbacks.pop(job, None)
+        if self._running == job:
+            self._running = None
+            self.busy_changed.emit(False)
+        if callback is not None:
+            callback(result)
+
+    def _on_answered(self, job: int, result: Any) -> None:
+        callback = self._callbacks.pop(job, None)
+        if callback is not None:
+            callback(result)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import re
+import subprocess
+from typing import NamedTuple
+
+# One line per local branch: current marker, name, upstream and its distance
+BRANCH_FORMAT = "%(HEAD)%00%(refname:short)%00%(upstream:short)%00%(upstream:track,nobracket)"
+
+_TRACK_PATTERN = re.compile(r"(ahead|behind) (\d+)")
+
+
+class BranchInfo(NamedTuple):
+    name: str
+    # "origin/main", empty without an upstream
+    upstream: str = ""
+    ahead: int = 0
+    behind: int = 0
+
+
+class GitState(NamedTuple):
+    """Snapshot of a repository's branches and remotes."""
+
+    # current branch, "HEAD" when detached
+    head: str
+    branches: tuple[BranchInfo, ...] = ()
+    remotes: tuple[str, ...] = ()
+
+    @property
+    def current(self) -> BranchInfo | None:
+        return next((b for b in self.branches if b.name == self.head), None)
+
+    def branch_names(self) -> list[str]:
+        return [b.name for b in self.branches]
+
+
+def parse_branches(output: str) -> tuple[str, list[BranchInfo]]:
+    """Parse ``git for-each-ref --format=BRANCH_FORMAT refs/heads``.
+
+    Returns the current branch, empty when HEAD is detached or unborn,
+    and all local branches.
+    """
+    head = ""
+    branches: list[BranchInfo] = []
+    for line in output.splitlines():
+        fields = line.split("\0")
+        if len(fields) != 4 or not fields[1]:
+            continue
+        marker, name, upstream, track = fields
+        counts = dict(_TRACK_PATTERN.findall(track))
+        branches.append(
+            BranchInfo(name, upstream, int(counts.get("ahead", 0)), int(counts.get("behind", 0)))
+        )
+        if marker == "*":
+            head = name
+    return head, branches
+
+
+def _git(args: list[str], cwd: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(["git", *args], capture_output=True, text=True, cwd=cwd)
+
+
+def probe_git_state(path: str) -> GitState | None:
+    """Return the branches and remotes of the repository at ``path``.
+
+    A single ``for-each-ref`` reports HEAD, every local branch and how
+    far it is from its upstream; ``git remote`` adds remotes that have no
+    fetched refs yet.  Only a detached or unborn HEAD costs one more
+    process.  Returns ``None`` if git cannot run there.
+    """
+    try:
+        refs = _git(["for-each-ref", f"--format={BRANCH_FORMAT}", "refs/heads"], path)
+        if refs.returncode != 0:
+            return None
+        head, branches = parse_branches(refs.stdout)
+        if not head:
+            symbolic = _git(["symbolic-ref", "--quiet", "--short", "HEAD"], path)
+            head = symbolic.stdout.strip() or "HEAD"
+        remotes = _git(["remote"], path)
+    except OSError as e:
+        print(f"Failed to run git: {e}")
+        return None
+    return GitState(
+        head,
+        tuple(branches),
+        tuple(r.strip() for r in remotes.stdout.splitlines() if r.strip()),
+    )
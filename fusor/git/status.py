@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import functools
+import re
+import subprocess
+import sys
+from typing import NamedTuple
+
+# Platforms where Git ships the built-in filesystem monitor daemon
+FSMONITOR_PLATFORMS = frozenset({"darwin", "win32"})
+
+# First Git release with the built-in filesystem monitor
+FSMONITOR_MIN_VERSION = (2, 36)
+
+_VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)")
+
+
+class StatusEntry(NamedTuple):
+    path: str
+    # porcelain v2 "XY" code: index then work tree, "." when unchanged
+    code: str
+    # source of a rename or copy
+    orig_path: str = ""
+
+
+class WorkingTreeStatus(NamedTuple):
+    """Changed files of a work tree, grouped as ``git status`` shows them."""
+
+    staged: tuple[StatusEntry, ...] = ()
+    unstaged: tuple[StatusEntry, ...] = ()
+    untracked: tuple[StatusEntry, ...] = ()
+    conflicted: tuple[StatusEntry, ...] = ()
+
+    def is_clean(self) -> bool:
+        return not (self.staged or self.unstaged or self.untracked or self.conflicted)
+
+
+def parse_status(output: bytes) -> WorkingTreeStatus:
+    """Parse ``git status --porcelain=v2 -z``.
+
+    A file changed both in the index and in the work tree is listed as
+    staged and as unstaged.  Ignored files and header lines are skipped.
+    """
+    staged: list[StatusEntry] = []
+    unstaged: list[StatusEntry] = []
+    untracked: list[StatusEntry] = []
+    conflicted: list[StatusEntry] = []
+    records = output.split(b"\0")
+    i = 0
+    while i < len(records):
+        record = records[i].decode("utf-8", "replace")
+        i += 1
+        kind = record[:1]
+        orig = ""
+        if kind == "?":
+            untracked.append(StatusEntry(record[2:], "??"))
+            continue
+        if kind == "1":
+            fields = record.split(" ", 8)
+        elif kind == "2":
+            fields = record.split(" ", 9)
+            # the rename source follows as its own record
+            if i < len(records):
+                orig = records[i].decode("utf-8", "replace")
+                i += 1
+        elif kind == "u":
+            fields = record.split(" ", 10)
+            if len(fields) == 11:
+                conflicted.append(StatusEntry(fields[10], fields[1]))
+            continue
+        else:
+            continue
+        if len(fields) < 9 or len(fields[1]) != 2:
+            continue
+        entry = StatusEntry(fields[-1], fields[1], orig)
+        if entry.code[0] != ".":
+            staged.append(entry)
+        if entry.code[1] != ".":
+            unstaged.append(entry)
+    return WorkingTreeStatus(tuple(staged), tuple(unstaged), tuple(untracked), tuple(conflicted))
+
+
+@functools.lru_cache(maxsize=1)
+def git_version() -> tuple[int, int]:
+    """Return the major and minor version of the installed git, ``(0, 0)`` if unknown."""
+    try:
+        result = subprocess.run(["git", "version"], capture_output=True, text=True)
+    except OSError:
+        return 0, 0
+    match = _VERSION_PATTERN.search(result.stdout)
+    return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+
+
+@functools.lru_cache(maxsize=64)
+def _fsmonitor_configured(path: str) -> bool:
+    try:
+        result = subprocess.run(
+            ["git", "config", "--get", "core.fsmonitor"],
+            capture_output=True,
+            text=True,
+            cwd=path,
+        )
+    except OSError:
+        return False
+    return bool(result.stdout.strip())
+
+
+def forget_fsmonitor() -> None:
+    """Look ``core.fsmonitor`` up again on the next probe, as the config may have changed."""
+    _fsmonitor_configured.cache_clear()
+
+
+def status_options(version: tuple[int, int], platform: str = sys.platform, fsmonitor: bool = True) -> list[str]:
+    """Return the ``-c`` options keeping ``git status`` cheap on large work trees.
+
+    The untracked cache remembers which directories hold no untracked
+    files; the built-in filesystem monitor spares git from scanning the
+    work tree at all where it exists.  ``fsmonitor`` is ``False`` when the
+    repository already configures a monitor of its own.
+    """
+    options = ["-c", "core.untrackedCache=true"]
+    if fsmonitor and platform in FSMONITOR_PLATFORMS and version >= FSMONITOR_MIN_VERSION:
+        options += ["-c", "core.fsmonitor=true"]
+    return options
+
+
+def status_command(path: str, write_index: bool = False) -> list[str]:
+    """Return the ``git status`` command line for the work tree at ``path``.
+
+    Without ``write_index`` git is told not to take optional locks, so it
+    neither refreshes the index on disk nor stores the untracked cache;
+    that keeps the index watcher from firing on our own probes and never
+    blocks git commands run elsewhere.
+    """
+    command = ["git"]
+    if not write_index:
+        command.append("--no-optional-locks")
+    command += status_options(git_version(), fsmonitor=not _fsmonitor_configured(path))
+    return command + ["status", "--porcelain=v2", "-z"]
+
+
+def probe_status(path: str, write_index: bool = False) -> WorkingTreeStatus | None:
+    """Return the status of the work tree at ``path``, or ``None`` if git failed there."""
+    try:
+        result = subprocess.run(status_command(path, write_index), capture_output=True, cwd=path)
+    except OSError as e:
+        print(f"Failed to run git: {e}")
+        return None
+    if result.returncode != 0:
+        return None
+    return parse_status(result.stdout)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Iterable
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from ..logs.watcher import supports_notify
+
+# Quiet period after the last filesystem event before ``changed`` fires;
+# one git command touches several of the watched paths
+DEBOUNCE_MS = 200
+
+# Longest a steady stream of events holds ``changed`` back
+MAX_DEBOUNCE_MS = 2000
+
+# Upper bound on watched directories below refs/, for repositories with
+# thousands of nested branch namespaces
+MAX_REF_DIRS = 512
+
+# Upper bound on watched work tree files and directories; inotify watches
+# are a per-user resource
+MAX_WORKTREE_PATHS = 512
+
+
+def git_dirs(path: str) -> tuple[str, str] | None:
+    """Return the git directory and common directory of the work tree at ``path``.
+
+    They differ for linked worktrees, whose ``.git`` is a file pointing at
+    a private git directory while refs live in the main repository.
+    """
+    dot_git = Path(path) / ".git"
+    if dot_git.is_dir():
+        return str(dot_git), str(dot_git)
+    try:
+        text = dot_git.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    if not text.startswith("gitdir:"):
+        return None
+    git_dir = Path(text.split(":", 1)[1].strip())
+    if not git_dir.is_absolute():
+        git_dir = Path(path) / git_dir
+    common = git_dir
+    try:
+        relative = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        relative = ""
+    if relative:
+        common = git_dir / relative
+    return str(git_dir), os.path.normpath(common)
+
+
+def git_watch_paths(path: str) -> list[str]:
+    """Return the files and directories whose changes alter the repository state."""
+    return _git_watch_paths(path)[0]
+
+
+def _git_watch_paths(path: str) -> tuple[list[str], bool]:
+    """Return :func:`git_watch_paths` and whether ``MAX_REF_DIRS`` cut the list short."""
+    dirs = git_dirs(path)
+    if dirs is None:
+        return [], False
+    git_dir, common = dirs
+    paths = [git_dir, os.path.join(git_dir, "HEAD"), os.path.join(git_dir, "index")]
+    if common != git_dir:
+        paths.append(common)
+    paths.append(os.path.join(common, "packed-refs"))
+    refs = os.path.join(common, "refs")
+    paths.append(refs)
+    count = 0
+    truncated = False
+    for root in (os.path.join(refs, "heads"), os.path.join(refs, "remotes")):
+        for current, _subdirs, _files in os.walk(root):
+            if count >= MAX_REF_DIRS:
+                truncated = True
+                break
+            paths.append(current)
+            count += 1
+    return [p for p in paths if os.path.exists(p)], truncated
+
+
+def worktree_watch_paths(path: str, changed: Iterable[str]) -> list[str]:
+    """Return the work tree paths to watch given the ``changed`` relative paths.
+
+    These are the root, each changed file and every directory leading to
+    one: edits usually continue where work is already in progress, and
+    editors saving through a temporary file touch the directory.
+    """
+    paths = {path}
+    for relative in changed:
+        relative = relative.rstrip("/")
+        if len(paths) >= MAX_WORKTREE_PATHS:
+            break
+        paths.add(os.path.join(path, relative))
+        parent = os.path.dirname(relative)
+        while parent:
+            paths.add(os.path.join(path, parent))
+            parent = os.path.dirname(parent)
+    return sorted(p for p in paths if os.path.exists(p))[:MAX_WORKTREE_PATHS]
+
+
+class _PathWatcher(QObject):
+    """Emit ``changed`` once after a burst of events on a set of paths."""
+
+    changed = pyqtSignal()
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_event)
+        self._watcher.directoryChanged.connect(self._on_event)
+        self._path = ""
+        self._burst_start = 0.0
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._emit)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def watched(self) -> set[str]:
+        return set(self._watcher.files()) | set(self._watcher.directories())
+
+    def _set_paths(self, wanted: set[str]) -> bool:
+        """Watch exactly ``wanted``; return ``False`` if some path could not be added."""
+        current = self.watched()
+        stale = sorted(current - wanted)
+        if stale:
+            self._watcher.removePaths(stale)
+        missing = sorted(wanted - current)
+        return not (missing and self._watcher.addPaths(missing))
+
+    def _on_event(self, _path: str) -> None:
+        now = time.monotonic()
+        if not self._debounce.isActive():
+            self._burst_start = now
+        elif (now - self._burst_start) * 1000 >= MAX_DEBOUNCE_MS:
+            return
+        self._debounce.start()
+
+    def _emit(self) -> None:
+        self.changed.emit()
+
+
+class GitWatcher(_PathWatcher):
+    """Emit ``changed`` when HEAD, refs, packed refs or the index of a repository change.
+
+    Git updates those through lock files renamed into place, so the git
+    directory and every directory below ``refs/heads`` and
+    ``refs/remotes`` are watched along with the files themselves.
+    """
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._reliable = False
+
+    def watch(self, path: str) -> None:
+        """Follow the repository of the work tree at ``path``; empty stops watching."""
+        self._path = path
+        self._debounce.stop()
+        self._update_paths()
+
+    def is_reliable(self) -> bool:
+        """Return ``True`` if every change of the watched repository is notified.
+
+        It is not when some ref directories were left unwatched, whether
+        ``MAX_REF_DIRS`` cut them off or the system refused the watches.
+        """
+        return self._reliable
+
+    def _update_paths(self) -> None:
+        paths, truncated = _git_watch_paths(self._path) if self._path else ([], False)
+        wanted = set(paths)
+        added = self._set_paths(wanted)
+        self._reliable = bool(wanted) and added and not truncated and supports_notify(self._path)
+
+    def _emit(self) -> None:
+        # replaced files drop out of the watch and new ref namespaces
+        # appear as directories; pick both up before reporting
+        self._update_paths()
+        self.changed.emit()
+
+
+class WorkTreeWatcher(_PathWatcher):
+    """Emit ``changed`` when files are edited, created or removed near pending changes.
+
+    Only the paths from :func:`worktree_watch_paths` are watched, so edits
+    to files elsewhere in a large work tree are noticed the next time the
+    status is probed for another reason.
+    """
+
+    def watch(self, path: str, changed: Iterable[str] = ()) -> None:
+        """Follow the work tree at ``path`` around the ``changed`` files; empty stops watching."""
+        if path != self._path:
+            self._debounce.stop()
+        self._path = path
+        self._set_paths(set(worktree_watch_paths(path, changed)) if path else set())
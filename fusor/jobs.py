@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import codecs
+import concurrent.futures
+import re
+import subprocess
+import threading
+from collections import deque
+from typing import Any, Callable, NamedTuple
+
+from .config import DEFAULT_JOB_LANES, DEFAULT_RESOURCE_LIMITS
+
+# Number of trailing output lines kept in memory for each streamed command
+COMMAND_TAIL_LINES = 200
+
+# Longest chunk handed to ``on_line`` at once; longer lines are split
+MAX_LINE_LENGTH = 8192
+
+# Progress bars redraw a line by ending it with "\r" alone
+_LINE_BREAK = re.compile(r"(\r\n|\r|\n)")
+
+
+class CommandResult(NamedTuple):
+    """Exit status and the last lines printed by a streamed command."""
+
+    returncode: int
+    tail: list[str]
+
+
+def stream_command(
+    command: list[str],
+    on_line: Callable[[str], None],
+    cwd: str | None = None,
+    tail_lines: int = COMMAND_TAIL_LINES,
+    on_start: Callable[[subprocess.Popen], None] | None = None,
+    on_redraw: Callable[[str], None] | None = None,
+) -> CommandResult:
+    """Run ``command`` and pass each output line to ``on_line`` as it arrives.
+
+    Stdout and stderr share one pipe so their lines keep their relative
+    order.  Lines end at ``\n``, ``\r\n`` or a lone ``\r``, so progress
+    output redrawn in place is delivered as it happens.  A line ended by a
+    lone ``\r`` is replaced by the next one in the tail and goes to
+    ``on_redraw`` instead of ``on_line`` if given.  Only the last
+    ``tail_lines`` lines are retained and no line handed over exceeds
+    ``MAX_LINE_LENGTH`` characters, so a chatty or newline-free process
+    cannot grow memory without bound.  ``on_start`` receives the process
+    right after it was started, e.g. to allow terminating it.  Raises
+    ``FileNotFoundError`` when the program does not exist.
+    """
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        cwd=cwd,
+    )
+    tail: deque[str] = deque(maxlen=tail_lines)
+    redrawn = False
+
+    def emit(line: str, redraw: bool = False) -> None:
+        nonlocal redrawn
+        starts = range(0, max(len(line), 1), MAX_LINE_LENGTH)
+        for start in starts:
+            piece = line[start:start + MAX_LINE_LENGTH]
+            if redrawn and tail:
+                tail.pop()
+            redrawn = redraw and start == starts[-1]
+            tail.append(piece)
+            if redraw and on_redraw is not None and start == starts[-1]:
+                on_redraw(piece)
+            else:
+                on_line(piece)
+
+    stdout = process.stdout
+    try:
+        if on_start is not None:
+            on_start(process)
+        if stdout is not None:
+            # read1 returns whatever the pipe holds instead of waiting for a full chunk
+            read = getattr(stdout, "read1", stdout.read)
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            buffer = ""
+            after_cr = False
+            for chunk in iter(lambda: read(MAX_LINE_LENGTH), b""):
+                text = decoder.decode(chunk)
+                # the "\n" of a "\r\n" split across reads ends no new line
+                if after_cr and text.startswith("\n"):
+                    text = text[1:]
+                if text:
+                    after_cr = text.endswith("\r")
+                *pieces, buffer = _LINE_BREAK.split(buffer + text)
+                for i in range(0, len(pieces), 2):
+                    emit(pieces[i], pieces[i + 1] == "\r")
+                while len(buffer) > MAX_LINE_LENGTH:
+                    emit(buffer[:MAX_LINE_LENGTH])
+                    buffer = buffer[MAX_LINE_LENGTH:]
+            buffer += decoder.decode(b"", final=True)
+            if buffer:
+                emit(buffer)
+    finally:
+        if stdout is not None:
+            stdout.close()
+        returncode = process.wait()
+    return CommandResult(returncode, list(tail))
+
+
+class JobScheduler:
+    """Run callables on named lanes, each backed by its own thread pool.
+
+    Lanes keep unrelated work apart: a dev server holding a ``service``
+    worker for its whole lifetime never blocks a ``command`` job.  Jobs may
+    also name a ``resource`` such as ``"composer:/path/to/project"``; at most
+    ``resource_limits["composer"]`` of them run at once and the rest wait in
+    a queue without occupying a worker.
+    """
+
+    def __init__(
+        self,
+        lanes: dict[str, int] | None = None,
+        resource_limits: dict[str, int] | None = None,
+    ) -> None:
+        self.lanes = dict(DEFAULT_JOB_LANES)
+        self.lanes.update(lanes or {})
+        self.resource_limits = dict(DEFAULT_RESOURCE_LIMITS)
+        self.resource_limits.update(resource_limits or {})
+        self._pools: dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+        self._active: dict[str, int] = {}
+        self._waiting: dict[str, deque[tuple[Any, ...]]] = {}
+        self._closed = False
+
+    def _pool(self, lane: str) -> concurrent.futures.ThreadPoolExecutor:
+        pool = self._pools.get(lane)
+        if pool is None:
+            workers = max(1, int(self.lanes.get(lane, 1)))
+            pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix=f"fusor-{lane}",
+            )
+            self._pools[lane] = pool
+        return pool
+
+    def _limit(self, resource: str) -> int | None:
+        kind = resource.split(":", 1)[0]
+        limit = self.resource_limits.get(kind)
+        return None if limit is None else max(1, int(limit))
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        lane: str = "command",
+        resource: str | None = None,
+        **kwargs: Any,
+    ) -> concurrent.futures.Future:
+        """Schedule ``fn(*args, **kwargs)`` on ``lane`` and return its future."""
+        if self._closed:
+            raise RuntimeError("cannot schedule new jobs after shutdown")
+        if resource is None or self._limit(resource) is None:
+            return self._pool(lane).submit(fn, *args, **kwargs)
+
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        job = (lane, fn, args, kwargs, future, resource)
+        limit = self._limit(resource)
+        with self._lock:
+            active = self._active.get(resource, 0)
+            if limit is not None and active >= limit:
+                self._waiting.setdefault(resource, deque()).append(job)
+                return future
+            self._active[resource] = active + 1
+        self._dispatch(*job)
+        return future
+
+    def _dispatch(
+        self,
+        lane: str,
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        future: concurrent.futures.Future,
+        resource: str,
+    ) -> None:
+        def run() -> None:
+            try:
+                if not future.set_running_or_notify_cancel():
+                    return
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            finally:
+                self._release(resource)
+
+        try:
+            self._pool(lane).submit(run)
+        except RuntimeError:
+            future.cancel()
+            self._release(resource)
+
+    def _release(self, resource: str) -> None:
+        with self._lock:
+            queue = self._waiting.get(resource)
+            job = queue.popleft() if queue else None
+            if queue is not None and not queue:
+                del self._waiting[resource]
+            if job is None:
+                remaining = self._active.get(resource, 1) - 1
+                if remaining > 0:
+                    self._active[resource] = remaining
+                else:
+                    self._active.pop(resource, None)
+        if job is not None:
+            self._dispatch(*job)
+
+    def pending(self, resource: str) -> int:
+        """Return the number of queued jobs waiting for ``resource``."""
+        with self._lock:
+            return len(self._waiting.get(resource, ()))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all lanes and cancel jobs that have not started yet."""
+        self._closed = True
+        with self._lock:
+            waiting = [job for queue in self._waiting.values() for job in queue]
+            self._waiting.clear()
+        for job in waiting:
+            job[4].cancel()
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,72 @@
+from .bookmarks import Bookmark, bookmark_file, dump_bookmarks, load_bookmarks, unread_bytes
+from .compressed import GzipIndex, gzip_index, is_compressed
+from .fingerprint import ErrorGroup, ErrorGroups, FileErrorGroups, normalize_message, top_frame
+from .highlighter import LogHighlighter
+from .index import IndexHit, IndexQuery, LogIndex, parse_query
+from .loader import LogLoader, LogRequest, LogUpdate
+from .merge import merge_records
+from .metrics import HistogramBin, LevelHistogram, LogHistogramStrip
+from .parser import (
+    LEVELS,
+    LogParser,
+    LogRecord,
+    filter_records,
+    level_name,
+    level_rank,
+    parse_timestamp,
+    record_matches,
+)
+from .search import SearchQuery, SearchResult, compile_query, find_matches
+from .stream import LogStream, split_compose_line
+from .tail import LogTailer, TailUpdate
+from .viewer import LineIndex, LogFileModel, LogViewerDialog
+from .watcher import LogWatcher, supports_notify
+
+__all__ = [
+    "Bookmark",
+    "bookmark_file",
+    "dump_bookmarks",
+    "load_bookmarks",
+    "unread_bytes",
+    "GzipIndex",
+    "gzip_index",
+    "is_compressed",
+    "ErrorGroup",
+    "ErrorGroups",
+    "FileErrorGroups",
+    "normalize_message",
+    "top_frame",
+    "IndexHit",
+    "IndexQuery",
+    "LogIndex",
+    "parse_query",
+    "LEVELS",
+    "LogLoader",
+    "LogRequest",
+    "LogUpdate",
+    "LogParser",
+    "LogRecord",
+    "filter_records",
+    "level_name",
+    "level_rank",
+    "parse_timestamp",
+    "record_matches",
+    "merge_records",
+    "HistogramBin",
+    "LevelHistogram",
+    "LogHistogramStrip",
+    "LogHighlighter",
+    "SearchQuery",
+    "SearchResult",
+    "compile_query",
+    "find_matches",
+    "LogStream",
+    "split_compose_line",
+    "LogTailer",
+    "TailUpdate",
+    "LineIndex",
+    "LogFileModel",
+    "LogViewerDialog",
+    "LogWatcher",
+    "supports_notify",
+]
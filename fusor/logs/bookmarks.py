@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, NamedTuple
+
+
+class Bookmark(NamedTuple):
+    """How far a log file had been read when it was last viewed."""
+
+    inode: int
+    offset: int
+    time: float
+
+
+def bookmark_file(path: str) -> Bookmark:
+    """Return a bookmark marking all of ``path`` as read.
+
+    Raises ``OSError`` if the file does not exist.
+    """
+    st = os.stat(path)
+    return Bookmark(st.st_ino, st.st_size, time.time())
+
+
+def unread_bytes(path: str, bookmark: Bookmark | None) -> int:
+    """Return how many bytes of ``path`` were written after ``bookmark``.
+
+    Only the file's metadata is read.  A replaced or truncated file is
+    unread as a whole; a missing file has nothing to read.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0
+    if bookmark is None or st.st_ino != bookmark.inode or st.st_size < bookmark.offset:
+        return st.st_size
+    return st.st_size - bookmark.offset
+
+
+def load_bookmarks(data: Any) -> dict[str, Bookmark]:
+    """Read bookmarks stored in the config as ``{path: [inode, offset, time]}``."""
+    bookmarks: dict[str, Bookmark] = {}
+    if not isinstance(data, dict):
+        return bookmarks
+    for path, value in data.items():
+        try:
+            inode, offset, stamp = value
+            bookmarks[str(path)] = Bookmark(int(inode), int(offset), float(stamp))
+        except (TypeError, ValueError):
+            continue
+    return bookmarks
+
+
+def dump_bookmarks(bookmarks: dict[str, Bookmark]) -> dict[str, list]:
+    """Return ``bookmarks`` in the form stored in the config."""
+    return {path: list(b) for path, b in bookmarks.items()}
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import builtins
+import bz2
+import gzip
+import lzma
+import os
+import threading
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, NamedTuple
+
+# allow tests to monkeypatch file operations easily
+open = builtins.open
+
+# Compressed input read from disk per step
+READ_CHUNK_SIZE = 65536
+
+# Uncompressed bytes between two gzip seek points.  Each seek point keeps a
+# copy of the inflate state (about 40 KiB), so 4 MiB costs ~1% of the data.
+CHECKPOINT_SPACING = 4 * 1024 * 1024
+
+# Number of gzip indexes kept in memory
+INDEX_CACHE_SIZE = 8
+
+# zlib window bits selecting the gzip container format
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+_STREAM_OPENERS: dict[str, Callable[..., Any]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+
+def is_compressed(path: str) -> bool:
+    """Return ``True`` if ``path`` names a compressed log."""
+    return os.path.splitext(path)[1] in _STREAM_OPENERS
+
+
+class _Checkpoint(NamedTuple):
+    out_offset: int
+    in_offset: int
+    inflater: "zlib._Decompress"
+
+
+class GzipIndex:
+    """Seek points into a gzip file for random access to its content.
+
+    Building the index inflates the file once.  Afterwards :meth:`read`
+    starts from the nearest seek point, so reading the end of a large
+    archive only inflates a few megabytes.  Concatenated gzip members,
+    as produced by ``cat a.gz b.gz``, are supported.
+    """
+
+    def __init__(self, path: str, spacing: int | None = None) -> None:
+        self.path = path
+        self.spacing = spacing or CHECKPOINT_SPACING
+        self._checkpoints: list[_Checkpoint] = []
+        self._offsets: list[int] = []
+        self.size = 0
+        self._build()
+
+    def _build(self) -> None:
+        out = 0
+
+        def mark(in_offset: int, inflater: "zlib._Decompress") -> None:
+            if not self._checkpoints or out - self._offsets[-1] >= self.spacing:
+                self._checkpoints.append(_Checkpoint(out, in_offset, inflater.copy()))
+                self._offsets.append(out)
+
+        for chunk in self._inflate(0, zlib.decompressobj(_GZIP_WBITS), mark):
+            out += len(chunk)
+        self.size = out
+
+    def _inflate(
+        self,
+        in_offset: int,
+        inflater: "zlib._Decompress",
+        mark: Callable[[int, "zlib._Decompress"], None] | None = None,
+    ) -> Iterator[bytes]:
+        """Yield uncompressed chunks, resuming ``inflater`` at ``in_offset``.
+
+        ``mark`` is called with the input offset and inflater state at every
+        point the stream could later be resumed from.
+        """
+        with open(self.path, "rb") as f:
+            f.seek(in_offset)
+            data = b""
+            while True:
+                if not data:
+                    data = f.read(READ_CHUNK_SIZE)
+                    if not data:
+                        return
+                if mark is not None:
+                    mark(in_offset, inflater)
+                try:
+                    chunk = inflater.decompress(data, READ_CHUNK_SIZE)
+                except zlib.error:
+                    # trailing garbage after the last member
+                    return
+                if inflater.eof:
+                    rest = inflater.unused_data
+                    inflater = zlib.decompressobj(_GZIP_WBITS)
+                else:
+                    rest = inflater.unconsumed_tail
+                in_offset += len(data) - len(rest)
+                data = rest
+                yield chunk
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Return up to ``length`` uncompressed bytes starting at ``offset``."""
+        if length <= 0 or offset >= self.size or not self._checkpoints:
+            return b""
+        point = self._checkpoints[bisect_right(self._offsets, offset) - 1]
+        out = point.out_offset
+        parts: list[bytes] = []
+        wanted = offset + length
+        for chunk in self._inflate(point.in_offset, point.inflater.copy()):
+            end = out + len(chunk)
+            if end > offset:
+                parts.append(chunk[max(0, offset - out):wanted - out])
+            out = end
+            if out >= wanted:
+                break
+        return b"".join(parts)
+
+
+_cache: OrderedDict[tuple, GzipIndex] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def gzip_index(path: str) -> GzipIndex:
+    """Return a cached :class:`GzipIndex` for ``path``, building it if needed."""
+    st = os.stat(path)
+    key = (path, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = GzipIndex(path)
+    with _cache_lock:
+        _cache[key] = index
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def iter_lines(path: str) -> Iterator[bytes]:
+    """Yield the raw lines of a compressed log without trailing newlines."""
+    opener = _STREAM_OPENERS[os.path.splitext(path)[1]]
+    with opener(path, "rb") as f:
+        for line in f:
+            yield line.rstrip(b"\n")
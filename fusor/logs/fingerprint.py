@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import builtins
+import hashlib
+import os
+import re
+from pathlib import PurePath
+from typing import Iterable
+
+from .compressed import is_compressed, iter_lines
+from .parser import LEVELS, LogParser, LogRecord
+
+# allow tests to monkeypatch file operations easily
+open = builtins.open
+
+# Variable parts of a message replaced by placeholders, applied in order
+_NORMALIZERS = [
+    (re.compile(r"\d{4}-\d\d-\d\d[T ]\d\d:\d\d:\d\d(?:\.\d+)?(?:Z|[+-]\d\d:?\d\d)?"), "<ts>"),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    (re.compile(r"(?:\b[A-Za-z]:\\|(?<![\w>])/)(?:[\w.@~-]+[\\/])*[\w.@~-]+"), "<path>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b(?=[0-9a-f]*\d)[0-9a-f]{12,}\b", re.I), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+# PHP stack frame: "#0 /app/src/Foo.php(12): App\Foo->bar('x')"
+_FRAME_PATTERN = re.compile(r"#\d+\s+(?P<file>[^(]+?)(?:\((?P<line>\d+)\))?:\s*(?P<call>[^(\s]+)")
+
+# Longest message template kept per group
+MAX_TEMPLATE_LENGTH = 300
+
+# File bytes read per step while grouping
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+def normalize_message(message: str) -> str:
+    """Return ``message`` with numbers, ids, paths and timestamps replaced."""
+    for pattern, placeholder in _NORMALIZERS:
+        message = pattern.sub(placeholder, message)
+    return message.strip()[:MAX_TEMPLATE_LENGTH]
+
+
+def top_frame(lines: Iterable[str]) -> str:
+    """Return ``file: call`` of the first stack frame in ``lines``."""
+    for line in lines:
+        match = _FRAME_PATTERN.match(line.strip())
+        if match:
+            return f"{PurePath(match.group('file').strip()).name}: {match.group('call')}"
+    return ""
+
+
+class ErrorGroup:
+    """Occurrences of one distinct message template."""
+
+    __slots__ = ("fingerprint", "level", "template", "frame", "count", "first_seen", "last_seen")
+
+    def __init__(self, fingerprint: str, level: int, template: str, frame: str) -> None:
+        self.fingerprint = fingerprint
+        self.level = level
+        self.template = template
+        self.frame = frame
+        self.count = 0
+        self.first_seen: float | None = None
+        self.last_seen: float | None = None
+
+
+class ErrorGroups:
+    """Count records by fingerprint: level, message template and top frame."""
+
+    def __init__(self, min_level: int = LEVELS["WARNING"]) -> None:
+        self.min_level = min_level
+        self._groups: dict[str, ErrorGroup] = {}
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def clear(self) -> None:
+        self._groups.clear()
+
+    def _key(self, record: LogRecord) -> tuple[str, str, str]:
+        template = normalize_message(record.message)
+        frame = top_frame(record.lines[1:])
+        digest = hashlib.blake2b(
+            f"{record.level}\0{template}\0{frame}".encode(), digest_size=8
+        ).hexdigest()
+        return digest, template, frame
+
+    def add(self, record: LogRecord) -> None:
+        if record.level < self.min_level or record.continued:
+            return
+        fingerprint, template, frame = self._key(record)
+        group = self._groups.get(fingerprint)
+        if group is None:
+            group = self._groups[fingerprint] = ErrorGroup(fingerprint, record.level, template, frame)
+        group.count += 1
+        ts = record.timestamp
+        if ts is not None:
+            if group.first_seen is None or ts < group.first_seen:
+                group.first_seen = ts
+            if group.last_seen is None or ts > group.last_seen:
+                group.last_seen = ts
+
+    def discard(self, record: LogRecord) -> None:
+        """Undo a previous :meth:`add` of ``record``."""
+        if record.level < self.min_level or record.continued:
+            return
+        fingerprint = self._key(record)[0]
+        group = self._groups.get(fingerprint)
+        if group is not None:
+            group.count -= 1
+            if group.count <= 0:
+                del self._groups[fingerprint]
+
+    def top(self, limit: int | None = None) -> list[ErrorGroup]:
+        """Return groups ordered by descending count."""
+        groups = sorted(self._groups.values(), key=lambda g: (-g.count, -(g.last_seen or 0)))
+        return groups if limit is None else groups[:limit]
+
+
+class FileErrorGroups:
+    """Group the records of one log file, reading each byte only once.
+
+    The first :meth:`update` scans the whole file; later calls only parse
+    lines appended since.  The last record is counted right away but kept
+    aside so stack trace lines written after it still refine its group.
+    """
+
+    def __init__(self, path: str, framework: str = "", min_level: int = LEVELS["WARNING"]) -> None:
+        self.path = path
+        self.framework = framework
+        self.groups = ErrorGroups(min_level)
+        self._parser = LogParser(framework)
+        self._key: tuple[int, int] | None = None
+        self._offset = 0
+        self._partial = b""
+        self._pending: LogRecord | None = None
+
+    def _reset(self, key: tuple[int, int]) -> None:
+        self.groups.clear()
+        self._parser = LogParser(self.framework)
+        self._key = key
+        self._offset = 0
+        self._partial = b""
+        self._pending = None
+
+    def update(self) -> bool:
+        """Parse new lines of the file; return ``True`` if anything was read.
+
+        Raises ``OSError`` if the file cannot be read.
+        """
+        st = os.stat(self.path)
+        key = (st.st_dev, st.st_ino)
+        if key != self._key or st.st_size < self._offset:
+            self._reset(key)
+        if st.st_size == self._offset:
+            return False
+
+        if is_compressed(self.path):
+            self._feed(line.decode("utf-8", "replace") for line in iter_lines(self.path))
+            self._offset = st.st_size
+            self._pending = None
+            return True
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            while True:
+                block = f.read(READ_BLOCK_SIZE)
+                if not block:
+                    break
+                self._offset += len(block)
+                *lines, self._partial = (self._partial + block).split(b"\n")
+                self._feed(line.rstrip(b"\r").decode("utf-8", "replace") for line in lines)
+        return True
+
+    def _feed(self, lines: Iterable[str]) -> None:
+        pending = self._pending
+        if pending is not None:
+            self.groups.discard(pending)
+            lines = _chain(pending.lines, lines)
+        self._pending = None
+        for record in self._parser.iter_records(lines):
+            self.groups.add(record)
+            self._pending = record
+
+
+def _chain(first: list[str], rest: Iterable[str]) -> Iterable[str]:
+    # the pending record's lines are copied before the parser extends them
+    yield from list(first)
+    yield from rest
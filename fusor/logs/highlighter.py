@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+
+from PyQt6.QtCore import QRect, Qt
+from PyQt6.QtGui import QColor, QSyntaxHighlighter, QTextBlock, QTextCharFormat
+from PyQt6.QtWidgets import QPlainTextEdit
+
+# Text colors used for each log level
+LEVEL_COLORS = {
+    "DEBUG": Qt.GlobalColor.darkGray,
+    "INFO": Qt.GlobalColor.black,
+    "WARNING": Qt.GlobalColor.darkYellow,
+    "ERROR": Qt.GlobalColor.red,
+    "CRITICAL": Qt.GlobalColor.magenta,
+}
+
+LEVEL_PATTERN = re.compile(r"\b(" + "|".join(LEVEL_COLORS) + r")\b")
+
+# Blocks above and below the viewport that are highlighted ahead of time
+PREFETCH_BLOCKS = 100
+
+# Block states used to remember which blocks still need highlighting
+_PENDING = 1
+_DONE = 2
+
+
+class LogHighlighter(QSyntaxHighlighter):
+    """Color log lines by level, one text block at a time.
+
+    Qt calls :meth:`highlightBlock` only for blocks that were added or
+    changed, so appending lines costs nothing for the rest of the document.
+    When attached to a ``QPlainTextEdit``, blocks far outside the viewport
+    are only marked as pending and get their color once scrolled into view.
+    """
+
+    def __init__(self, view: QPlainTextEdit) -> None:
+        super().__init__(view.document())
+        self._view = view
+        self._formats: dict[str, QTextCharFormat] = {}
+        for level, color in LEVEL_COLORS.items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            self._formats[level] = fmt
+        self._visible = (0, 2 * PREFETCH_BLOCKS)
+        view.updateRequest.connect(self._on_update_request)
+
+    def highlightBlock(self, text: str | None) -> None:
+        number = self.currentBlock().blockNumber()
+        first, last = self._visible
+        if not first <= number <= last:
+            self.setCurrentBlockState(_PENDING)
+            return
+        self.setCurrentBlockState(_DONE)
+        match = LEVEL_PATTERN.search(text or "")
+        if match:
+            self.setFormat(0, len(text or ""), self._formats[match.group(1)])
+
+    def _visible_range(self) -> tuple[int, int]:
+        block = self._view.firstVisibleBlock()
+        first = block.blockNumber() if block.isValid() else 0
+        line_height = max(1, self._view.fontMetrics().lineSpacing())
+        viewport = self._view.viewport()
+        rows = viewport.height() // line_height + 1 if viewport is not None else 0
+        return max(0, first - PREFETCH_BLOCKS), first + rows + PREFETCH_BLOCKS
+
+    def _on_update_request(self, _rect: QRect, _dy: int) -> None:
+        visible = self._visible_range()
+        if visible == self._visible:
+            return
+        self._visible = visible
+        document = self.document()
+        if document is None:
+            return
+        block: QTextBlock = document.findBlockByNumber(visible[0])
+        while block.isValid() and block.blockNumber() <= visible[1]:
+            if block.userState() == _PENDING:
+                self.rehighlightBlock(block)
+            block = block.next()
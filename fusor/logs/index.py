@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import builtins
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from ..config import CACHE_DIR
+from .compressed import is_compressed, iter_lines
+from .parser import UNKNOWN_LEVEL, LogParser, LogRecord, level_rank, parse_timestamp
+
+# allow tests to monkeypatch file operations easily
+open = builtins.open
+
+# Directory holding one index database per project
+INDEX_DIR = CACHE_DIR / "log_index"
+
+# File bytes ingested per transaction
+INGEST_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Records returned by a query unless a limit is given
+DEFAULT_QUERY_LIMIT = 500
+
+# Seconds per unit of a relative time such as "since:2h"
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+_DURATION_PATTERN = re.compile(r"(\d+)([smhdw])")
+
+# One query term: an optional "field op" prefix followed by a word or a
+# double-quoted phrase ("" escapes a quote inside the phrase)
+_TERM_PATTERN = re.compile(
+    r'\s*(?:(?P<field>[A-Za-z_]+)(?P<op>>=|<=|!=|[:=<>]))?'
+    r'(?:"(?P<phrase>(?:[^"]|"")*)"|(?P<word>[^\s"]+))'
+)
+
+_LEVEL_OPERATORS = {">=": ">=", ">": ">", "<=": "<=", "<": "<", "=": "=", ":": "=", "!=": "!="}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    dev INTEGER,
+    ino INTEGER,
+    offset INTEGER NOT NULL DEFAULT 0,
+    -- record extended by continuation lines found at offset
+    last_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    ts REAL,
+    level INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    message TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_ts ON records (ts);
+CREATE INDEX IF NOT EXISTS records_level ON records (level, ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5 (
+    message, body, content='records', content_rowid='id'
+);
+"""
+
+
+class IndexQuery(NamedTuple):
+    """A parsed query: SQL conditions on ``records`` plus an FTS5 match."""
+
+    conditions: list[str]
+    params: list
+    match: str
+
+
+class IndexHit(NamedTuple):
+    timestamp: float | None
+    level: int
+    path: str
+    text: str
+
+
+def _phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _time_value(value: str, now: float) -> float:
+    match = _DURATION_PATTERN.fullmatch(value)
+    if match:
+        return now - int(match.group(1)) * _UNITS[match.group(2)]
+    ts = parse_timestamp(value.replace("T", " "))
+    if ts is None:
+        raise ValueError(f"Invalid time: {value}")
+    return ts
+
+
+def parse_query(text: str, now: float | None = None) -> IndexQuery:
+    """Parse a query such as ``level>=ERROR AND message:"SQLSTATE" since:2h``.
+
+    Terms are joined with ``AND``, which may also be left out.  Supported
+    fields are ``level`` (with ``>=``, ``>``, ``<=``, ``<``, ``=``, ``!=``),
+    ``message``, ``channel``, ``file``, ``since`` and ``until``; times are
+    relative (``30m``, ``2h``, ``7d``) or ISO dates.  Bare words and quoted
+    phrases match anywhere in a record, a trailing ``*`` makes a word a
+    prefix.  Raises ``ValueError`` for anything else.
+    """
+    if now is None:
+        now = time.time()
+    conditions: list[str] = []
+    params: list = []
+    matches: list[str] = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        term = _TERM_PATTERN.match(text, pos)
+        if term is None:
+            raise ValueError(f"Unexpected input: {text[pos:].strip()}")
+        pos = term.end()
+        field = (term.group("field") or "").lower()
+        op = term.group("op") or ""
+        phrase = term.group("phrase")
+        value = phrase.replace('""', '"') if phrase is not None else term.group("word")
+
+        if not field:
+            if phrase is None and value.upper() == "AND":
+                continue
+            if phrase is None and value.upper() in ("OR", "NOT"):
+                raise ValueError(f"{value.upper()} is not supported, terms are always combined with AND")
+            if phrase is None and value.endswith("*") and len(value) > 1:
+                matches.append(_phrase(value[:-1]) + "*")
+            else:
+                matches.append(_phrase(value))
+        elif field == "level":
+            rank = level_rank(value)
+            if rank == UNKNOWN_LEVEL or op not in _LEVEL_OPERATORS:
+                raise ValueError(f"Invalid level filter: {term.group().strip()}")
+            conditions.append(f"r.level {_LEVEL_OPERATORS[op]} ?")
+            params.append(rank)
+        elif field == "message" and op == ":":
+            matches.append(f"message : {_phrase(value)}")
+        elif field == "channel" and op in (":", "="):
+            conditions.append("r.channel = ?")
+            params.append(value)
+        elif field == "file" and op in (":", "="):
+            conditions.append("instr(f.path, ?) > 0")
+            params.append(value)
+        elif field in ("since", "until") and op in (":", "="):
+            conditions.append("r.ts >= ?" if field == "since" else "r.ts < ?")
+            params.append(_time_value(value, now))
+        else:
+            raise ValueError(f"Unknown filter: {term.group().strip()}")
+    return IndexQuery(conditions, params, " AND ".join(matches))
+
+
+def default_index_path(project_path: str) -> Path:
+    """Return where the index of ``project_path`` is stored."""
+    digest = hashlib.sha1(os.path.abspath(project_path).encode()).hexdigest()[:16]
+    return INDEX_DIR / f"{digest}.sqlite3"
+
+
+class LogIndex:
+    """Full-text index of a project's log records, kept in SQLite FTS5.
+
+    :meth:`ingest` remembers how far each file was read, so every call only
+    parses lines appended since.  Records stay in the index when their file
+    is truncated or rotated; the file is then simply read again from the
+    start.  All methods are thread-safe.
+    """
+
+    def __init__(self, project_path: str, db_path: str | Path | None = None) -> None:
+        self.project_path = project_path
+        path = Path(db_path) if db_path is not None else default_index_path(project_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+        # per-file parsers keep the last header for continuation lines
+        self._parsers: dict[str, LogParser] = {}
+        # held for a whole ingest so two callers never read the same bytes
+        self._path_locks: dict[str, threading.Lock] = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM records").fetchone()[0]
+
+    def ingest_all(self, paths: Iterable[str], framework: str = "") -> int:
+        """Ingest every existing file in ``paths``; return the records added."""
+        added = 0
+        for path in paths:
+            if os.path.isfile(path):
+                added += self.ingest(path, framework)
+        return added
+
+    def ingest(self, path: str, framework: str = "") -> int:
+        """Index records appended to ``path`` since the last call.
+
+        Returns the number of new records.  Raises ``OSError`` if the file
+        cannot be read.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            path_lock = self._path_locks.setdefault(path, threading.Lock())
+        with path_lock:
+            return self._ingest(path, framework)
+
+    def _ingest(self, path: str, framework: str) -> int:
+        st = os.stat(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, dev, ino, offset, last_id FROM files WHERE path = ?", (path,)
+            ).fetchone()
+            if row is None:
+                cur = self._conn.execute(
+                    "INSERT INTO files (path, dev, ino) VALUES (?, ?, ?)",
+                    (path, st.st_dev, st.st_ino),
+                )
+                file_id, offset, last_id = int(cur.lastrowid or 0), 0, None
+            else:
+                file_id, dev, ino, offset, last_id = row
+                if (dev, ino) != (st.st_dev, st.st_ino) or st.st_size < offset:
+                    # cleared or rotated: keep the history, read the new content
+                    offset, last_id = 0, None
+                    self._parsers.pop(path, None)
+                    self._conn.execute(
+                        "UPDATE files SET dev = ?, ino = ?, offset = 0, last_id = NULL WHERE id = ?",
+                        (st.st_dev, st.st_ino, file_id),
+                    )
+        if st.st_size == offset:
+            return 0
+        parser = self._parsers.setdefault(path, LogParser(framework))
+
+        if is_compressed(path):
+            return self._ingest_compressed(path, file_id, offset, last_id, parser, st.st_size)
+
+        added = 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while True:
+                block = f.read(INGEST_BLOCK_SIZE)
+                cut = block.rfind(b"\n") + 1
+                if not cut:
+                    if len(block) < INGEST_BLOCK_SIZE:
+                        # an unterminated last line is picked up once complete
+                        break
+                    cut = len(block)
+                offset += cut
+                lines = [
+                    line.rstrip(b"\r").decode("utf-8", "replace")
+                    for line in block[:cut].removesuffix(b"\n").split(b"\n")
+                ]
+                f.seek(offset)
+                added += self._store(file_id, last_id, parser.feed(lines), offset)
+                last_id = self._last_id(file_id)
+        return added
+
+    def _ingest_compressed(
+        self,
+        path: str,
+        file_id: int,
+        offset: int,
+        last_id: int | None,
+        parser: LogParser,
+        size: int,
+    ) -> int:
+        """Index the whole content of a compressed log, one block at a time.
+
+        An archive cannot be resumed part way, so the offset only moves to
+        ``size`` with the last block.  When reading fails, the blocks stored
+        so far are dropped again and the next call starts over.
+        """
+        with self._lock:
+            first_id = self._conn.execute("SELECT coalesce(max(id), 0) + 1 FROM records").fetchone()[0]
+        added = 0
+        previous_id = None
+        lines: list[str] = []
+        pending = 0
+        try:
+            for line in iter_lines(path):
+                lines.append(line.rstrip(b"\r").decode("utf-8", "replace"))
+                pending += len(line) + 1
+                if pending >= INGEST_BLOCK_SIZE:
+                    added += self._store(file_id, previous_id, parser.feed(lines), offset)
+                    previous_id = self._last_id(file_id)
+                    lines, pending = [], 0
+            added += self._store(file_id, previous_id, parser.feed(lines), size)
+        except BaseException:
+            self._parsers.pop(path, None)
+            self._discard(file_id, first_id, last_id)
+            raise
+        return added
+
+    def _discard(self, file_id: int, first_id: int, last_id: int | None) -> None:
+        """Drop records of ``file_id`` from ``first_id`` on and restore its ``last_id``."""
+        conn = self._conn
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO records_fts (records_fts, rowid, message, body)"
+                    " SELECT 'delete', id, message, body FROM records WHERE file_id = ? AND id >= ?",
+                    (file_id, first_id),
+                )
+                conn.execute("DELETE FROM records WHERE file_id = ? AND id >= ?", (file_id, first_id))
+                conn.execute("UPDATE files SET last_id = ? WHERE id = ?", (last_id, file_id))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _last_id(self, file_id: int) -> int | None:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT last_id FROM files WHERE id = ?", (file_id,)
+            ).fetchone()[0]
+
+    def _store(
+        self,
+        file_id: int,
+        last_id: int | None,
+        records: list[LogRecord],
+        offset: int,
+    ) -> int:
+        """Insert ``records`` and move the file offset in one transaction.
+
+        ``records`` are parsed by the caller, so the lock is only held
+        while they are written.
+        """
+        conn = self._conn
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                next_id = conn.execute("SELECT coalesce(max(id), 0) + 1 FROM records").fetchone()[0]
+                rows: list[tuple] = []
+                for record in records:
+                    if last_id is not None and not rows and (
+                        record.continued or record.level == UNKNOWN_LEVEL
+                    ):
+                        # stack trace lines of a record indexed by the previous call
+                        self._extend(last_id, record.lines)
+                        continue
+                    rows.append((
+                        next_id + len(rows),
+                        file_id,
+                        record.timestamp,
+                        record.level,
+                        record.channel,
+                        record.message,
+                        "\n".join(record.lines),
+                    ))
+                conn.executemany(
+                    "INSERT INTO records (id, file_id, ts, level, channel, message, body)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.executemany(
+                    "INSERT INTO records_fts (rowid, message, body) VALUES (?, ?, ?)",
+                    [(r[0], r[5], r[6]) for r in rows],
+                )
+                if rows:
+                    last_id = rows[-1][0]
+                conn.execute(
+                    "UPDATE files SET offset = ?, last_id = ? WHERE id = ?",
+                    (offset, last_id, file_id),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _extend(self, record_id: int, lines: list[str]) -> None:
+        conn = self._conn
+        row = conn.execute("SELECT message, body FROM records WHERE id = ?", (record_id,)).fetchone()
+        if row is None:
+            return
+        message, body = row
+        new_body = "\n".join([body, *lines])
+        # external content tables need the old values to drop their terms
+        conn.execute(
+            "INSERT INTO records_fts (records_fts, rowid, message, body) VALUES ('delete', ?, ?, ?)",
+            (record_id, message, body),
+        )
+        conn.execute("UPDATE records SET body = ? WHERE id = ?", (new_body, record_id))
+        conn.execute(
+            "INSERT INTO records_fts (rowid, message, body) VALUES (?, ?, ?)",
+            (record_id, message, new_body),
+        )
+
+    def search(self, query: str | IndexQuery, limit: int = DEFAULT_QUERY_LIMIT) -> list[IndexHit]:
+        """Return the newest records matching ``query``.
+
+        Raises ``ValueError`` for malformed queries.
+        """
+        if isinstance(query, str):
+            query = parse_query(query)
+        conditions = list(query.conditions)
+        params = list(query.params)
+        if query.match:
+            conditions.append("r.id IN (SELECT rowid FROM records_fts WHERE records_fts MATCH ?)")
+            params.append(query.match)
+        where = " AND ".join(conditions) or "1"
+        sql = (
+            "SELECT r.ts, r.level, f.path, r.body FROM records AS r"
+            " JOIN files AS f ON f.id = r.file_id"
+            f" WHERE {where} ORDER BY r.id DESC LIMIT ?"
+        )
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, (*params, limit)).fetchall()
+            except sqlite3.OperationalError as e:
+                # FTS5 syntax errors surface only when the query runs
+                raise ValueError(str(e)) from e
+        return [IndexHit(*row) for row in rows]
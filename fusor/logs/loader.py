@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from ..utils import expand_log_paths
+from .merge import merge_records
+from .metrics import HistogramBin, LevelHistogram
+from .parser import LogParser, filter_records, record_matches
+from .tail import LogTailer, TailUpdate
+
+
+class LogRequest(NamedTuple):
+    """Everything a background refresh needs, captured on the UI thread."""
+
+    project_path: str
+    framework: str
+    # configured log files and directories, expanded by the worker
+    sources: list[str]
+    min_level: int | None
+    max_lines: int
+    # interleave all files into one timestamp-ordered timeline
+    merged: bool = False
+    # (inode, offset) read up to when each file was last viewed
+    bookmarks: dict[str, tuple[int, int]] | None = None
+
+
+class LogUpdate(NamedTuple):
+    """Text produced by a refresh.
+
+    ``append`` is ``True`` when ``text`` continues what the view already
+    shows; otherwise it replaces the whole view.  ``histogram`` counts the
+    entries of all levels shown or hidden by the level filter.
+    ``unread_from`` is the first line of ``text`` written after the file's
+    bookmark, if the view shows a single bookmarked file.  ``positions``
+    maps every file shown to its ``(inode, offset)`` read so far.
+    """
+
+    text: str
+    append: bool
+    histogram: list[HistogramBin] | None = None
+    unread_from: int | None = None
+    positions: dict[str, tuple[int, int]] | None = None
+
+
+class LogLoader(QObject):
+    """Read, parse and filter logs on a worker thread.
+
+    Each :meth:`request` supersedes the previous one: queued refreshes are
+    cancelled and results of older ones are discarded, so only the newest
+    request ever reaches :attr:`loaded`.  Loads run one at a time because
+    they share the tail and parser state.
+    """
+
+    loaded = pyqtSignal(object)  # LogUpdate | None
+    _finished = pyqtSignal(int, object)
+
+    def __init__(self, executor: Any = None, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.executor = executor
+        self._future: Any = None
+        # generation of the newest request and of the last result shown
+        self._generation = 0
+        self._shown = 0
+        # worker-side state, only touched inside load()
+        self._tailer = LogTailer(0)
+        self._parsers: dict[str, LogParser] = {}
+        self._built_key: tuple | None = None
+        self._built_generation = -1
+        self._histogram = LevelHistogram()
+        self._finished.connect(self._on_finished)
+
+    def request(self, request: LogRequest) -> None:
+        """Start a refresh, superseding any refresh still in progress."""
+        self._generation += 1
+        generation = self._generation
+        shown = self._shown
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+        def task() -> None:
+            if generation != self._generation:
+                return
+            self._finished.emit(generation, self.load(request, generation, shown))
+
+        if self.executor is None:
+            task()
+        else:
+            self._future = self.executor.submit(task, lane="io", resource="logs")
+
+    def invalidate(self) -> None:
+        """Forget what the view shows; the next refresh rebuilds it."""
+        self._generation += 1
+        self._shown = -1
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def _on_finished(self, generation: int, update: LogUpdate | None) -> None:
+        if generation != self._generation:
+            return
+        self._future = None
+        self._shown = generation
+        self.loaded.emit(update)
+
+    def load(self, request: LogRequest, generation: int = 0, shown: int = -1) -> LogUpdate | None:
+        """Poll the requested logs and return what changed in the view.
+
+        Runs on a worker thread.  ``shown`` is the generation whose result
+        the view currently displays; anything else forces a full rebuild.
+        """
+        if self._tailer.max_lines != request.max_lines:
+            self._tailer = LogTailer(request.max_lines)
+            self._parsers.clear()
+            self._built_key = None
+        elif self._built_key is not None and self._built_key[0] != request.project_path:
+            # drop buffers of the previous project
+            self._tailer.forget()
+
+        base = Path(request.project_path)
+        log_files = expand_log_paths(request.project_path, request.sources)
+
+        def resolve(file: str) -> str:
+            path = Path(file)
+            return str(path if path.is_absolute() else base / path)
+
+        contents: dict[str, str] = {}
+        updates: dict[str, TailUpdate] = {}
+        for file in log_files:
+            path = resolve(file)
+            if not Path(path).exists():
+                contents[file] = f"Log file not found: {path}"
+                continue
+            try:
+                updates[file] = self._tailer.poll(path)
+            except OSError as e:
+                contents[file] = f"Failed to read log file: {e}"
+
+        view_key = (
+            request.project_path,
+            request.framework,
+            tuple(log_files),
+            request.min_level,
+            request.merged,
+        )
+        unchanged = (
+            view_key == self._built_key
+            and shown == self._built_generation
+            and not contents
+        )
+        self._built_generation = generation
+        if unchanged and all(not u.lines and not u.reset for u in updates.values()):
+            return None
+        positions: dict[str, tuple[int, int]] = {}
+        for file in updates:
+            position = self._tailer.position(resolve(file))
+            if position is not None:
+                positions[resolve(file)] = position
+
+        if unchanged and len(log_files) == 1 and not updates[log_files[0]].reset:
+            key = resolve(log_files[0])
+            parser = self._parsers.setdefault(key, LogParser(request.framework))
+            records = parser.feed(updates[log_files[0]].lines)
+            for record in records:
+                self._histogram.add_record(record)
+            # continuation lines inherit the level of the record they extend
+            new_lines = filter_records(records, request.min_level)
+            if not records:
+                return None
+            return LogUpdate("\n".join(new_lines), True, self._histogram.snapshot(), positions=positions)
+
+        self._parsers.clear()
+        self._histogram.clear()
+        if request.merged and len(updates) > 1:
+            self._built_key = view_key
+            text = self._merged_text(request, log_files, updates, contents, resolve)
+            return LogUpdate(text, False, self._histogram.snapshot(), positions=positions)
+
+        parts: list[str] = []
+        unread_from = None
+        for file in log_files:
+            if file in updates:
+                key = resolve(file)
+                parser = self._parsers[key] = LogParser(request.framework)
+                lines = self._tailer.lines(key)
+                unread = self._unread_lines(request, key) if len(log_files) == 1 else 0
+                records = parser.feed(lines[:len(lines) - unread])
+                visible = filter_records(records, request.min_level)
+                if unread:
+                    new_records = parser.feed(lines[-unread:])
+                    new_lines = filter_records(new_records, request.min_level)
+                    if new_lines:
+                        unread_from = len(visible)
+                    records += new_records
+                    visible += new_lines
+                for record in records:
+                    self._histogram.add_record(record)
+                content = "\n".join(visible)
+            else:
+                content = contents[file]
+            heading = f"=== {file} ===" if len(log_files) > 1 else ""
+            parts.append(f"{heading}\n{content}" if heading else content)
+
+        self._built_key = view_key
+        text = "\n\n".join(parts)
+        stripped = text.lstrip()
+        if unread_from is not None:
+            # leading blank lines are dropped from the view
+            unread_from = max(unread_from - text[:len(text) - len(stripped)].count("\n"), 0)
+        return LogUpdate(stripped.rstrip(), False, self._histogram.snapshot(), unread_from, positions)
+
+    def _unread_lines(self, request: LogRequest, path: str) -> int:
+        """Return how many buffered lines of ``path`` follow its bookmark."""
+        bookmark = (request.bookmarks or {}).get(path)
+        if bookmark is None:
+            return 0
+        inode, offset = bookmark
+        try:
+            st = os.stat(path)
+        except OSError:
+            return 0
+        if st.st_ino != inode or st.st_size < offset:
+            # replaced or truncated since it was viewed
+            return len(self._tailer.lines(path))
+        return self._tailer.lines_after(path, offset)
+
+    def _merged_text(
+        self,
+        request: LogRequest,
+        log_files: list[str],
+        updates: dict[str, TailUpdate],
+        contents: dict[str, str],
+        resolve: Any,
+    ) -> str:
+        """Return one timeline interleaving the records of all files."""
+        files = [f for f in log_files if f in updates]
+        streams = []
+        for file in files:
+            key = resolve(file)
+            parser = self._parsers[key] = LogParser(request.framework)
+            streams.append(parser.iter_records(self._tailer.lines(key)))
+
+        lines: deque[str] = deque(maxlen=request.max_lines)
+        for index, record in merge_records(streams):
+            self._histogram.add_record(record)
+            if not record_matches(record, request.min_level):
+                continue
+            lines.append(f"[{files[index]}] {record.lines[0]}")
+            lines.extend(record.lines[1:])
+
+        notes = [contents[f] for f in log_files if f in contents]
+        return "\n".join(notes + list(lines))
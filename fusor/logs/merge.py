@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import heapq
+from typing import Iterable, Iterator
+
+from .parser import LogRecord
+
+
+def _keyed(index: int, records: Iterable[LogRecord]) -> Iterator[tuple[float, int, LogRecord]]:
+    # records without a timestamp keep the position of the record before them
+    last = float("-inf")
+    for record in records:
+        if record.timestamp is not None:
+            last = record.timestamp
+        yield last, index, record
+
+
+def merge_records(streams: Iterable[Iterable[LogRecord]]) -> Iterator[tuple[int, LogRecord]]:
+    """Merge timestamp-ordered record streams into one timeline.
+
+    Yields ``(stream_index, record)`` pairs.  Streams are consumed lazily,
+    so only one pending record per stream is held in memory.  Records with
+    equal timestamps keep the order of the streams they come from.
+    """
+    keyed = [_keyed(i, stream) for i, stream in enumerate(streams)]
+    for _ts, index, record in heapq.merge(*keyed, key=lambda item: item[0]):
+        yield index, record
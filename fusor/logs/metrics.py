@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from typing import NamedTuple
+
+from PyQt6.QtCore import QEvent, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QHelpEvent, QMouseEvent, QPainter, QPaintEvent
+from PyQt6.QtWidgets import QSizePolicy, QToolTip, QWidget
+
+from .highlighter import LEVEL_COLORS
+from .parser import LEVELS, LogRecord
+
+# Number of bins kept, the histogram covers the last HISTOGRAM_BINS minutes
+HISTOGRAM_BINS = 60
+
+# Width of one bin in seconds
+BIN_SECONDS = 60
+
+# Level series counted per bin: a record falls into the last series whose
+# threshold is not above its level
+SERIES_THRESHOLDS = (0, LEVELS["WARNING"], LEVELS["ERROR"], LEVELS["CRITICAL"])
+SERIES_NAMES = ("other", "WARNING", "ERROR", "CRITICAL")
+SERIES_COLORS = (
+    Qt.GlobalColor.darkGray,
+    LEVEL_COLORS["WARNING"],
+    LEVEL_COLORS["ERROR"],
+    LEVEL_COLORS["CRITICAL"],
+)
+
+# Height of the histogram strip in pixels
+STRIP_HEIGHT = 40
+
+
+class HistogramBin(NamedTuple):
+    start: float
+    counts: tuple[int, ...]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+
+class LevelHistogram:
+    """Records per time bin and level series, in a fixed ring buffer.
+
+    Bins are anchored to the newest timestamp seen rather than the clock,
+    so old logs still produce a histogram.  Adding a record costs O(1)
+    and moving forward only clears the bins that scroll in.
+    """
+
+    def __init__(self, bins: int = HISTOGRAM_BINS, bin_seconds: int = BIN_SECONDS) -> None:
+        self.bins = bins
+        self.bin_seconds = bin_seconds
+        self._series = len(SERIES_THRESHOLDS)
+        self._counts = array("l", [0]) * (bins * self._series)
+        # number of the newest bin, counted from the epoch
+        self._newest: int | None = None
+
+    def clear(self) -> None:
+        for i in range(len(self._counts)):
+            self._counts[i] = 0
+        self._newest = None
+
+    def _clear_bin(self, number: int) -> None:
+        base = (number % self.bins) * self._series
+        for i in range(base, base + self._series):
+            self._counts[i] = 0
+
+    def add(self, timestamp: float | None, level: int) -> None:
+        if timestamp is None:
+            return
+        number = int(timestamp // self.bin_seconds)
+        newest = self._newest
+        if newest is None:
+            self._newest = number
+        elif number > newest:
+            if number - newest >= self.bins:
+                self.clear()
+            else:
+                for n in range(newest + 1, number + 1):
+                    self._clear_bin(n)
+            self._newest = number
+        elif number <= newest - self.bins:
+            # older than the window
+            return
+        series = bisect_right(SERIES_THRESHOLDS, level) - 1
+        self._counts[(number % self.bins) * self._series + max(series, 0)] += 1
+
+    def add_record(self, record: LogRecord) -> None:
+        if not record.continued:
+            self.add(record.timestamp, record.level)
+
+    def snapshot(self) -> list[HistogramBin]:
+        """Return the bins from oldest to newest."""
+        newest = self._newest
+        if newest is None:
+            return []
+        result = []
+        for number in range(newest - self.bins + 1, newest + 1):
+            base = (number % self.bins) * self._series
+            result.append(
+                HistogramBin(
+                    float(number * self.bin_seconds),
+                    tuple(self._counts[base:base + self._series]),
+                )
+            )
+        return result
+
+
+class LogHistogramStrip(QWidget):
+    """Stacked bars of log entries per minute; clicking a bar emits its time range."""
+
+    # emitted with the start and end timestamp of the clicked bin
+    binClicked = pyqtSignal(float, float)
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._bins: list[HistogramBin] = []
+        self._bin_seconds = BIN_SECONDS
+        self.setFixedHeight(STRIP_HEIGHT)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+    def set_bins(self, bins: list[HistogramBin], bin_seconds: int = BIN_SECONDS) -> None:
+        self._bins = bins
+        self._bin_seconds = bin_seconds
+        self.update()
+
+    def bins(self) -> list[HistogramBin]:
+        return self._bins
+
+    def bin_at(self, x: float) -> int | None:
+        """Return the index of the bin drawn at ``x``."""
+        if not self._bins or self.width() <= 0:
+            return None
+        index = int(x * len(self._bins) / self.width())
+        return index if 0 <= index < len(self._bins) else None
+
+    def paintEvent(self, event: QPaintEvent | None) -> None:
+        if not self._bins:
+            return
+        peak = max(b.total for b in self._bins)
+        if not peak:
+            return
+        painter = QPainter(self)
+        width = self.width() / len(self._bins)
+        height = self.height()
+        for i, b in enumerate(self._bins):
+            bottom = float(height)
+            for count, color in zip(b.counts, SERIES_COLORS):
+                if not count:
+                    continue
+                bar = count * height / peak
+                painter.fillRect(QRectF(i * width, bottom - bar, max(width - 1, 1), bar), QColor(color))
+                bottom -= bar
+        painter.end()
+
+    def event(self, event: QEvent | None) -> bool:
+        if isinstance(event, QHelpEvent) and event.type() == QEvent.Type.ToolTip:
+            index = self.bin_at(event.pos().x())
+            if index is None:
+                QToolTip.hideText()
+            else:
+                QToolTip.showText(event.globalPos(), self._describe(self._bins[index]), self)
+            return True
+        return super().event(event)
+
+    def _describe(self, b: HistogramBin) -> str:
+        time = datetime.fromtimestamp(b.start).strftime("%Y-%m-%d %H:%M")
+        parts = [f"{count} {name}" for count, name in zip(b.counts, SERIES_NAMES) if count]
+        return f"{time}: {', '.join(reversed(parts)) or 'no entries'}"
+
+    def mousePressEvent(self, event: QMouseEvent | None) -> None:
+        if event is None or event.button() != Qt.MouseButton.LeftButton:
+            super().mousePressEvent(event)
+            return
+        index = self.bin_at(event.position().x())
+        if index is not None:
+            start = self._bins[index].start
+            self.binClicked.emit(start, start + self._bin_seconds)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from typing import Iterable, Iterator, NamedTuple
+
+# Severity of each level name, using Monolog's numeric scale.  Yii and
+# generic aliases map onto the closest Monolog level.
+LEVELS = {
+    "TRACE": 100,
+    "PROFILE": 100,
+    "DEBUG": 100,
+    "INFO": 200,
+    "NOTICE": 250,
+    "WARN": 300,
+    "WARNING": 300,
+    "ERROR": 400,
+    "CRITICAL": 500,
+    "FATAL": 500,
+    "ALERT": 550,
+    "EMERGENCY": 600,
+}
+
+# Level of lines that do not belong to any recognized record
+UNKNOWN_LEVEL = 0
+
+# Display name for each severity
+LEVEL_NAMES = {
+    100: "DEBUG",
+    200: "INFO",
+    250: "NOTICE",
+    300: "WARNING",
+    400: "ERROR",
+    500: "CRITICAL",
+    550: "ALERT",
+    600: "EMERGENCY",
+}
+
+# Laravel and Symfony (Monolog): "[2024-01-01 10:00:00] local.ERROR: message"
+MONOLOG_PATTERN = re.compile(
+    r"\[(?P<ts>\d{4}-\d\d-\d\d[T ][^\]]*)\]\s+(?P<channel>[^\s\[\]]+?)\.(?P<level>[A-Za-z]+):\s?"
+)
+
+# Yii: "2024-01-01 10:00:00 [127.0.0.1][-][-][error][yii\db\Exception] message"
+YII_PATTERN = re.compile(
+    r"(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\s*(?:\[[^\]]*\])*?"
+    r"\[(?P<level>error|warning|info|trace|profile(?: begin| end)?)\]\[(?P<channel>[^\]]*)\]\s?"
+)
+
+# Anything else starting with a bare level name, e.g. "ERROR something broke"
+PLAIN_PATTERN = re.compile(
+    r"\s*(?P<level>" + "|".join(LEVELS) + r")\b[:\s]?\s*",
+)
+
+FRAMEWORK_PATTERNS = {
+    "Laravel": (MONOLOG_PATTERN,),
+    "Symfony": (MONOLOG_PATTERN,),
+    "Yii": (YII_PATTERN,),
+}
+
+
+def level_rank(name: str) -> int:
+    """Return the severity of level ``name`` or ``UNKNOWN_LEVEL``."""
+    return LEVELS.get(name.split(" ", 1)[0].upper(), UNKNOWN_LEVEL)
+
+
+def level_name(rank: int) -> str:
+    """Return the display name of severity ``rank``."""
+    return LEVEL_NAMES.get(rank, "UNKNOWN")
+
+
+def parse_timestamp(text: str | None) -> float | None:
+    """Return the POSIX time of an ISO date such as ``2024-01-01 10:00:00``, ``None`` if invalid."""
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text.strip()).timestamp()
+    except ValueError:
+        return None
+
+
+class LogRecord(NamedTuple):
+    """One log entry and the lines it spans.
+
+    ``lines[0]`` is the header; further lines are continuations such as
+    stack traces.  ``continued`` marks a record whose header arrived in an
+    earlier :meth:`LogParser.feed` call: its fields repeat that header and
+    ``lines`` holds only the new continuation lines.
+    """
+
+    timestamp: float | None
+    level: int
+    channel: str
+    message_start: int
+    lines: list[str]
+    continued: bool = False
+
+    @property
+    def message(self) -> str:
+        return self.lines[0][self.message_start:] if self.lines else ""
+
+
+class LogParser:
+    """Split log lines into records, one header match per line.
+
+    The parser is streaming: state about the last header survives between
+    :meth:`feed` calls so continuation lines appended later still belong to
+    the right record.
+    """
+
+    def __init__(self, framework: str = "") -> None:
+        self.patterns = FRAMEWORK_PATTERNS.get(framework, ()) + (PLAIN_PATTERN,)
+        self._last: LogRecord | None = None
+
+    def reset(self) -> None:
+        self._last = None
+
+    def parse_header(self, line: str) -> LogRecord | None:
+        """Return a record for ``line`` if it starts a new entry."""
+        for pattern in self.patterns:
+            match = pattern.match(line)
+            if match is None:
+                continue
+            level = level_rank(match.group("level"))
+            if level == UNKNOWN_LEVEL:
+                continue
+            groups = match.groupdict()
+            return LogRecord(
+                parse_timestamp(groups.get("ts")),
+                level,
+                groups.get("channel") or "",
+                match.end(),
+                [line],
+            )
+        return None
+
+    def iter_records(self, lines: Iterable[str]) -> Iterator[LogRecord]:
+        """Yield records from ``lines``, each once all its lines were seen."""
+        current: LogRecord | None = None
+        for line in lines:
+            record = self.parse_header(line)
+            if record is None and current is not None:
+                current.lines.append(line)
+                continue
+            if current is not None:
+                yield current
+            if record is not None:
+                current = record
+                self._last = record
+            elif self._last is None:
+                current = LogRecord(None, UNKNOWN_LEVEL, "", 0, [line])
+            else:
+                current = self._last._replace(lines=[line], continued=True)
+        if current is not None:
+            yield current
+
+    def feed(self, lines: Iterable[str]) -> list[LogRecord]:
+        """Parse ``lines`` and return the records they contain."""
+        return list(self.iter_records(lines))
+
+
+def record_matches(
+    record: LogRecord,
+    min_level: int | None = None,
+    since: float | None = None,
+) -> bool:
+    """Return ``True`` if ``record`` passes the level and time filters."""
+    if min_level is not None and record.level < min_level:
+        return False
+    if since is not None and (record.timestamp is None or record.timestamp < since):
+        return False
+    return True
+
+
+def filter_records(
+    records: Iterable[LogRecord],
+    min_level: int | None = None,
+    since: float | None = None,
+) -> list[str]:
+    """Return the lines of records at or above ``min_level`` and not older than ``since``."""
+    lines: list[str] = []
+    for record in records:
+        if record_matches(record, min_level, since):
+            lines.extend(record.lines)
+    return lines
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_left
+from typing import NamedTuple
+
+# Characters outside the Basic Multilingual Plane, which take two UTF-16
+# code units in a QTextDocument but one code point in a Python string
+_ASTRAL = re.compile("[\U00010000-\U0010FFFF]")
+
+
+class SearchQuery(NamedTuple):
+    """Options describing what :func:`find_matches` looks for."""
+
+    text: str
+    regex: bool = False
+    whole_word: bool = False
+    case_sensitive: bool = False
+
+
+class SearchResult:
+    """Sorted match offsets stored in compact integer arrays."""
+
+    __slots__ = ("starts", "lengths")
+
+    def __init__(self) -> None:
+        self.starts = array("q")
+        self.lengths = array("q")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def add(self, start: int, length: int) -> None:
+        self.starts.append(start)
+        self.lengths.append(length)
+
+    def span(self, index: int) -> tuple[int, int]:
+        """Return ``(start, length)`` of match number ``index``."""
+        return self.starts[index], self.lengths[index]
+
+    def between(self, start: int, end: int) -> range:
+        """Return indices of matches overlapping ``[start, end)``."""
+        lo = bisect_left(self.starts, start)
+        # matches never overlap, so only the previous one can reach into range
+        if lo and self.starts[lo - 1] + self.lengths[lo - 1] > start:
+            lo -= 1
+        return range(lo, bisect_left(self.starts, end))
+
+
+def compile_query(query: SearchQuery) -> re.Pattern[str] | None:
+    """Return the regex for ``query`` or ``None`` for a plain substring search.
+
+    Raises ``re.error`` when ``query.text`` is not a valid pattern.
+    """
+    if not query.regex and not query.whole_word:
+        return None
+    pattern = query.text if query.regex else re.escape(query.text)
+    if query.whole_word:
+        pattern = rf"\b(?:{pattern})\b"
+    flags = 0 if query.case_sensitive else re.IGNORECASE
+    return re.compile(pattern, flags | re.MULTILINE)
+
+
+def find_matches(text: str, query: SearchQuery) -> SearchResult:
+    """Return every match of ``query`` in ``text`` in a single pass.
+
+    Offsets count UTF-16 code units, as positions in a ``QTextDocument`` do.
+    """
+    result = SearchResult()
+    if not query.text:
+        return result
+    pattern = compile_query(query)
+
+    if pattern is None:
+        haystack = text if query.case_sensitive else text.lower()
+        needle = query.text if query.case_sensitive else query.text.lower()
+        # lowercasing may change the length of some characters, in which
+        # case offsets in the copy would not line up with the original
+        if len(haystack) == len(text) and needle:
+            length = len(needle)
+            pos = haystack.find(needle)
+            while pos != -1:
+                result.add(pos, length)
+                pos = haystack.find(needle, pos + length)
+            return _to_utf16(result, text)
+        pattern = re.compile(re.escape(query.text), re.IGNORECASE)
+
+    for match in pattern.finditer(text):
+        if match.end() > match.start():
+            result.add(match.start(), match.end() - match.start())
+    return _to_utf16(result, text)
+
+
+def _to_utf16(result: SearchResult, text: str) -> SearchResult:
+    """Shift code point offsets in ``result`` to UTF-16 offsets into ``text``."""
+    if text.isascii():
+        return result
+    astral = [m.start() for m in _ASTRAL.finditer(text)]
+    if not astral:
+        return result
+    converted = SearchResult()
+    for start, length in zip(result.starts, result.lengths):
+        before = bisect_left(astral, start)
+        inside = bisect_left(astral, start + length) - before
+        converted.add(start + before, length + inside)
+    return converted
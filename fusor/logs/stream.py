@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import re
+import subprocess
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from ..jobs import MAX_LINE_LENGTH
+from .loader import LogUpdate
+from .metrics import LevelHistogram
+from .parser import UNKNOWN_LEVEL, LogParser
+
+# How often buffered stream lines are handed to the view
+FLUSH_INTERVAL_MS = 250
+
+# Lines buffered between two flushes.  When containers log faster than
+# that, the oldest lines are dropped and summarized instead of shown.
+MAX_PENDING_LINES = 2000
+
+# "web-1  | 2024-01-01T10:00:00.123456789Z message" printed by
+# ``docker compose logs --timestamps``
+COMPOSE_LINE_PATTERN = re.compile(
+    r"(?P<service>[^\s|]+)\s*\|\s?(?:(?P<ts>\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?(?:Z|[+-]\d\d:\d\d)?) )?"
+)
+
+_FRACTION_PATTERN = re.compile(r"(\.\d{6})\d+")
+
+
+def _docker_timestamp(text: str | None) -> float | None:
+    if not text:
+        return None
+    # Python parses at most microseconds
+    text = _FRACTION_PATTERN.sub(r"\1", text).replace("Z", "+00:00")
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        return None
+
+
+def split_compose_line(line: str) -> tuple[str, float | None, str]:
+    """Return the service, docker timestamp and message of a compose log line."""
+    match = COMPOSE_LINE_PATTERN.match(line)
+    if match is None:
+        return "", None, line
+    return match.group("service"), _docker_timestamp(match.group("ts")), line[match.end():]
+
+
+class LogStream(QObject):
+    """Follow the output of a long running log command, e.g. ``docker compose logs -f``.
+
+    A worker reads the process output, assigns each line the level of the
+    record it belongs to and drops lines below :attr:`min_level`.  The UI
+    thread collects buffered lines every ``FLUSH_INTERVAL_MS``; if more
+    than ``MAX_PENDING_LINES`` arrived in between, the oldest ones are
+    replaced by a summary so a flood of output cannot stall rendering.
+    """
+
+    # LogUpdate appended to the view
+    received = pyqtSignal(object)
+    # exit status of the followed command, None when it could not start
+    finished = pyqtSignal(object)
+    _exited = pyqtSignal(int, object)
+
+    def __init__(self, executor: Any = None, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.executor = executor
+        self.min_level: int | None = None
+        self._lock = threading.Lock()
+        self._pending: deque[tuple[str, str]] = deque()
+        self._dropped: dict[str, int] = {}
+        self._histogram = LevelHistogram()
+        self._process: subprocess.Popen | None = None
+        self._generation = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+        self._exited.connect(self._on_exited)
+
+    @property
+    def running(self) -> bool:
+        return self._timer.isActive()
+
+    def start(self, command: list[str], cwd: str | None = None, framework: str = "") -> None:
+        """Run ``command`` and stream its output, stopping any previous stream."""
+        self.stop()
+        self._generation += 1
+        generation = self._generation
+        with self._lock:
+            self._pending.clear()
+            self._dropped.clear()
+            self._histogram.clear()
+        self._timer.start()
+
+        def task() -> None:
+            returncode = None
+            try:
+                returncode = self._follow(command, cwd, framework, generation)
+            except OSError as e:
+                print(f"Failed to follow logs: {e}")
+            finally:
+                self._exited.emit(generation, returncode)
+
+        print(f"$ {' '.join(command)}")
+        if self.executor is None:
+            task()
+        else:
+            self.executor.submit(task, lane="follow")
+
+    def stop(self) -> None:
+        """Terminate the followed command; lines already read are discarded."""
+        self._generation += 1
+        self._timer.stop()
+        with self._lock:
+            process = self._process
+            self._process = None
+            self._pending.clear()
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+    def _follow(self, command: list[str], cwd: str | None, framework: str, generation: int) -> int | None:
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+            cwd=cwd,
+        )
+        with self._lock:
+            if generation != self._generation:
+                # stopped while starting
+                process.terminate()
+                process.wait()
+                return None
+            self._process = process
+        parsers: dict[str, LogParser] = {}
+        levels: dict[str, int] = {}
+        stdout = process.stdout
+        if stdout is not None:
+            for line in iter(lambda: stdout.readline(MAX_LINE_LENGTH), ""):
+                if generation != self._generation:
+                    break
+                service, docker_ts, text = split_compose_line(line.rstrip("\r\n"))
+                parser = parsers.get(service)
+                if parser is None:
+                    parser = parsers[service] = LogParser(framework)
+                record = parser.parse_header(text)
+                if record is not None:
+                    levels[service] = record.level
+                    timestamp = record.timestamp or docker_ts
+                elif service not in levels:
+                    # plain output without records counts line by line
+                    timestamp = docker_ts
+                else:
+                    # continuation of the last record
+                    timestamp = None
+                level = levels.get(service, UNKNOWN_LEVEL)
+                self._push(service, f"{service} | {text}" if service else text, level, timestamp)
+            stdout.close()
+        return process.wait()
+
+    def _push(self, service: str, line: str, level: int, timestamp: float | None) -> None:
+        with self._lock:
+            if timestamp is not None:
+                self._histogram.add(timestamp, level)
+            min_level = self.min_level
+            if min_level is not None and level < min_level:
+                return
+            if len(self._pending) >= MAX_PENDING_LINES:
+                dropped_service = self._pending.popleft()[0]
+                self._dropped[dropped_service] = self._dropped.get(dropped_service, 0) + 1
+            self._pending.append((service, line))
+
+    def flush(self) -> None:
+        """Emit the lines buffered since the last flush."""
+        with self._lock:
+            if not self._pending and not self._dropped:
+                return
+            lines = [line for _service, line in self._pending]
+            dropped = dict(self._dropped)
+            self._pending.clear()
+            self._dropped.clear()
+            histogram = self._histogram.snapshot()
+        if dropped:
+            counts = ", ".join(f"{s or 'output'}: {n}" for s, n in sorted(dropped.items()))
+            lines.insert(0, f"... {sum(dropped.values())} lines skipped to keep up ({counts})")
+        self.received.emit(LogUpdate("\n".join(lines), True, histogram))
+
+    def _on_exited(self, generation: int, returncode: int | None) -> None:
+        if generation != self._generation:
+            return
+        self.flush()
+        self._timer.stop()
+        with self._lock:
+            self._process = None
+        self.finished.emit(returncode)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import builtins
+import os
+from collections import deque
+from typing import Callable, NamedTuple
+
+from .compressed import gzip_index, is_compressed, iter_lines
+
+# allow tests to monkeypatch file operations easily
+open = builtins.open
+
+# Size of the chunks read backwards when loading the tail of a file
+READ_BLOCK_SIZE = 65536
+
+# Appends larger than this are not read in full; the tail is reloaded instead
+MAX_INCREMENTAL_READ = 8 * 1024 * 1024
+
+
+def _decode(line: bytes) -> str:
+    return line.rstrip(b"\r").decode("utf-8", "replace")
+
+
+def _read_tail(read_at: Callable[[int, int], bytes], end: int, max_lines: int) -> tuple[bytes, int]:
+    """Read blocks backwards from ``end`` until ``max_lines`` lines are covered.
+
+    Returns the data and the offset where it starts.
+    """
+    remaining = end
+    chunks: list[bytes] = []
+    line_count = 0
+    while remaining > 0 and line_count <= max_lines:
+        read_size = min(READ_BLOCK_SIZE, remaining)
+        remaining -= read_size
+        chunk = read_at(remaining, read_size)
+        chunks.append(chunk)
+        line_count += chunk.count(b"\n")
+    return b"".join(reversed(chunks)), remaining
+
+
+class TailUpdate(NamedTuple):
+    """Lines read by :meth:`LogTailer.poll`.
+
+    ``reset`` is ``True`` when the buffered lines were rebuilt rather than
+    extended, e.g. on the first read, after truncation or rotation, or when
+    a previously incomplete last line grew.  ``lines`` then holds the whole
+    buffer instead of just the appended lines.
+    """
+
+    lines: list[str]
+    reset: bool
+
+
+class _FileState:
+    __slots__ = ("key", "offset", "partial", "lines", "sizes")
+
+    def __init__(self, key: tuple[int, int], max_lines: int) -> None:
+        self.key = key
+        # byte offset just past the last complete line that was read
+        self.offset = 0
+        # bytes of a trailing line that has no newline yet
+        self.partial = b""
+        self.lines: deque[str] = deque(maxlen=max_lines)
+        # raw byte length of each buffered line, newline included
+        self.sizes: deque[int] = deque(maxlen=max_lines)
+
+
+class LogTailer:
+    """Follow log files by remembering each file's identity and read offset.
+
+    The first :meth:`poll` of a file loads its last ``max_lines`` lines.
+    Later polls only read bytes appended since then.  A changed inode
+    (rotation) or a file smaller than the stored offset (truncation) makes
+    the tailer start over from the end of the new file.  Compressed files
+    (``.gz``, ``.bz2``, ``.xz``) are treated as complete archives and only
+    reloaded when they are replaced.
+    """
+
+    def __init__(self, max_lines: int) -> None:
+        self.max_lines = max(1, int(max_lines))
+        self._files: dict[str, _FileState] = {}
+
+    def lines(self, path: str) -> list[str]:
+        """Return the buffered last lines of ``path``."""
+        state = self._files.get(path)
+        return list(state.lines) if state is not None else []
+
+    def offset(self, path: str) -> int:
+        """Return the byte offset up to which ``path`` has been read."""
+        state = self._files.get(path)
+        return state.offset + len(state.partial) if state is not None else 0
+
+    def position(self, path: str) -> tuple[int, int] | None:
+        """Return the inode of ``path`` and the offset it was read up to, if polled."""
+        state = self._files.get(path)
+        return (state.key[1], state.offset + len(state.partial)) if state is not None else None
+
+    def lines_after(self, path: str, offset: int) -> int:
+        """Return how many buffered lines of ``path`` start at or after byte ``offset``."""
+        state = self._files.get(path)
+        if state is None or len(state.sizes) != len(state.lines):
+            return 0
+        pos = state.offset + len(state.partial)
+        count = 0
+        for size in reversed(state.sizes):
+            pos -= size
+            if pos < offset:
+                break
+            count += 1
+        return count
+
+    def forget(self, path: str | None = None) -> None:
+        """Drop stored state for ``path`` or for every file."""
+        if path is None:
+            self._files.clear()
+        else:
+            self._files.pop(path, None)
+
+    def poll(self, path: str) -> TailUpdate:
+        """Return lines appended to ``path`` since the previous poll.
+
+        Raises ``OSError`` if the file cannot be read.
+        """
+        st = os.stat(path)
+        key = (st.st_dev, st.st_ino)
+        state = self._files.get(path)
+        if is_compressed(path):
+            if state is not None and state.key == key and state.offset == st.st_size:
+                return TailUpdate([], False)
+            return self._reload_compressed(path, key, st.st_size)
+        if (
+            state is None
+            or state.key != key
+            or st.st_size < state.offset + len(state.partial)
+            or st.st_size - state.offset > MAX_INCREMENTAL_READ
+        ):
+            return self._reload(path, key)
+
+        if st.st_size == state.offset + len(state.partial):
+            return TailUpdate([], False)
+
+        with open(path, "rb") as f:
+            f.seek(state.offset)
+            data = f.read(st.st_size - state.offset)
+
+        complete, sep, rest = data.rpartition(b"\n")
+        raw_lines = complete.split(b"\n") if sep else []
+        new_lines = [_decode(line) for line in raw_lines]
+        if not sep:
+            rest = data
+
+        grew_partial = bool(state.partial) and (bool(new_lines) or rest != state.partial)
+        if state.partial:
+            state.lines.pop()
+            state.sizes.pop()
+        state.lines.extend(new_lines)
+        state.sizes.extend(len(line) + 1 for line in raw_lines)
+        if rest:
+            state.lines.append(_decode(rest))
+            state.sizes.append(len(rest))
+        if sep:
+            state.offset += len(complete) + 1
+        state.partial = rest
+
+        if grew_partial:
+            return TailUpdate(list(state.lines), True)
+        appended = new_lines + ([_decode(rest)] if rest else [])
+        return TailUpdate(appended[-self.max_lines:], False)
+
+    def _reload(self, path: str, key: tuple[int, int]) -> TailUpdate:
+        state = _FileState(key, self.max_lines)
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+
+            def read_at(offset: int, size: int) -> bytes:
+                f.seek(offset)
+                return f.read(size)
+
+            data, remaining = _read_tail(read_at, end, self.max_lines)
+
+        complete, sep, rest = data.rpartition(b"\n")
+        if not sep:
+            rest = data
+        lines = complete.split(b"\n") if sep else []
+        if remaining > 0 and lines:
+            # the first line is only partially contained in the read window
+            lines = lines[1:]
+        state.lines.extend(_decode(line) for line in lines)
+        state.sizes.extend(len(line) + 1 for line in lines)
+        if rest:
+            state.lines.append(_decode(rest))
+            state.sizes.append(len(rest))
+        state.offset = end - len(rest)
+        state.partial = rest
+        self._files[path] = state
+        return TailUpdate(list(state.lines), True)
+
+    def _reload_compressed(self, path: str, key: tuple[int, int], size: int) -> TailUpdate:
+        state = _FileState(key, self.max_lines)
+        if path.endswith(".gz"):
+            # the seek index lets later reloads skip inflating the whole file
+            index = gzip_index(path)
+            data, remaining = _read_tail(index.read, index.size, self.max_lines)
+            lines = data.split(b"\n")
+            if lines and not lines[-1]:
+                lines.pop()
+            if remaining > 0 and lines:
+                lines = lines[1:]
+            state.lines.extend(_decode(line) for line in lines)
+        else:
+            state.lines.extend(_decode(line) for line in iter_lines(path))
+        # compressed archives are not followed; the file size marks the version read
+        state.offset = size
+        self._files[path] = state
+        return TailUpdate(list(state.lines), True)
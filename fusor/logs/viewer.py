@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import bisect
+import builtins
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+from typing import Any
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+from PyQt6.QtGui import QFontDatabase
+from PyQt6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QHBoxLayout,
+    QLabel,
+    QListView,
+    QPushButton,
+    QVBoxLayout,
+)
+
+# allow tests to monkeypatch file operations easily
+open = builtins.open
+
+# Lines added to the offset index each time the view asks for more rows
+FETCH_LINES = 20000
+
+# Longer lines are cut when displayed so one huge line cannot stall painting
+MAX_DISPLAY_CHARS = 4096
+
+# Bytes searched for newlines in one step; the index keeps one mark per step
+SCAN_BYTES = 1 << 20
+
+# Bytes indexed per event loop pass while the viewer seeks to the end
+INDEX_STEP_BYTES = 32 << 20
+
+# Segments between marks whose line offsets stay cached after painting
+CACHED_SEGMENTS = 16
+
+
+class LineIndex:
+    """Line offsets of a memory-mapped file, built on demand.
+
+    The file is mapped read-only and scanned only as far as callers ask.
+    Scanning just counts newlines, so it runs at memory speed, and only
+    one mark per ``SCAN_BYTES`` is kept.  The exact line offsets between
+    two marks are computed when a line there is read.  Call :meth:`remap`
+    to pick up appended data or a file replaced at the same path.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self._identity = self._file_identity()
+        self._map: mmap.mmap | None = None
+        self._size = 0
+        self._reset()
+        self.remap()
+
+    def _file_identity(self) -> tuple[int, int]:
+        st = os.fstat(self._file.fileno())
+        return st.st_dev, st.st_ino
+
+    def _reset(self) -> None:
+        # scan positions and the newlines found before each of them
+        self._mark_offsets = array("q", [0])
+        self._mark_lines = array("q", [0])
+        # absolute newline positions between consecutive marks
+        self._segments: OrderedDict[int, array] = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def complete(self) -> bool:
+        """``True`` once every byte of the mapped file has been indexed."""
+        return self._mark_offsets[-1] >= self._size
+
+    @property
+    def scanned(self) -> int:
+        """Bytes searched for newlines so far."""
+        return self._mark_offsets[-1]
+
+    def __len__(self) -> int:
+        count = self._mark_lines[-1]
+        if self.complete and self._map is not None and self._map[self._size - 1:self._size] != b"\n":
+            # trailing line without a newline
+            count += 1
+        return count
+
+    def remap(self) -> bool:
+        """Map the file again if it changed.
+
+        Returns ``True`` when the file shrank or another file took its
+        place, e.g. after rotation, which means the index had to be
+        rebuilt from scratch.
+        """
+        rebuilt = False
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            # rotated away and not recreated yet; keep showing the old file
+            st = None
+        if st is not None and (st.st_dev, st.st_ino) != self._identity:
+            try:
+                replacement = open(self.path, "rb")
+            except OSError:
+                replacement = None
+            if replacement is not None:
+                self._close_map()
+                self._file.close()
+                self._file = replacement
+                self._identity = self._file_identity()
+                rebuilt = True
+        size = os.fstat(self._file.fileno()).st_size
+        if size == self._size and not rebuilt:
+            return False
+        rebuilt = rebuilt or size < self._size
+        if rebuilt:
+            self._reset()
+        self._close_map()
+        if size:
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        self._size = size
+        return rebuilt
+
+    def index_more(self, max_lines: int | None = None, max_bytes: int | None = None) -> int:
+        """Scan for up to ``max_lines`` more lines, or ``max_bytes`` more bytes.
+
+        Returns how many lines were found.
+        """
+        if max_lines is None:
+            max_lines = FETCH_LINES if max_bytes is None else self._size
+        if max_bytes is None:
+            max_bytes = self._size
+        data = self._map
+        if data is None or self.complete:
+            return 0
+        before = len(self)
+        pos = self._mark_offsets[-1]
+        stop = min(self._size, pos + max_bytes)
+        found = 0
+        while pos < stop and found < max_lines:
+            end = min(pos + SCAN_BYTES, stop)
+            chunk = data[pos:end]
+            count = chunk.count(b"\n")
+            if found + count > max_lines:
+                # stop right after the last wanted newline
+                count = max_lines - found
+                parts = chunk.split(b"\n", count)
+                end = pos + len(chunk) - len(parts[-1])
+            found += count
+            pos = end
+            self._mark_offsets.append(pos)
+            self._mark_lines.append(self._mark_lines[-1] + count)
+        return len(self) - before
+
+    def index_all(self) -> None:
+        while not self.complete:
+            self.index_more(max_bytes=self._size)
+
+    def _segment(self, number: int) -> array:
+        positions = self._segments.get(number)
+        if positions is not None:
+            self._segments.move_to_end(number)
+            return positions
+        assert self._map is not None
+        start = self._mark_offsets[number]
+        parts = self._map[start:self._mark_offsets[number + 1]].split(b"\n")
+        positions = array("q")
+        pos = start - 1
+        for part in parts[:-1]:
+            pos += len(part) + 1
+            positions.append(pos)
+        self._segments[number] = positions
+        if len(self._segments) > CACHED_SEGMENTS:
+            self._segments.popitem(last=False)
+        return positions
+
+    def _newline(self, count: int) -> int:
+        """Return the position of newline number ``count``, counting from 1."""
+        number = bisect.bisect_left(self._mark_lines, count) - 1
+        return self._segment(number)[count - self._mark_lines[number] - 1]
+
+    def line(self, row: int) -> str:
+        """Decode line number ``row``."""
+        if self._map is None:
+            return ""
+        start = self._newline(row) + 1 if row else 0
+        end = self._newline(row + 1) if row + 1 <= self._mark_lines[-1] else self._size
+        end = min(end, start + MAX_DISPLAY_CHARS * 4)
+        text = self._map[start:end].rstrip(b"\r\n").decode("utf-8", "replace")
+        return text[:MAX_DISPLAY_CHARS]
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def close(self) -> None:
+        self._close_map()
+        self._file.close()
+
+
+class LogFileModel(QAbstractListModel):
+    """List model exposing the lines of a log file without loading it.
+
+    Rows are added through Qt's ``canFetchMore``/``fetchMore`` protocol as
+    the view scrolls, and only the lines being painted are decoded.
+    """
+
+    def __init__(self, path: str, parent=None) -> None:
+        super().__init__(parent)
+        self._index = LineIndex(path)
+        self._rows = 0
+
+    @property
+    def path(self) -> str:
+        return self._index.path
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self._index.line(index.row())
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if parent.isValid():
+            return False
+        return self._rows < len(self._index) or not self._index.complete
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if parent.isValid():
+            return
+        self._index.index_more()
+        self._expose()
+
+    def fetch_all(self) -> None:
+        """Index the whole file, e.g. before jumping to its end."""
+        self._index.index_all()
+        self._expose()
+
+    def fetch_bytes(self, max_bytes: int) -> bool:
+        """Index up to ``max_bytes`` more of the file; return ``True`` once all of it is."""
+        self._index.index_more(max_bytes=max_bytes)
+        self._expose()
+        return self._index.complete
+
+    def indexed_fraction(self) -> float:
+        size = self._index.size
+        return min(self._index.scanned / size, 1.0) if size else 1.0
+
+    def _expose(self) -> None:
+        total = len(self._index)
+        if total > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, total - 1)
+            self._rows = total
+            self.endInsertRows()
+
+    def reload(self) -> None:
+        """Pick up data written to the file since it was opened."""
+        last = self._rows - 1
+        if self._index.remap():
+            self.beginResetModel()
+            self._rows = 0
+            self.endResetModel()
+            last = -1
+        self._index.index_more()
+        self._expose()
+        if last >= 0:
+            # the last row may have been an unterminated line that grew
+            top = self.index(last, 0)
+            self.dataChanged.emit(top, top)
+
+    def close(self) -> None:
+        self._index.close()
+
+
+class LogViewerDialog(QDialog):
+    """Read-only viewer able to scroll through logs of any size."""
+
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(os.path.basename(path))
+        self.resize(900, 600)
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel(path))
+
+        self.model = LogFileModel(path, self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.list_view.setModel(self.model)
+        layout.addWidget(self.list_view)
+
+        nav_layout = QHBoxLayout()
+        reload_btn = QPushButton("Reload")
+        reload_btn.clicked.connect(self.model.reload)
+        nav_layout.addWidget(reload_btn)
+        top_btn = QPushButton("Top")
+        top_btn.clicked.connect(self.list_view.scrollToTop)
+        nav_layout.addWidget(top_btn)
+        end_btn = QPushButton("End")
+        end_btn.clicked.connect(self.scroll_to_end)
+        nav_layout.addWidget(end_btn)
+        nav_layout.addStretch(1)
+        self.status_label = QLabel("")
+        nav_layout.addWidget(self.status_label)
+        layout.addLayout(nav_layout)
+
+        # indexes a slice of the file per event loop pass until the end is reached
+        self._seek_timer = QTimer(self)
+        self._seek_timer.setInterval(0)
+        self._seek_timer.timeout.connect(self._seek_step)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.finished.connect(self._on_finished)
+
+    def scroll_to_end(self) -> None:
+        """Jump to the last line, indexing the rest of the file without blocking."""
+        self._seek_step()
+
+    def _seek_step(self) -> None:
+        if self.model.fetch_bytes(INDEX_STEP_BYTES):
+            self._seek_timer.stop()
+            self.status_label.setText("")
+            self.list_view.scrollToBottom()
+            return
+        self.status_label.setText(f"Indexing\u2026 {self.model.indexed_fraction():.0%}")
+        self._seek_timer.start()
+
+    def _on_finished(self, _result: int) -> None:
+        self._seek_timer.stop()
+        self.model.close()
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from ..utils import invalidate_log_paths
+
+# Quiet period after the last filesystem event before ``changed`` fires
+DEBOUNCE_MS = 150
+
+# Longest a steady stream of events, e.g. a busy log, holds ``changed`` back
+MAX_DEBOUNCE_MS = 1000
+
+# Minimum time between two ``changed`` signals
+MIN_INTERVAL_MS = 500
+
+# Filesystems whose change notifications are unreliable or missing, such as
+# network shares and Docker Desktop / VM bind mounts
+NO_NOTIFY_FILESYSTEMS = {
+    "9p",
+    "afs",
+    "cifs",
+    "fakeowner",
+    "fuse.grpcfuse",
+    "fuse.osxfs",
+    "fuse.sshfs",
+    "ncpfs",
+    "nfs",
+    "nfs4",
+    "smb3",
+    "smbfs",
+    "vboxsf",
+    "virtiofs",
+}
+
+
+def _mount_types() -> list[tuple[str, str]]:
+    """Return ``(mount point, fs type)`` pairs, longest mount point first."""
+    mounts: list[tuple[str, str]] = []
+    try:
+        with open("/proc/self/mounts", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3:
+                    point = parts[1].replace("\\040", " ")
+                    mounts.append((point, parts[2]))
+    except OSError:
+        return []
+    mounts.sort(key=lambda m: len(m[0]), reverse=True)
+    return mounts
+
+
+def supports_notify(path: str) -> bool:
+    """Return ``False`` when ``path`` lives on a filesystem without notify support."""
+    if not sys.platform.startswith("linux"):
+        return True
+    resolved = os.path.realpath(path)
+    for point, fs_type in _mount_types():
+        if resolved == point or resolved.startswith(point.rstrip("/") + "/"):
+            return fs_type not in NO_NOTIFY_FILESYSTEMS
+    return True
+
+
+class LogWatcher(QObject):
+    """Emit ``changed`` when watched log files or directories change.
+
+    Events are debounced and rate limited so a log written many times per
+    second triggers at most one refresh per ``MIN_INTERVAL_MS``.  Paths that
+    cannot be watched, or that live on filesystems without notify support,
+    are reported through :meth:`needs_polling` so the caller can fall back
+    to a timer.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_event)
+        self._watcher.directoryChanged.connect(self._on_directory_event)
+        self._unwatched: set[str] = set()
+        self._wanted: set[str] = set()
+        self._last_emit = 0.0
+        self._burst_start = 0.0
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.timeout.connect(self._emit)
+
+    def watch(self, paths: list[str]) -> None:
+        """Watch exactly ``paths``; existing files and directories only."""
+        wanted = {str(Path(p)) for p in paths if os.path.exists(p)}
+        current = set(self._watcher.files()) | set(self._watcher.directories())
+        stale = sorted(current - wanted)
+        if stale:
+            self._watcher.removePaths(stale)
+        self._wanted = wanted
+        self._unwatched = {p for p in wanted if not supports_notify(p)}
+        missing = sorted(wanted - current - self._unwatched)
+        if missing:
+            self._unwatched.update(self._watcher.addPaths(missing))
+
+    def clear(self) -> None:
+        """Stop watching every path."""
+        self.watch([])
+        self._debounce.stop()
+
+    def needs_polling(self) -> bool:
+        """Return ``True`` if some paths can only be followed by polling."""
+        return bool(self._unwatched)
+
+    def watched(self) -> set[str]:
+        """Return the paths currently watched through notifications."""
+        return set(self._watcher.files()) | set(self._watcher.directories())
+
+    def _on_directory_event(self, path: str) -> None:
+        # files were added, removed or renamed; don't wait for an mtime tick
+        invalidate_log_paths(path)
+        self._on_event(path)
+
+    def _on_event(self, path: str) -> None:
+        # QFileSystemWatcher stops watching files that were replaced, e.g.
+        # after log rotation; add them back once they exist again
+        if path in self._wanted and path not in self.watched() and os.path.exists(path):
+            self._watcher.addPath(path)
+        now = time.monotonic()
+        if not self._debounce.isActive():
+            self._burst_start = now
+        elif (now - self._burst_start) * 1000 >= MAX_DEBOUNCE_MS:
+            return
+        self._debounce.start(DEBOUNCE_MS)
+
+    def _emit(self) -> None:
+        elapsed_ms = (time.monotonic() - self._last_emit) * 1000
+        if elapsed_ms < MIN_INTERVAL_MS:
+            self._debounce.start(int(MIN_INTERVAL_MS - elapsed_ms))
+            return
+        self._last_emit = time.monotonic()
+        self.changed.emit()
@@ -8,13 +8,15 @@ import builtins
 import shutil
 import webbrowser
 import socket
+import sqlite3
+import time
 from PyQt6.QtWidgets import (
     QMainWindow,
     QApplication,
     QTabWidget,
     QWidget,
     QVBoxLayout,
-    QTextEdit,
+    QPlainTextEdit,
     QMessageBox,
     QFileDialog,
     QInputDialog,
@@ -22,7 +24,7 @@ from PyQt6.QtWidgets import (
     QMenu,
 )
 from PyQt6.QtCore import QTimer, pyqtSignal, Qt
-from PyQt6.QtGui import QShortcut, QKeySequence, QAction
+from PyQt6.QtGui import QShortcut, QKeySequence, QAction, QTextCursor
 from typing import TYPE_CHECKING, Any, Callable, cast
 from .utils import expand_log_paths, is_git_repo
 
@@ -42,7 +44,20 @@ from .config import (
     DEFAULT_PROJECT_SETTINGS,
     DEFAULT_MAX_LOG_LINES,
 )
-from .qtextedit_logger import QTextEditLogger
+from .output_sink import OutputSink
+from .jobs import CommandResult, JobScheduler, stream_command
+from .logs import (
+    LEVELS,
+    Bookmark,
+    LogIndex,
+    LogLoader,
+    LogRequest,
+    LogStream,
+    LogUpdate,
+    dump_bookmarks,
+    load_bookmarks,
+    unread_bytes,
+)
 from .welcome_dialog import WelcomeDialog
 from .ui import create_button
 
@@ -65,6 +80,9 @@ from .tabs.about_tab import AboutTab
 # allow tests to monkeypatch file operations easily
 open = builtins.open
 
+# How often log files are checked for unread output while the Logs tab is hidden
+UNREAD_CHECK_MS = 5000
+
 
 def _port_in_use(port: int) -> bool:
     """Return True if ``port`` is already bound on localhost."""
@@ -114,7 +132,7 @@ DARK_STYLESHEET = """
         color: #999999;
     }
 
-    QTextEdit, QLineEdit, QSpinBox {
+    QTextEdit, QPlainTextEdit, QLineEdit, QSpinBox {
         background-color: #2c2c2c;
         color: #eeeeee;
         padding: 8px;
@@ -123,7 +141,7 @@ DARK_STYLESHEET = """
         font-family: monospace;
     }
 
-    QTextEdit:disabled, QLineEdit:disabled, QComboBox:disabled, QSpinBox:disabled {
+    QTextEdit:disabled, QPlainTextEdit:disabled, QLineEdit:disabled, QComboBox:disabled, QSpinBox:disabled {
         background-color: #3a3a3a;
         color: #777777;
     }
@@ -213,7 +231,7 @@ LIGHT_STYLESHEET = """
         color: #a0a0a0;
     }
 
-    QTextEdit, QLineEdit, QSpinBox {
+    QTextEdit, QPlainTextEdit, QLineEdit, QSpinBox {
         background-color: #ffffff;
         color: #1e1e1e;
         padding: 8px;
@@ -222,7 +240,7 @@ LIGHT_STYLESHEET = """
         font-family: monospace;
     }
 
-    QTextEdit:disabled, QLineEdit:disabled, QComboBox:disabled, QSpinBox:disabled {
+    QTextEdit:disabled, QPlainTextEdit:disabled, QLineEdit:disabled, QComboBox:disabled, QSpinBox:disabled {
         background-color: #f0f0f0;
         color: #999999;
     }
@@ -331,8 +349,9 @@ class MainWindow(QMainWindow):
         self.theme_combo: QComboBox | None = None
         self.terminal_checkbox: QCheckBox | None = None
         self.open_browser_checkbox: QCheckBox | None = None
+        self.index_logs_checkbox: QCheckBox | None = None
         self.console_output_checkbox: QCheckBox | None = None
-        self.log_view: QTextEdit | None = None
+        self.log_view: QPlainTextEdit | None = None
 
         self.tabs = QTabWidget()
         central_widget = QWidget()
@@ -340,7 +359,7 @@ class MainWindow(QMainWindow):
 
         main_layout.addWidget(self.tabs)
 
-        self.output_view = QTextEdit()
+        self.output_view = QPlainTextEdit()
         self.output_view.setReadOnly(True)
         self.output_view.setFixedHeight(200)
         main_layout.addWidget(self.output_view)
@@ -351,8 +370,6 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(central_widget)
 
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-
         self.server_process = None
         self.project_running = False
         self.settings_dirty = False
@@ -369,7 +386,7 @@ class MainWindow(QMainWindow):
         self._save_shortcut.activated.connect(self.save_settings)
 
         # Redirect stdout to the output view only
-        self._stdout_logger = QTextEditLogger(
+        self._stdout_logger = OutputSink(
             self.output_view,
             sys.stdout,
             echo=False,
@@ -394,11 +411,29 @@ class MainWindow(QMainWindow):
         self.git_remote = ""
         self.is_git_repo = False
         self.max_log_lines = DEFAULT_MAX_LOG_LINES
+        self._log_view_capped = False
         self.enable_terminal = False
         self.auto_refresh_secs = 5
         self.open_browser = False
+        self.index_logs = False
+        self._log_index: LogIndex | None = None
+        # where each log file was read up to when the Logs tab was last open
+        self.log_bookmarks: dict[str, Bookmark] = {}
+        # (inode, offset) of every log file the view last loaded
+        self._log_positions: dict[str, tuple[int, int]] = {}
+        self._logs_unread = False
+        self._checking_unread = False
+        self._logs_tab_visited = False
         self.show_console_output = False
+        self.job_lanes: dict[str, int] = {}
+        self.resource_limits: dict[str, int] = {}
         self.load_config()
+        self.executor = JobScheduler(self.job_lanes, self.resource_limits)
+        self._log_loader = LogLoader(self.executor, self)
+        self._log_loader.loaded.connect(self._apply_log_update)
+        self._log_stream = LogStream(self.executor, self)
+        self._log_stream.received.connect(self._show_log_update)
+        self._log_stream.finished.connect(self._on_log_stream_finished)
         self.use_node = self.project_uses_node(self.project_path)
         self.use_composer = self.project_uses_composer(self.project_path)
         self.has_makefile = self.project_has_makefile(self.project_path)
@@ -512,8 +547,10 @@ class MainWindow(QMainWindow):
             self.framework_combo.setCurrentText(self.framework_choice)
 
         if self.project_path:
+            self.git_tab.watch_repository()
             if self.is_git_repo:
                 self.git_tab.load_branches()
+                self.git_tab.prefetch_remote_branches()
             if hasattr(self.git_tab, "update_visibility"):
                 self.git_tab.update_visibility()
         else:
@@ -539,6 +576,11 @@ class MainWindow(QMainWindow):
             self.move(*self._geom_pos)
 
         self.tabs.currentChanged.connect(self.on_tab_changed)
+        self._unread_timer = QTimer(self)
+        self._unread_timer.setInterval(UNREAD_CHECK_MS)
+        self._unread_timer.timeout.connect(self.update_log_badge)
+        self._unread_timer.start()
+        self._logs_tab_visited = self._logs_tab_current()
         self.update_run_buttons()
         self._update_responsive_layout()
         self.update_window_title()
@@ -651,10 +693,16 @@ class MainWindow(QMainWindow):
         self.open_browser = bool(
             settings.get("open_browser", data.get("open_browser", self.open_browser))
         )
+        self.index_logs = bool(settings.get("index_logs", self.index_logs))
+        self.log_bookmarks = load_bookmarks(settings.get("log_bookmarks"))
         self.show_console_output = bool(
             data.get("show_console_output", self.show_console_output)
         )
         self.tray_enabled = bool(data.get("enable_tray", self.tray_enabled))
+        lanes = data.get("job_lanes")
+        self.job_lanes = dict(lanes) if isinstance(lanes, dict) else {}
+        limits = data.get("resource_limits")
+        self.resource_limits = dict(limits) if isinstance(limits, dict) else {}
 
         self.theme_choice = data.get("theme", self.theme_choice)
         self.follow_system_theme = self.theme_choice == "system"
@@ -670,6 +718,20 @@ class MainWindow(QMainWindow):
         self._geom_size = data.get("window_size")
         self._geom_pos = data.get("window_position")
 
+    def set_remote_choices(self, remotes: list[str]) -> None:
+        """Offer ``remotes`` in the remote selector, keeping the configured one."""
+        if self.remote_combo is None:
+            return
+        self.remote_combo.clear()
+        if remotes:
+            self.remote_combo.addItems(remotes)
+        if self.git_remote:
+            if self.git_remote not in remotes:
+                self.remote_combo.addItem(self.git_remote)
+            self.remote_combo.setCurrentText(self.git_remote)
+        elif remotes:
+            self.remote_combo.setCurrentText(remotes[0])
+
     def _compose_prefix(self) -> list[str]:
         prefix = ["docker", "compose"]
         for f in self.compose_files:
@@ -857,6 +919,8 @@ class MainWindow(QMainWindow):
         self.compose_profile = cast(str, settings.get("compose_profile", ""))
         self.auto_refresh_secs = int(cast(Any, settings["auto_refresh_secs"]))
         self.open_browser = bool(settings.get("open_browser", False))
+        self.index_logs = bool(settings.get("index_logs", False))
+        self.log_bookmarks = load_bookmarks(settings.get("log_bookmarks"))
         self.max_log_lines = int(
             cast(Any, settings.get("max_log_lines", self.max_log_lines))
         )
@@ -882,16 +946,9 @@ class MainWindow(QMainWindow):
         ):
             self.settings_tab.set_log_dirs(self.log_dirs)
         if self.remote_combo is not None:
-            remotes = self.git_tab.get_remotes() if hasattr(self, "git_tab") else []
-            self.remote_combo.clear()
-            if remotes:
-                self.remote_combo.addItems(remotes)
-            if self.git_remote:
-                if self.git_remote not in remotes:
-                    self.remote_combo.addItem(self.git_remote)
-                self.remote_combo.setCurrentText(self.git_remote)
-            elif remotes:
-                self.remote_combo.setCurrentText(remotes[0])
+            self.set_remote_choices([])
+            if hasattr(self, "git_tab"):
+                self.git_tab.load_remotes(self.set_remote_choices)
         if (
             hasattr(self, "settings_tab")
             and hasattr(self.settings_tab, "set_compose_files")
@@ -907,10 +964,14 @@ class MainWindow(QMainWindow):
             self.terminal_checkbox.setChecked(self.enable_terminal)
         if self.open_browser_checkbox is not None:
             self.open_browser_checkbox.setChecked(self.open_browser)
+        if self.index_logs_checkbox is not None:
+            self.index_logs_checkbox.setChecked(self.index_logs)
         if self.console_output_checkbox is not None:
             self.console_output_checkbox.setChecked(self.show_console_output)
         if hasattr(self, "logs_tab"):
             self.logs_tab.update_timer_interval(self.auto_refresh_secs)
+            self.logs_tab.update_index_controls()
+            self.logs_tab.update_follow_controls()
         if hasattr(self, "terminal_index"):
             self.tabs.setTabVisible(self.terminal_index, self.enable_terminal)
             self.tabs.setTabEnabled(self.terminal_index, self.enable_terminal)
@@ -953,6 +1014,7 @@ class MainWindow(QMainWindow):
         service: str | None = None,
         callback: Callable[[], None] | None = None,
     ) -> concurrent.futures.Future:
+        resource = self._command_resource(command)
         if self.use_docker:
             if len(command) >= 2 and command[0] == "docker" and command[1] == "compose":
                 command = self._compose_prefix() + command[2:]
@@ -967,26 +1029,30 @@ class MainWindow(QMainWindow):
         else:
             cwd = self.project_path
 
-        def task():
+        def task() -> CommandResult | None:
             try:
-                result = subprocess.run(
-                    command, capture_output=True, text=True, cwd=cwd
-                )
-                if result.stdout:
-                    print(result.stdout.strip())
-                if result.stderr:
-                    print(result.stderr.strip())
+                # progress redraws overwrite each other in the console
+                result = stream_command(command, print, cwd=cwd, on_redraw=lambda line: print(line, end="\r"))
                 self.notify(f"Finished: {' '.join(command)}")
+                return result
             except FileNotFoundError:
                 print(f"Command not found: {command[0]}")
                 self.notify(f"Command not found: {command[0]}")
+                return None
             finally:
                 if callback is not None:
                     # ensure callback runs on the UI thread
                     self.call_later.emit(callback)
 
         print(f"$ {' '.join(command)}")
-        return self.executor.submit(task)
+        return self.executor.submit(task, resource=resource)
+
+    def _command_resource(self, command: list[str]) -> str:
+        """Return the scheduler resource key used to throttle ``command``."""
+        program = Path(command[0]).name.lower() if command else ""
+        for suffix in (".exe", ".bat", ".cmd", ".phar"):
+            program = program.removesuffix(suffix)
+        return f"{program}:{self.project_path}"
 
     def ensure_project_path(self) -> bool:
         if not self.project_path:
@@ -998,8 +1064,17 @@ class MainWindow(QMainWindow):
     def set_current_project(self, path: str) -> None:
         if not path:
             return
+        if path != self.project_path and self._logs_tab_current():
+            self.mark_logs_read()
+        if path != self.project_path:
+            self._log_positions = {}
         self.project_path = path
         self.is_git_repo = is_git_repo(path)
+        if self._log_stream.running:
+            self._log_stream.stop()
+            if hasattr(self, "logs_tab") and hasattr(self.logs_tab, "set_following"):
+                self.logs_tab.set_following(False)
+        self._log_loader.invalidate()
         if self.log_view is not None:
             self.log_view.setPlainText("")
         proj = next((p for p in self.projects if p.get("path") == path), None)
@@ -1021,8 +1096,10 @@ class MainWindow(QMainWindow):
                 self.project_combo.setCurrentText(proj["name"])
             self.project_combo.blockSignals(False)
         if hasattr(self, "git_tab"):
+            self.git_tab.watch_repository()
             if self.is_git_repo:
                 self.git_tab.load_branches()
+                self.git_tab.prefetch_remote_branches()
             if hasattr(self.git_tab, "update_visibility"):
                 self.git_tab.update_visibility()
         if hasattr(self, "settings_tab") and hasattr(self.settings_tab, "update_git_visibility"):
@@ -1139,129 +1216,266 @@ class MainWindow(QMainWindow):
             return False
         return Path(path or self.project_path, "Makefile").is_file()
 
-    def _tail_file(self, path: Path, lines: int) -> str:
-        """Return the last ``lines`` lines from ``path``."""
-        try:
-            with open(str(path), "rb") as f:
-                f.seek(0, os.SEEK_END)
-                remaining = f.tell()
-                block_size = 4096
-                data = b""
-                line_count = 0
-                while remaining > 0 and line_count <= lines:
-                    read_size = block_size if remaining >= block_size else remaining
-                    remaining -= read_size
-                    f.seek(remaining)
-                    chunk = f.read(read_size)
-                    data = chunk + data
-                    line_count = data.count(b"\n")
-                lines_data = data.splitlines()[-lines:]
-                return "\n".join(line.decode("utf-8", "replace") for line in lines_data)
-        except OSError as e:
-            return f"Failed to read log file: {e}"
+    def _merge_logs(self) -> bool:
+        merge_checkbox = getattr(self.logs_tab, "merge_checkbox", None)
+        return bool(merge_checkbox and merge_checkbox.isChecked())
+
+    def _log_sources(self, framework: str) -> list[str]:
+        """Return the configured log files and directories for ``framework``."""
+        log_files = self.log_dirs or self.default_log_dirs(framework)
+        selector = getattr(self.logs_tab, "log_selector", None)
+        selected = selector.currentData() if selector else None
+        if selected and not self._merge_logs():
+            # other frameworks show all live logs together; a rotated or
+            # compressed log is only shown when picked
+            if framework == "Laravel" or selected not in expand_log_paths(self.project_path, log_files):
+                log_files = [selected]
+        return list(log_files)
+
+    def _min_log_level(self) -> int | None:
+        """Return the lowest severity passing the level filter or ``None`` for all."""
+        level_selector = getattr(self.logs_tab, "level_selector", None)
+        level = level_selector.currentText() if level_selector else "All"
+        return LEVELS.get(level)
 
     def refresh_logs(self) -> None:
+        """Reload the log view in the background."""
         if not self.ensure_project_path():
             return
 
+        if self._log_stream.running:
+            # the view shows followed container output
+            self._log_stream.min_level = self._min_log_level()
+            return
+
         framework = self.current_framework()
-        log_contents = ""
-        parts: list[str]
-        if framework == "Laravel":
-            log_files = self.log_dirs or self.default_log_dirs("Laravel")
-            selector = getattr(self.logs_tab, "log_selector", None)
-            if selector and selector.currentData():
-                log_files = [selector.currentData()]
-            log_files = expand_log_paths(self.project_path, log_files)
-
-            parts = []
-            level_selector = getattr(self.logs_tab, "level_selector", None)
-            level = level_selector.currentText() if level_selector else "All"
-            level_order = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-            allowed = None
-            if level != "All" and level in level_order:
-                idx = level_order.index(level)
-                allowed = set(level_order[idx:])
-            for file in log_files:
-                path = Path(file)
-                if not path.is_absolute():
-                    path = Path(self.project_path) / path
-                if path.exists():
-                    content = self._tail_file(path, self.max_log_lines)
-                else:
-                    content = f"Log file not found: {path}"
-                if allowed is not None:
-                    content = "\n".join(
-                        line
-                        for line in content.splitlines()
-                        if any(level_marker in line for level_marker in allowed)
-                    )
-                heading = f"=== {file} ===" if len(log_files) > 1 else ""
-                parts.append(f"{heading}\n{content}" if heading else content)
-            log_contents = "\n\n".join(parts)
-        elif framework == "Symfony":
-            log_files = self.log_dirs or self.default_log_dirs("Symfony")
-            log_files = expand_log_paths(self.project_path, log_files)
-
-            parts = []
-            level_selector = getattr(self.logs_tab, "level_selector", None)
-            level = level_selector.currentText() if level_selector else "All"
-            level_order = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-            allowed = None
-            if level != "All" and level in level_order:
-                idx = level_order.index(level)
-                allowed = set(level_order[idx:])
-            for file in log_files:
-                path = Path(file)
-                if not path.is_absolute():
-                    path = Path(self.project_path) / path
-                if path.exists():
-                    content = self._tail_file(path, self.max_log_lines)
-                else:
-                    content = f"Log file not found: {path}"
-                if allowed is not None:
-                    content = "\n".join(
-                        line
-                        for line in content.splitlines()
-                        if any(level_marker in line for level_marker in allowed)
-                    )
-                heading = f"=== {file} ===" if len(log_files) > 1 else ""
-                parts.append(f"{heading}\n{content}" if heading else content)
-            log_contents = "\n\n".join(parts)
-        elif framework == "Yii":
-            log_files = self.log_dirs or self.default_log_dirs("Yii")
-            log_files = expand_log_paths(self.project_path, log_files)
-
-            parts = []
-            level_selector = getattr(self.logs_tab, "level_selector", None)
-            level = level_selector.currentText() if level_selector else "All"
-            level_order = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-            allowed = None
-            if level != "All" and level in level_order:
-                idx = level_order.index(level)
-                allowed = set(level_order[idx:])
-            for file in log_files:
-                path = Path(file)
-                if not path.is_absolute():
-                    path = Path(self.project_path) / path
-                if path.exists():
-                    content = self._tail_file(path, self.max_log_lines)
-                else:
-                    content = f"Log file not found: {path}"
-                if allowed is not None:
-                    content = "\n".join(
-                        line
-                        for line in content.splitlines()
-                        if any(level_marker in line for level_marker in allowed)
-                    )
-                heading = f"=== {file} ===" if len(log_files) > 1 else ""
-                parts.append(f"{heading}\n{content}" if heading else content)
-            log_contents = "\n\n".join(parts)
-        else:
-            log_contents = f"Logs not implemented for {framework}"
+        if framework not in ["Laravel", "Symfony", "Yii"]:
+            self._log_loader.invalidate()
+            if hasattr(self, "logs_tab") and hasattr(self.logs_tab, "show_histogram"):
+                self.logs_tab.show_histogram([])
+            if self.log_view is not None:
+                self.log_view.setPlainText(f"Logs not implemented for {framework}")
+            return
 
+        self._log_loader.request(
+            LogRequest(
+                self.project_path,
+                framework,
+                self._log_sources(framework),
+                self._min_log_level(),
+                self.max_log_lines,
+                self._merge_logs(),
+                {path: (b.inode, b.offset) for path, b in self.log_bookmarks.items()},
+            )
+        )
+
+    def compose_logs_command(self, services: list[str] | None = None) -> list[str]:
+        """Return the command following the logs of compose ``services``."""
+        return self._compose_prefix() + [
+            "logs",
+            "-f",
+            "--timestamps",
+            "--no-color",
+            "--tail",
+            str(self.max_log_lines),
+            *(services or []),
+        ]
+
+    def follow_container_logs(self, services: list[str] | None = None) -> None:
+        """Stream the logs of compose ``services``, or all, into the log view."""
+        if not self.ensure_project_path():
+            return
+        self._log_loader.invalidate()
+        if hasattr(self, "logs_tab") and hasattr(self.logs_tab, "show_histogram"):
+            self.logs_tab.show_histogram([])
         if self.log_view is not None:
-            self.log_view.setPlainText(log_contents.strip())
+            self.log_view.setPlainText("")
+        self._log_stream.min_level = self._min_log_level()
+        self._log_stream.start(
+            self.compose_logs_command(services),
+            cwd=self.project_path,
+            framework=self.current_framework(),
+        )
+
+    def stop_following_logs(self) -> None:
+        """Stop streaming container logs and show the log files again."""
+        if self._log_stream.running:
+            self._log_stream.stop()
+            print("Stopped following container logs")
+        self.refresh_logs()
+
+    def _on_log_stream_finished(self, returncode: int | None) -> None:
+        if returncode:
+            print(f"Log stream exited with code {returncode}")
+        if hasattr(self, "logs_tab") and hasattr(self.logs_tab, "set_following"):
+            self.logs_tab.set_following(False)
+
+    def log_index(self) -> LogIndex | None:
+        """Return the log index of the current project, if indexing is enabled."""
+        if not self.index_logs or not self.project_path:
+            return None
+        index = self._log_index
+        if index is not None and index.project_path == self.project_path:
+            return index
+        if index is not None:
+            index.close()
+        try:
+            self._log_index = LogIndex(self.project_path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Failed to open log index: {e}")
+            self._log_index = None
+        return self._log_index
+
+    def log_index_files(self) -> list[str]:
+        """Return absolute paths of the log files fed into the index."""
+        base = Path(self.project_path)
+        return [
+            str(Path(p) if Path(p).is_absolute() else base / p)
+            for p in expand_log_paths(self.project_path, self.log_dirs, rotated=True)
+        ]
+
+    def _apply_log_update(self, update: LogUpdate | None) -> None:
+        if update is None or self.log_view is None:
+            return
+        if update.positions is not None:
+            self._log_positions = update.positions
+        # the log files changed; followed container output feeds neither
+        if hasattr(self.logs_tab, "update_error_groups"):
+            self.logs_tab.update_error_groups()
+        if hasattr(self.logs_tab, "update_log_index"):
+            self.logs_tab.update_log_index()
+        self._show_log_update(update)
+
+    def _show_log_update(self, update: LogUpdate) -> None:
+        """Put ``update`` into the log view."""
+        if self.log_view is None:
+            return
+        if update.histogram is not None and hasattr(self.logs_tab, "show_histogram"):
+            self.logs_tab.show_histogram(update.histogram)
+        if update.append:
+            if update.text:
+                self._append_log_text(update.text)
+            return
+        document = self.log_view.document() if self._log_view_capped else None
+        if document is not None:
+            # multi-file views hold more than max_log_lines lines
+            document.setMaximumBlockCount(0)
+        self._log_view_capped = False
+        self.log_view.setPlainText(update.text)
+        if update.unread_from is not None:
+            self._scroll_log_to_line(update.unread_from)
+
+    def _scroll_log_to_line(self, line: int) -> None:
+        """Put the cursor on ``line`` of the log view and show it at the top."""
+        if self.log_view is None:
+            return
+        document = self.log_view.document()
+        if document is None:
+            return
+        block = document.findBlockByNumber(line)
+        if not block.isValid():
+            return
+        self.log_view.setTextCursor(QTextCursor(block))
+        scrollbar = self.log_view.verticalScrollBar()
+        if scrollbar is not None:
+            scrollbar.setValue(block.firstLineNumber())
+
+    def _logs_tab_current(self) -> bool:
+        return hasattr(self, "tabs") and self.tabs.currentIndex() == getattr(self, "logs_index", -1)
+
+    def update_log_badge(self) -> None:
+        """Mark the Logs tab title while it is hidden and logs have unread output.
+
+        The log files are checked on the io lane; only their sizes are compared.
+        """
+        if not hasattr(self, "logs_index"):
+            return
+        if self._logs_tab_current() or not self.project_path:
+            self._show_logs_unread(False)
+            return
+        if self._checking_unread:
+            return
+        project_path = self.project_path
+        # the files the view shows, so a bookmark exists once it was opened
+        sources = self._log_sources(self.current_framework())
+        bookmarks = dict(self.log_bookmarks)
+
+        def task() -> None:
+            unread = False
+            try:
+                base = Path(project_path)
+                for p in expand_log_paths(project_path, sources):
+                    path = str(Path(p) if Path(p).is_absolute() else base / p)
+                    if unread_bytes(path, bookmarks.get(path)) > 0:
+                        unread = True
+                        break
+            finally:
+                self.call_later.emit(lambda: self._on_unread_checked(project_path, unread))
+
+        self._checking_unread = True
+        self.executor.submit(task, lane="io")
+
+    def _on_unread_checked(self, project_path: str, unread: bool) -> None:
+        self._checking_unread = False
+        if project_path != self.project_path or self._logs_tab_current():
+            # switched meanwhile; the next check covers the new state
+            return
+        self._show_logs_unread(unread)
+
+    def _show_logs_unread(self, unread: bool) -> None:
+        if unread != self._logs_unread:
+            self._logs_unread = unread
+            self.tabs.setTabText(self.logs_index, "Logs \u2022" if unread else "Logs")
+
+    def mark_logs_read(self) -> None:
+        """Bookmark how far the view has loaded every log file and store the bookmarks.
+
+        The config is only written when a bookmark moved.
+        """
+        if not self.project_path:
+            return
+        bookmarks = dict(self.log_bookmarks)
+        now = time.time()
+        for path, (inode, offset) in self._log_positions.items():
+            old = bookmarks.get(path)
+            if old is None or (old.inode, old.offset) != (inode, offset):
+                bookmarks[path] = Bookmark(inode, offset, now)
+        changed = bookmarks != self.log_bookmarks
+        self.log_bookmarks = bookmarks
+        self.update_log_badge()
+        if changed:
+            self._save_log_bookmarks()
+
+    def _save_log_bookmarks(self) -> None:
+        stored = dump_bookmarks(self.log_bookmarks)
+        for proj in self.projects:
+            if proj.get("path") == self.project_path:
+                proj["log_bookmarks"] = stored
+        data = load_config()
+        for proj in data.get("projects", []):
+            if isinstance(proj, dict) and proj.get("path") == self.project_path:
+                proj["log_bookmarks"] = stored
+                break
+        else:
+            # the project has not been saved yet
+            return
+        try:
+            save_config(data)
+        except OSError as e:
+            print(f"Failed to write config: {e}")
+
+    def _append_log_text(self, text: str) -> None:
+        """Append ``text`` to the log view, keeping at most ``max_log_lines``."""
+        if self.log_view is None:
+            return
+        document = self.log_view.document()
+        if document is None:
+            return
+        document.setMaximumBlockCount(self.max_log_lines)
+        self._log_view_capped = True
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text if document.isEmpty() else "\n" + text)
 
     def save_settings(self) -> None:
         if self.project_combo is not None:
@@ -1358,6 +1572,11 @@ class MainWindow(QMainWindow):
             if self.open_browser_checkbox is not None
             else self.open_browser
         )
+        index_logs = (
+            self.index_logs_checkbox.isChecked()
+            if self.index_logs_checkbox is not None
+            else self.index_logs
+        )
         tray_enabled = (
             self.tray_checkbox.isChecked()
             if self.tray_checkbox is not None
@@ -1438,6 +1657,7 @@ class MainWindow(QMainWindow):
             self.theme = self.theme_choice
         self.enable_terminal = enable_terminal
         self.open_browser = bool(open_browser)
+        self.index_logs = bool(index_logs)
         self.show_console_output = bool(show_console_output)
         self.tray_enabled = bool(tray_enabled)
         self.max_log_lines = int(getattr(self, "max_log_lines", DEFAULT_MAX_LOG_LINES))
@@ -1464,6 +1684,8 @@ class MainWindow(QMainWindow):
                     "docker_project_path": self.docker_project_path,
                     "auto_refresh_secs": self.auto_refresh_secs,
                     "open_browser": self.open_browser,
+                    "index_logs": self.index_logs,
+                    "log_bookmarks": dump_bookmarks(self.log_bookmarks),
                     "max_log_lines": self.max_log_lines,
                     "enable_terminal": self.enable_terminal,
                 }
@@ -1492,6 +1714,8 @@ class MainWindow(QMainWindow):
                     "docker_project_path": self.docker_project_path,
                     "auto_refresh_secs": self.auto_refresh_secs,
                     "open_browser": self.open_browser,
+                    "index_logs": self.index_logs,
+                    "log_bookmarks": dump_bookmarks(self.log_bookmarks),
                     "max_log_lines": self.max_log_lines,
                     "enable_terminal": self.enable_terminal,
                 }
@@ -1526,12 +1750,15 @@ class MainWindow(QMainWindow):
 
         if hasattr(self, "logs_tab"):
             self.logs_tab.update_timer_interval(self.auto_refresh_secs)
+            self.logs_tab.update_index_controls()
+            self.logs_tab.update_follow_controls()
             if hasattr(self.logs_tab, "set_log_dirs"):
                 self.logs_tab.set_log_dirs(self.log_dirs)
 
         if hasattr(self, "git_tab"):
             if self.is_git_repo:
                 self.git_tab.load_branches()
+                self.git_tab.prefetch_remote_branches()
             if hasattr(self.git_tab, "update_visibility"):
                 self.git_tab.update_visibility()
 
@@ -1669,7 +1896,7 @@ class MainWindow(QMainWindow):
                 for line in self.server_process.stdout:
                     print(line.rstrip())
 
-            self.executor.submit(stream)
+            self.executor.submit(stream, lane="service")
             self.project_running = True
             self.update_run_buttons()
             self.update_window_title()
@@ -1744,7 +1971,13 @@ class MainWindow(QMainWindow):
                 if hasattr(self.server_process, "kill"):
                     self.server_process.kill()
             self.server_process = None
+        self._log_stream.stop()
+        if self._logs_tab_current():
+            self.mark_logs_read()
         self.executor.shutdown(wait=False)
+        if self._log_index is not None:
+            self._log_index.close()
+            self._log_index = None
         # Restore original stdout before shutting down
         sys.stdout = self._stdout_logger.original_stdout
         data = load_config()
@@ -1759,9 +1992,20 @@ class MainWindow(QMainWindow):
         super().closeEvent(event)
 
     def on_tab_changed(self, index: int) -> None:
+        if index == getattr(self, "logs_index", -1):
+            if self._logs_unread:
+                # rebuild the view so it opens at the first unread line
+                self._log_loader.invalidate()
+                self.refresh_logs()
+            self.update_log_badge()
+        elif self._logs_tab_visited:
+            self.mark_logs_read()
+        self._logs_tab_visited = index == getattr(self, "logs_index", -1)
         if index == getattr(self, "git_index", -1):
             if self.is_git_repo:
                 self.git_tab.load_branches()
+                self.git_tab.prefetch_remote_branches()
+                self.git_tab.refresh_status()
             if hasattr(self.git_tab, "update_visibility"):
                 self.git_tab.update_visibility()
 
@@ -1796,14 +2040,31 @@ class MainWindow(QMainWindow):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
 
-        if reply == QMessageBox.StandardButton.Yes:
+        if reply != QMessageBox.StandardButton.Yes:
+            self.refresh_logs()
+            return
+
+        index = self.log_index()
+        framework = self.current_framework()
+
+        def task() -> None:
             try:
-                with open(str(log_path), "w", encoding="utf-8"):
-                    pass
-            except OSError as e:
-                print(f"Failed to clear log file: {e}")
+                if index is not None:
+                    # keep the lines written since the last refresh searchable
+                    try:
+                        index.ingest(str(log_path), framework)
+                    except (OSError, sqlite3.Error) as e:
+                        print(f"Failed to index log file: {e}")
+                try:
+                    with open(str(log_path), "w", encoding="utf-8"):
+                        pass
+                except OSError as e:
+                    print(f"Failed to clear log file: {e}")
+            finally:
+                self.call_later.emit(self.refresh_logs)
 
-        self.refresh_logs()
+        # queued behind a running ingest of the same file
+        self.executor.submit(task, lane="index")
 
     def open_file(self, path: str) -> None:
         """Open ``path`` using the system's default application."""
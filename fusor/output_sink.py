@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QPlainTextEdit
+
+from .config import DEFAULT_MAX_OUTPUT_LINES
+
+# Delay between batched appends to the output view, in milliseconds
+FLUSH_INTERVAL_MS = 33
+
+# A line written with a trailing "\r" is redrawn by the next one
+_LINE_END = re.compile(r"(\r\n|\r|\n)")
+
+
+class OutputSink(QObject):
+    """File-like object that appends text to a ``QPlainTextEdit`` in batches.
+
+    ``write`` may be called from any thread.  Lines are collected in a
+    bounded buffer and appended in a single call once per flush interval,
+    so a chatty command costs one UI update per frame instead of one per
+    ``print()``.  Blank lines are kept; a line ended by a lone ``\r``, such
+    as a progress bar, is replaced by the next line as in a terminal.  The
+    view keeps at most ``max_lines`` blocks.
+    """
+
+    _schedule = pyqtSignal()
+
+    def __init__(
+        self,
+        text_edit: QPlainTextEdit,
+        original_stdout,
+        echo: bool = True,
+        max_lines: int = DEFAULT_MAX_OUTPUT_LINES,
+        interval: int = FLUSH_INTERVAL_MS,
+    ) -> None:
+        super().__init__(text_edit)
+        self.text_edit = text_edit
+        self.text_edit.setMaximumBlockCount(max_lines)
+        self.original_stdout = original_stdout
+        self.echo = echo
+        self.max_lines = max_lines
+        self._lock = threading.Lock()
+        self._pending: deque[str] = deque()
+        self._dropped = 0
+        self._scheduled = False
+        # the last line was written without a line end yet
+        self._open = False
+        # the last line is replaced by the next; it is the last pending
+        # line, or the last line of the view when nothing is pending
+        self._redraw = False
+        self._replace_shown = False
+        self._after_cr = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.drain)
+        self._schedule.connect(self._timer.start)
+
+    def write(self, msg: str) -> None:
+        with self._lock:
+            count = len(self._pending)
+            text = msg
+            if self._after_cr and text.startswith("\n"):
+                # the "\n" of a "\r\n" split across writes keeps the line
+                text = text[1:]
+                self._redraw = False
+            if text:
+                self._after_cr = text.endswith("\r")
+            *pieces, rest = _LINE_END.split(text)
+            for i in range(0, len(pieces), 2):
+                # print() writes the line end on its own
+                if pieces[i] or not self._open:
+                    self._add(pieces[i])
+                self._open = False
+                self._redraw = pieces[i + 1] == "\r"
+            if rest:
+                self._add(rest)
+                self._open = True
+            changed = self._replace_shown or len(self._pending) != count
+            overflow = len(self._pending) - self.max_lines
+            for _ in range(max(0, overflow)):
+                self._pending.popleft()
+            self._dropped += max(0, overflow)
+            schedule = changed and not self._scheduled
+            self._scheduled = self._scheduled or changed
+        if schedule:
+            self._schedule.emit()
+        if self.echo:
+            self.original_stdout.write(msg)
+
+    def _add(self, line: str) -> None:
+        if self._redraw:
+            if self._pending:
+                self._pending.pop()
+            else:
+                self._replace_shown = True
+            self._redraw = False
+        self._pending.append(line)
+
+    def flush(self) -> None:
+        if self.echo:
+            self.original_stdout.flush()
+
+    def drain(self) -> None:
+        """Append all buffered lines to the view.  Must run on the UI thread."""
+        with self._lock:
+            lines = list(self._pending)
+            self._pending.clear()
+            dropped = self._dropped
+            self._dropped = 0
+            self._scheduled = False
+            replace = self._replace_shown
+            self._replace_shown = False
+        if dropped:
+            lines.insert(0, f"... {dropped} lines skipped ...")
+        if replace:
+            self._remove_last_line()
+        if lines:
+            self.text_edit.appendPlainText("\n".join(lines))
+
+    def _remove_last_line(self) -> None:
+        document = self.text_edit.document()
+        if document is None:
+            return
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        # take the break before the line too, unless it is the only one
+        if cursor.block().blockNumber() > 0:
+            cursor.movePosition(QTextCursor.MoveOperation.PreviousCharacter, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
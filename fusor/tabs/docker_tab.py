@@ -31,6 +31,8 @@ class DockerTab(QWidget):
         self.status_btn.clicked.connect(self.status)
         self.logs_btn = create_button("Logs", "text-x-generic")
         self.logs_btn.clicked.connect(self.logs)
+        self.follow_btn = create_button("Follow Logs", "media-playback-start")
+        self.follow_btn.clicked.connect(self.follow_logs)
         self.restart_btn = create_button("Restart", "view-refresh")
         self.restart_btn.clicked.connect(self.restart)
         self.shell_btn = create_button("Open Shell", "utilities-terminal")
@@ -40,6 +42,7 @@ class DockerTab(QWidget):
         layout.addWidget(self.pull_btn)
         layout.addWidget(self.status_btn)
         layout.addWidget(self.logs_btn)
+        layout.addWidget(self.follow_btn)
         layout.addWidget(self.restart_btn)
         layout.addWidget(self.shell_btn)
 
@@ -57,6 +60,14 @@ class DockerTab(QWidget):
     def logs(self) -> None:
         self.main_window.run_command(["docker", "compose", "logs", "--tail", "50"])
 
+    def follow_logs(self) -> None:
+        """Stream container logs into the Logs tab."""
+        logs_tab = getattr(self.main_window, "logs_tab", None)
+        if logs_tab is None:
+            return
+        self.main_window.tabs.setCurrentWidget(logs_tab)
+        logs_tab.follow_checkbox.setChecked(True)
+
     def restart(self) -> None:
         self.main_window.run_command(["docker", "compose", "restart"])
 
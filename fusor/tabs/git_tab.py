@@ -1,3 +1,4 @@
+from PyQt6.QtCore import QEvent, QTimer, Qt
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -8,12 +9,24 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QScrollArea,
     QDialog,
+    QProgressBar,
+    QTreeWidget,
+    QTreeWidgetItem,
 )
 
 from ..branch_dialog import BranchDialog
+from ..git import DiffViewerDialog, GitService, GitState, StatusEntry, WorkingTreeStatus
+from ..jobs import CommandResult
 from ..ui import create_button, CONTENT_MARGIN
 
-import subprocess
+from typing import Any, Callable
+
+# Files listed per status group; the rest are summarised in one row
+MAX_STATUS_ROWS = 500
+
+# Milliseconds between status probes while the tab is shown; the work tree
+# watcher only covers the directories around pending changes
+STATUS_POLL_MS = 15000
 
 
 class GitTab(QWidget):
@@ -22,6 +35,15 @@ class GitTab(QWidget):
         self.main_window = main_window
         self.current_branch = ""
         self._truncate_width = 15
+        self.git = GitService(getattr(main_window, "executor", None), self)
+        self.git.busy_changed.connect(self._on_busy_changed)
+        self.git.progress.connect(self._on_progress)
+        self.git.state_changed.connect(self._on_state_changed)
+        self.git.status_changed.connect(self._on_status_changed)
+        self.git.worktree_changed.connect(self._on_worktree_changed)
+        self._status_timer = QTimer(self)
+        self._status_timer.setInterval(STATUS_POLL_MS)
+        self._status_timer.timeout.connect(self.refresh_status)
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -37,21 +59,53 @@ class GitTab(QWidget):
         outer_layout.setContentsMargins(CONTENT_MARGIN, CONTENT_MARGIN, CONTENT_MARGIN, CONTENT_MARGIN)
         outer_layout.setSpacing(16)
 
+        # --- Running command ---
+        self.progress_row = QWidget()
+        progress_layout = QHBoxLayout(self.progress_row)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        self.progress_label = QLabel("")
+        self.progress_bar = QProgressBar()
+        self.cancel_btn = create_button("Cancel", "process-stop")
+        self.cancel_btn.clicked.connect(self.git.cancel)
+        progress_layout.addWidget(self.progress_label)
+        progress_layout.addWidget(self.progress_bar, 1)
+        progress_layout.addWidget(self.cancel_btn)
+        self.progress_row.setVisible(False)
+        outer_layout.addWidget(self.progress_row)
+
         # --- Branch section ---
         branch_group = QGroupBox("Active Branch")
         branch_layout = QHBoxLayout()
         self.current_branch_label = QLabel("")
+        # commits ahead of and behind the upstream
+        self.sync_label = QLabel("")
         checkout_btn = create_button("Checkout...", "document-open")
         checkout_btn.clicked.connect(self.show_branch_dialog)
+        self.checkout_btn = checkout_btn
 
         branch_layout.addWidget(QLabel("Current:"))
         branch_layout.addWidget(self.current_branch_label)
+        branch_layout.addWidget(self.sync_label)
         branch_layout.addStretch(1)
         branch_layout.addWidget(checkout_btn)
         branch_group.setLayout(branch_layout)
         outer_layout.addWidget(branch_group)
         self.branch_group = branch_group
 
+        # --- Working tree ---
+        status_group = QGroupBox("Working Tree")
+        status_layout = QVBoxLayout()
+        self.status_summary_label = QLabel("")
+        self.status_tree = QTreeWidget()
+        self.status_tree.setHeaderHidden(True)
+        self.status_tree.setUniformRowHeights(True)
+        self.status_tree.setMinimumHeight(160)
+        status_layout.addWidget(self.status_summary_label)
+        status_layout.addWidget(self.status_tree)
+        status_group.setLayout(status_layout)
+        outer_layout.addWidget(status_group)
+        self.status_group = status_group
+
         # --- Create branch ---
         create_group = QGroupBox("Create Branch")
         create_layout = QHBoxLayout()
@@ -103,6 +157,19 @@ class GitTab(QWidget):
         actions_layout.addWidget(status_btn)
         actions_layout.addWidget(diff_btn)
         actions_layout.addWidget(view_log_btn)
+        # disabled while a command runs
+        self._command_buttons = [
+            checkout_btn,
+            create_btn,
+            commit_btn,
+            pull_btn,
+            push_btn,
+            reset_btn,
+            stash_btn,
+            status_btn,
+            diff_btn,
+            view_log_btn,
+        ]
 
         actions_group.setLayout(actions_layout)
         outer_layout.addWidget(actions_group)
@@ -116,109 +183,190 @@ class GitTab(QWidget):
 
         self.update_visibility()
 
-    def run_git_command(self, *args: str) -> subprocess.CompletedProcess[str] | None:
+    def run_git_command(
+        self,
+        *args: str,
+        callback: Callable[[CommandResult | None], None] | None = None,
+    ) -> None:
+        """Run ``git args`` in the background and pass the result to ``callback``."""
         if not self.main_window.ensure_project_path():
-            return None
-        command = ["git", *args]
-        print(f"$ {' '.join(command)}")
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=self.main_window.project_path,
-            )
-            if result.stdout:
-                print(result.stdout.strip())
-            if result.stderr:
-                print(result.stderr.strip())
-            return result
-        except FileNotFoundError:
-            print("Command not found: git")
-            return None
-        return None
-
-    def fetch_local_branches(self) -> list[str]:
-        if not self.main_window.project_path:
-            return []
-        try:
-            result = subprocess.run(
-                ["git", "branch", "--format=%(refname:short)"],
-                capture_output=True,
-                text=True,
-                cwd=self.main_window.project_path,
-            )
-            return [b.strip() for b in result.stdout.splitlines() if b.strip()]
-        except FileNotFoundError:
-            print("Command not found: git")
-            return []
+            return
+        self.git.run(list(args), self.main_window.project_path, callback)
+
+    def _on_busy_changed(self, busy: bool) -> None:
+        for btn in self._command_buttons:
+            btn.setEnabled(not busy)
+        self.init_btn.setEnabled(not busy)
+        self.progress_label.setText("Running git\u2026")
+        # indeterminate until git reports progress
+        self.progress_bar.setRange(0, 0)
+        self.progress_row.setVisible(busy)
+
+    def _on_progress(self, phase: str, percent: int) -> None:
+        self.progress_label.setText(phase)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(percent)
 
-    def fetch_remote_branches(self) -> list[str]:
+    def show_branch_dialog(self) -> None:
+        """Offer local and cached remote branches; remote ones refresh in place."""
+        path = self.main_window.project_path
+        if not path:
+            return
         remote = self.main_window.git_remote
-        if not remote or not self.main_window.project_path:
-            return []
-        try:
-            result = subprocess.run(
-                ["git", "ls-remote", "--heads", remote],
-                capture_output=True,
-                text=True,
-                cwd=self.main_window.project_path,
-            )
-            branches = []
-            for line in result.stdout.splitlines():
-                parts = line.split()
-                if len(parts) >= 2 and parts[1].startswith("refs/heads/"):
-                    branches.append(parts[1].split("/", 2)[2])
-            return branches
-        except FileNotFoundError:
-            print("Command not found: git")
-            return []
 
-    def show_branch_dialog(self) -> None:
-        local = self.fetch_local_branches()
-        remote = [
-            f"{self.main_window.git_remote}/{b}"
-            for b in self.fetch_remote_branches()
-        ]
-        dialog = BranchDialog(local + remote, self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            branch = dialog.get_branch()
-            if not branch:
-                return
-            if "/" in branch:
-                _remote, b = branch.split("/", 1)
-                self.checkout_remote_branch(b)
-            else:
-                self.checkout(branch)
-            self.load_branches()
+        def with_state(state: GitState | None) -> None:
+            self._open_branch_dialog(path, remote, state.branch_names() if state is not None else [])
 
-    def load_branches(self) -> None:
-        if not self.main_window.project_path:
-            return
-        _ = self.fetch_local_branches()
+        self.checkout_btn.setEnabled(False)
+        self.checkout_btn.setText("Loading\u2026")
+        self.git.state(path, with_state)
+
+    def _remote_branches(self, path: str, remote: str) -> list[str]:
+        heads = self.git.remote_heads(path, remote)
+        return [f"{remote}/{b}" for b in heads.branches] if heads is not None else []
+
+    def prefetch_remote_branches(self) -> None:
+        """Refresh the cached branch list of the configured remote in the background."""
+        self.git.prefetch_remote_heads(self.main_window.project_path, self.main_window.git_remote)
+
+    def _open_branch_dialog(self, path: str, remote: str, local: list[str]) -> None:
+        self.checkout_btn.setText("Checkout...")
+        self.checkout_btn.setEnabled(not self.git.busy)
+        dialog = BranchDialog(local + self._remote_branches(path, remote), self)
 
+        def refresh(changed_path: str, changed_remote: str) -> None:
+            if (changed_path, changed_remote) == (path, remote) and hasattr(dialog, "set_branches"):
+                dialog.set_branches(local + self._remote_branches(path, remote))
+
+        self.git.remote_heads_changed.connect(refresh)
+        self.git.prefetch_remote_heads(path, remote)
         try:
-            head = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True,
-                cwd=self.main_window.project_path,
-            )
-            current = head.stdout.strip()
-        except FileNotFoundError:
-            print("Command not found: git")
-            current = ""
-        self.current_branch = current
-        width = self.main_window.width() if hasattr(self.main_window, "width") else 800
-        self.update_responsive_layout(width)
+            accepted = dialog.exec() == QDialog.DialogCode.Accepted
+        finally:
+            self.git.remote_heads_changed.disconnect(refresh)
+        if not accepted:
+            return
+        branch = dialog.get_branch()
+        if not branch:
+            return
+        # local branches may contain slashes too
+        if remote and branch.startswith(f"{remote}/") and branch not in local:
+            self.checkout_remote_branch(branch[len(remote) + 1:])
+        else:
+            self.checkout(branch)
+
+    def watch_repository(self) -> None:
+        """Follow changes to the current project's repository, if it is one."""
+        repo = getattr(self.main_window, "is_git_repo", False)
+        self.git.watch(self.main_window.project_path if repo else "")
+        if repo and self.isVisible():
+            self.refresh_status()
+
+    def _on_state_changed(self, path: str) -> None:
+        # a hidden tab picks the change up when it is shown again
+        if path == self.main_window.project_path and self.isVisible():
+            self.load_branches()
+            self.refresh_status()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._status_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._status_timer.stop()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        # files may have been edited in another application meanwhile
+        if event.type() == QEvent.Type.ActivationChange and self.isVisible() and self.isActiveWindow():
+            self.refresh_status()
+
+    def _on_worktree_changed(self, path: str) -> None:
+        if path == self.main_window.project_path and self.isVisible():
+            self.refresh_status()
+
+    def refresh_status(self, write_index: bool = False) -> None:
+        """Probe the working tree in the background and update the status panel."""
+        path = self.main_window.project_path
+        if path and getattr(self.main_window, "is_git_repo", False):
+            self.git.refresh_status(path, write_index)
+
+    def _on_status_changed(self, path: str) -> None:
+        status = self.git.cached_status(path)
+        if path == self.main_window.project_path and status is not None:
+            self._show_status(status)
+
+    def _show_status(self, status: WorkingTreeStatus) -> None:
+        groups = [
+            ("Conflicted", status.conflicted),
+            ("Staged", status.staged),
+            ("Unstaged", status.unstaged),
+            ("Untracked", status.untracked),
+        ]
+        counts = [f"{len(entries)} {name.lower()}" for name, entries in groups if entries]
+        self.status_summary_label.setText(", ".join(counts) if counts else "Nothing to commit, working tree clean")
+        # keep groups the user folded away folded
+        items = (self.status_tree.topLevelItem(i) for i in range(self.status_tree.topLevelItemCount()))
+        collapsed = {item.data(0, Qt.ItemDataRole.UserRole) for item in items if item and not item.isExpanded()}
+        self.status_tree.setUpdatesEnabled(False)
+        self.status_tree.clear()
+        for name, entries in groups:
+            if not entries:
+                continue
+            group = QTreeWidgetItem([f"{name} ({len(entries)})"])
+            group.setData(0, Qt.ItemDataRole.UserRole, name)
+            column = 0 if name == "Staged" else 1
+            group.addChildren([QTreeWidgetItem([_status_text(e, column)]) for e in entries[:MAX_STATUS_ROWS]])
+            if len(entries) > MAX_STATUS_ROWS:
+                group.addChild(QTreeWidgetItem([f"\u2026 {len(entries) - MAX_STATUS_ROWS} more"]))
+            self.status_tree.addTopLevelItem(group)
+            group.setExpanded(name not in collapsed)
+        self.status_tree.setUpdatesEnabled(True)
+
+    def load_branches(self, refresh: bool = False) -> None:
+        """Show the current branch from the cached repository state.
+
+        With ``refresh`` the state is probed again first.
+        """
+        path = self.main_window.project_path
+        if not path:
+            return
 
-    def checkout(self, branch: str) -> None:
-        self.main_window.ensure_project_path()
-        self.run_git_command("checkout", branch)
+        def done(state: GitState | None) -> None:
+            if state is not None and path == self.main_window.project_path:
+                self._show_state(state)
+
+        self.git.state(path, done, refresh)
+
+    def _show_state(self, state: GitState) -> None:
+        self._set_current_branch(state.head)
+        branch = state.current
+        parts = []
+        if branch is not None and branch.ahead:
+            parts.append(f"\u2191{branch.ahead}")
+        if branch is not None and branch.behind:
+            parts.append(f"\u2193{branch.behind}")
+        self.sync_label.setText(" ".join(parts))
+        self.sync_label.setToolTip(
+            f"{branch.ahead} ahead, {branch.behind} behind {branch.upstream}"
+            if branch is not None and branch.upstream
+            else ""
+        )
+
+    def _set_current_branch(self, branch: str) -> None:
         self.current_branch = branch
         width = self.main_window.width() if hasattr(self.main_window, "width") else 800
         self.update_responsive_layout(width)
 
+    def checkout(self, branch: str) -> None:
+        def done(result: CommandResult | None) -> None:
+            if result is not None and result.returncode == 0:
+                self._set_current_branch(branch)
+                self.load_branches()
+
+        self.run_git_command("checkout", branch, callback=done)
+
     def hard_reset(self) -> None:
         if not self.main_window.ensure_project_path():
             return
@@ -228,42 +376,53 @@ class GitTab(QWidget):
             "Discard all local changes and reset to HEAD?",
         )
         if reply == QMessageBox.StandardButton.Yes:
-            result = self.run_git_command("reset", "--hard")
-            if result and result.returncode == 0:
-                print("Hard reset successful")
-            else:
-                print("Hard reset failed")
+            self.run_git_command(
+                "reset",
+                "--hard",
+                callback=lambda r: print("Hard reset successful" if r and r.returncode == 0 else "Hard reset failed"),
+            )
 
     def stash(self) -> None:
         if not self.main_window.ensure_project_path():
             return
-        result = self.run_git_command("stash")
-        if result and result.returncode == 0:
-            print("Changes stashed successfully")
-        else:
-            print("Stash failed")
+        self.run_git_command(
+            "stash",
+            callback=lambda r: print("Changes stashed successfully" if r and r.returncode == 0 else "Stash failed"),
+        )
 
     def view_log(self) -> None:
         """Show recent git log entries."""
         self.run_git_command("log", "-n", "20", "--oneline")
 
     def show_status(self) -> None:
-        """Display git status."""
-        self.run_git_command("status")
+        """Display git status and refresh the status panel."""
+        # the panel's probes leave the index alone; this one lets git
+        # store what it learnt about the work tree
+        self.run_git_command("status", callback=lambda _r: self.refresh_status(write_index=True))
 
     def show_diff(self) -> None:
-        """Display git diff."""
-        self.run_git_command("diff")
+        """Show unstaged changes in a viewer that streams them file by file."""
+        if not self.main_window.ensure_project_path():
+            return
+        try:
+            dialog = DiffViewerDialog(self.main_window.project_path, executor=self.git.executor, parent=self)
+        except OSError as e:
+            print(f"Failed to open diff viewer: {e}")
+            return
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
 
     def create_branch(self) -> None:
         branch = self.branch_name_edit.text().strip()
         if not branch:
             return
-        self.run_git_command("checkout", "-b", branch)
-        self.load_branches()
-        self.current_branch = branch
-        width = self.main_window.width() if hasattr(self.main_window, "width") else 800
-        self.update_responsive_layout(width)
+
+        def done(result: CommandResult | None) -> None:
+            if result is not None and result.returncode == 0:
+                self._set_current_branch(branch)
+                self.load_branches()
+
+        self.run_git_command("checkout", "-b", branch, callback=done)
 
     def commit_changes(self) -> None:
         message = self.commit_message_edit.text().strip()
@@ -271,29 +430,37 @@ class GitTab(QWidget):
             return
         self.run_git_command("commit", "-m", message)
 
-    def get_remotes(self) -> list[str]:
-        if not self.main_window.project_path:
-            return []
-        try:
-            res = subprocess.run(
-                ["git", "remote"],
-                capture_output=True,
-                text=True,
-                cwd=self.main_window.project_path,
-            )
-            return [r.strip() for r in res.stdout.splitlines() if r.strip()]
-        except FileNotFoundError:
-            return []
+    def load_remotes(self, callback: Callable[[list[str]], Any]) -> None:
+        """Pass the repository's remotes to ``callback`` from the cached state.
+
+        The remotes of a project switched away from in the meantime are dropped.
+        """
+        path = self.main_window.project_path
+        if not path:
+            callback([])
+            return
+
+        def done(state: GitState | None) -> None:
+            if path == self.main_window.project_path:
+                callback(list(state.remotes) if state is not None else [])
+
+        self.git.state(path, done)
 
     def checkout_remote_branch(self, branch: str) -> None:
         remote = self.main_window.git_remote
         if not remote:
             return
-        self.run_git_command("fetch", remote)
-        self.run_git_command("checkout", "-t", f"{remote}/{branch}")
-        self.current_branch = branch
-        width = self.main_window.width() if hasattr(self.main_window, "width") else 800
-        self.update_responsive_layout(width)
+
+        def checked_out(result: CommandResult | None) -> None:
+            if result is not None and result.returncode == 0:
+                self._set_current_branch(branch)
+                self.load_branches()
+
+        def fetched(result: CommandResult | None) -> None:
+            if result is not None and result.returncode == 0:
+                self.run_git_command("checkout", "-t", f"{remote}/{branch}", callback=checked_out)
+
+        self.run_git_command("fetch", remote, callback=fetched)
 
     def _truncate_branch(self, branch: str) -> str:
         if len(branch) <= self._truncate_width:
@@ -310,14 +477,24 @@ class GitTab(QWidget):
 
     def init_repo(self) -> None:
         """Initialize a new git repository in the current project."""
-        res = self.run_git_command("init")
-        if res and res.returncode == 0:
-            self.main_window.is_git_repo = True
-            self.update_visibility()
-            self.load_branches()
+        def done(result: CommandResult | None) -> None:
+            if result is not None and result.returncode == 0:
+                self.main_window.is_git_repo = True
+                self.update_visibility()
+                self.watch_repository()
+                self.load_branches()
+
+        self.run_git_command("init", callback=done)
 
     def update_visibility(self) -> None:
         is_repo = getattr(self.main_window, "is_git_repo", False)
-        for grp in [self.branch_group, self.create_group, self.commit_group, self.actions_group]:
+        for grp in [self.branch_group, self.status_group, self.create_group, self.commit_group, self.actions_group]:
             grp.setVisible(is_repo)
         self.init_btn.setVisible(not is_repo)
+
+
+def _status_text(entry: StatusEntry, column: int) -> str:
+    """Return ``entry`` as "M path" using its index or work tree letter."""
+    letter = entry.code[column] if entry.code[column] != "." else entry.code[1 - column]
+    path = f"{entry.orig_path} \u2192 {entry.path}" if entry.orig_path else entry.path
+    return f"{letter} {path}"
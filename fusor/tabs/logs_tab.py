@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QTextEdit,
+    QPlainTextEdit,
     QCheckBox,
     QSizePolicy,
     QHBoxLayout,
@@ -9,22 +10,81 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QComboBox,
     QScrollArea,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
 )
-from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QTextCursor, QTextCharFormat, QColor
+from PyQt6.QtCore import QPoint, QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QTextCursor
+from datetime import datetime
 from pathlib import Path, PurePath
+import re
+import sqlite3
 from ..utils import expand_log_paths
+from ..logs import (
+    FileErrorGroups,
+    HistogramBin,
+    LogHighlighter,
+    LogHistogramStrip,
+    LogParser,
+    LogViewerDialog,
+    LogWatcher,
+    SearchQuery,
+    SearchResult,
+    compile_query,
+    find_matches,
+    is_compressed,
+    level_name,
+    parse_query,
+)
 from ..ui import create_button, BUTTON_SIZE, CONTENT_MARGIN, DEFAULT_SPACING
 
 
+# Delay before re-running an active search after the log view changed
+RESEARCH_DELAY_MS = 250
+
+# Upper bound on highlighted matches per screen, guards against tiny fonts
+MAX_VISIBLE_HIGHLIGHTS = 500
+
+# Number of error groups listed in the grouping table
+MAX_ERROR_GROUPS = 200
+
+
 class LogsTab(QWidget):
+    # emitted from the search worker with (generation, SearchResult)
+    _search_done = pyqtSignal(int, object)
+    # emitted from the grouping worker with (path, rows)
+    _groups_done = pyqtSignal(str, object)
+    # emitted from the indexing worker once new records were stored
+    _index_done = pyqtSignal()
+    # emitted from the query worker with (generation, hits or None)
+    _query_done = pyqtSignal(int, object)
+
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
 
         # search state
-        self._search_positions: list[int] = []
+        self._search_result = SearchResult()
+        self._search_query: SearchQuery | None = None
+        self._search_generation = 0
+        self._search_future = None
+        self._highlighted_range = range(0)
         self._current_search_index = 0
+        self._search_done.connect(self._on_search_done)
+
+        # error grouping state, one incremental grouper per file
+        self._groupers: dict[str, FileErrorGroups] = {}
+        self._grouping = False
+        self._grouping_dirty = False
+        self._groups_done.connect(self._on_groups_done)
+
+        # log index state
+        self._indexing = False
+        self._indexing_dirty = False
+        self._query_generation = 0
+        self._index_done.connect(self._on_index_done)
+        self._query_done.connect(self._on_query_done)
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -57,6 +117,28 @@ class LogsTab(QWidget):
         ])
         outer_layout.addWidget(self.level_selector)
 
+        # --- View Options ---
+        view_layout = QHBoxLayout()
+        view_layout.setSpacing(DEFAULT_SPACING)
+        self.merge_checkbox = QCheckBox("Merge timeline")
+        self.merge_checkbox.setToolTip("Interleave all log files by timestamp")
+        self.merge_checkbox.toggled.connect(lambda _checked: self.main_window.refresh_logs())
+        view_layout.addWidget(self.merge_checkbox)
+        self.group_checkbox = QCheckBox("Group errors")
+        self.group_checkbox.setToolTip("Count repeated warnings and errors of the selected log")
+        self.group_checkbox.toggled.connect(self.on_group_errors_toggled)
+        view_layout.addWidget(self.group_checkbox)
+        self.follow_checkbox = QCheckBox("Follow containers")
+        self.follow_checkbox.setToolTip("Stream docker compose logs instead of log files")
+        self.follow_checkbox.toggled.connect(self.on_follow_toggled)
+        view_layout.addWidget(self.follow_checkbox)
+        self.services_edit = QLineEdit()
+        self.services_edit.setPlaceholderText("All services")
+        self.services_edit.setToolTip("Compose services to follow, separated by commas")
+        view_layout.addWidget(self.services_edit)
+        view_layout.addStretch(1)
+        outer_layout.addLayout(view_layout)
+
         # --- Search ---
         search_layout = QHBoxLayout()
         search_layout.setSpacing(DEFAULT_SPACING)
@@ -74,31 +156,78 @@ class LogsTab(QWidget):
         self.next_btn.setEnabled(False)
         self.next_btn.clicked.connect(lambda: self.cycle_match(1))
 
+        self.regex_checkbox = QCheckBox("Regex")
+        self.word_checkbox = QCheckBox("Whole word")
+
         search_layout.addWidget(self.search_edit)
+        search_layout.addWidget(self.regex_checkbox)
+        search_layout.addWidget(self.word_checkbox)
         search_layout.addWidget(self.search_btn)
         search_layout.addWidget(self.prev_btn)
         search_layout.addWidget(self.next_btn)
         outer_layout.addLayout(search_layout)
 
+        # --- History Query ---
+        self.query_row = QWidget()
+        query_layout = QHBoxLayout(self.query_row)
+        query_layout.setContentsMargins(0, 0, 0, 0)
+        query_layout.setSpacing(DEFAULT_SPACING)
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText('Query history, e.g. level>=ERROR AND message:"SQLSTATE" since:2h')
+        self.query_edit.returnPressed.connect(self.query_log_index)
+        self.query_btn = create_button("Query", "system-search")
+        self.query_btn.clicked.connect(self.query_log_index)
+        query_layout.addWidget(self.query_edit)
+        query_layout.addWidget(self.query_btn)
+        outer_layout.addWidget(self.query_row)
+
+        self.query_view = QPlainTextEdit()
+        self.query_view.setReadOnly(True)
+        self._query_highlighter = LogHighlighter(self.query_view)
+        self.query_view.setVisible(False)
+        outer_layout.addWidget(self.query_view)
+
+        # --- Metrics ---
+        self.metrics_strip = LogHistogramStrip()
+        self.metrics_strip.setToolTip("Log entries per minute by level")
+        self.metrics_strip.binClicked.connect(self.jump_to_time)
+        self.metrics_strip.setVisible(False)
+        outer_layout.addWidget(self.metrics_strip)
+
         # --- Log Output ---
-        self.log_view = QTextEdit()
+        self.log_view = QPlainTextEdit()
         self.log_view.setReadOnly(True)
         self.log_view.setPlaceholderText("No logs loaded yet...")
         self.log_view.setSizePolicy(
             QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding
         )
-        # Colorize logs when text changes
-        self._colorizing = False
-        self._level_colors = {
-            "DEBUG": Qt.GlobalColor.darkGray,
-            "INFO": Qt.GlobalColor.black,
-            "WARNING": Qt.GlobalColor.darkYellow,
-            "ERROR": Qt.GlobalColor.red,
-            "CRITICAL": Qt.GlobalColor.magenta,
-        }
+        # Colorize log levels as blocks are added or scrolled into view
+        self._highlighter = LogHighlighter(self.log_view)
+        # Only matches inside the viewport carry a highlight
+        self.log_view.updateRequest.connect(self._highlight_visible_matches)
+        self._research_timer = QTimer(self)
+        self._research_timer.setSingleShot(True)
+        self._research_timer.setInterval(RESEARCH_DELAY_MS)
+        self._research_timer.timeout.connect(self._rerun_search)
         self.log_view.textChanged.connect(self._on_log_text_changed)
         outer_layout.addWidget(self.log_view)
 
+        # --- Error Groups ---
+        self.group_table = QTableWidget(0, 6)
+        self.group_table.setHorizontalHeaderLabels(
+            ["Count", "Level", "Message", "Top frame", "First seen", "Last seen"]
+        )
+        self.group_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        vertical = self.group_table.verticalHeader()
+        if vertical is not None:
+            vertical.setVisible(False)
+        header = self.group_table.horizontalHeader()
+        if header is not None:
+            header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.group_table.setVisible(False)
+        outer_layout.addWidget(self.group_table)
+        self.log_selector.currentIndexChanged.connect(lambda _index: self.update_error_groups())
+
         # --- Controls Group ---
         control_box = QGroupBox("Controls")
         self.control_box = control_box
@@ -113,6 +242,10 @@ class LogsTab(QWidget):
         self.open_btn.clicked.connect(self.open_selected_log)
         control_layout.addWidget(self.open_btn)
 
+        self.browse_btn = create_button("Browse", "document-preview")
+        self.browse_btn.clicked.connect(self.browse_selected_log)
+        control_layout.addWidget(self.browse_btn)
+
         self.clear_btn = create_button("", "edit-clear", fixed=True)
         self.clear_btn.clicked.connect(self.main_window.clear_log_file)
         control_layout.addWidget(self.clear_btn)
@@ -132,11 +265,16 @@ class LogsTab(QWidget):
         # Expose log view to main_window
         self.main_window.log_view = self.log_view
 
-        # Timer for auto-refresh
+        # Auto-refresh follows filesystem notifications; the timer only
+        # polls paths on filesystems without notify support
+        self._watcher = LogWatcher(self)
+        self._watcher.changed.connect(self._on_logs_changed)
         self._timer = QTimer(self)
         self.update_timer_interval(self.main_window.auto_refresh_secs)
-        self._timer.timeout.connect(self.main_window.refresh_logs)
+        self._timer.timeout.connect(self._on_logs_changed)
         self.auto_checkbox.toggled.connect(self.on_auto_refresh_toggled)
+        self.update_index_controls()
+        self.update_follow_controls()
 
     def update_timer_interval(self, seconds: int) -> None:
         self._timer.setInterval(int(seconds) * 1000)
@@ -144,128 +282,418 @@ class LogsTab(QWidget):
 
     def set_log_dirs(self, paths: list[str]) -> None:
         self.log_selector.clear()
-        expanded = expand_log_paths(self.main_window.project_path, paths)
+        # rotated and compressed logs can be picked individually
+        expanded = expand_log_paths(self.main_window.project_path, paths, rotated=True)
         for p in expanded:
             self.log_selector.addItem(p, p)
+        if hasattr(self, "_watcher") and self.auto_checkbox.isChecked():
+            self._watch_logs()
+
+    def _watched_paths(self) -> list[str]:
+        """Return configured log directories and the files they contain."""
+        base = Path(self.main_window.project_path)
+        paths: list[str] = []
+        for p in self.main_window.log_dirs:
+            resolved = Path(p) if Path(p).is_absolute() else base / p
+            paths.append(str(resolved))
+            # watch the parent too so a missing log file is noticed once created
+            paths.append(str(resolved.parent))
+        for p in expand_log_paths(self.main_window.project_path, self.main_window.log_dirs, rotated=True):
+            paths.append(str(Path(p) if Path(p).is_absolute() else base / p))
+        return paths
+
+    def _watch_logs(self) -> None:
+        self._watcher.watch(self._watched_paths())
+        if self._watcher.needs_polling():
+            if not self._timer.isActive():
+                self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _on_logs_changed(self) -> None:
+        # new or rotated files may have appeared in a watched directory
+        self._watch_logs()
+        self.main_window.refresh_logs()
 
     def on_auto_refresh_toggled(self, checked: bool) -> None:
         if checked:
-            self._timer.start()
+            self._watch_logs()
             self.main_window.refresh_logs()
         else:
+            self._watcher.clear()
             self._timer.stop()
 
+    @property
+    def _search_positions(self):
+        """Start offsets of the current matches."""
+        return self._search_result.starts
+
     def search_logs(self) -> None:
+        """Find the search text in the log view on a background worker."""
         text = self.search_edit.text().strip()
         if not text:
-            self.log_view.setExtraSelections([])
-            self.prev_btn.setEnabled(False)
-            self.next_btn.setEnabled(False)
+            self._clear_search()
             return
 
+        query = SearchQuery(
+            text,
+            regex=self.regex_checkbox.isChecked(),
+            whole_word=self.word_checkbox.isChecked(),
+        )
+        try:
+            compile_query(query)
+        except re.error as e:
+            print(f"Invalid search pattern: {e}")
+            self._clear_search()
+            return
+        self._search_query = query
+        self._start_search(query, jump=True)
+
+    def _clear_search(self) -> None:
+        self._search_generation += 1
+        self._search_query = None
+        self._search_result = SearchResult()
+        self._highlighted_range = range(0)
+        self._research_timer.stop()
+        self.log_view.setExtraSelections([])
+        self.prev_btn.setEnabled(False)
+        self.next_btn.setEnabled(False)
+
+    def _start_search(self, query: SearchQuery, jump: bool) -> None:
+        self._search_generation += 1
+        generation = self._search_generation
+        if self._search_future is not None:
+            # a stale search that has not started yet is not worth running
+            self._search_future.cancel()
+            self._search_future = None
         content = self.log_view.toPlainText()
-        text_lower = text.lower()
-
-        # Find all match positions
-        self._search_positions.clear()
-        start = 0
-        while True:
-            idx = content.lower().find(text_lower, start)
-            if idx == -1:
-                break
-            self._search_positions.append(idx)
-            start = idx + len(text)
-
-        if not self._search_positions:
-            self.log_view.setExtraSelections([])
-            self.prev_btn.setEnabled(False)
-            self.next_btn.setEnabled(False)
+
+        def task() -> None:
+            if generation == self._search_generation:
+                self._search_done.emit(generation, (find_matches(content, query), jump))
+
+        executor = getattr(self.main_window, "executor", None)
+        if executor is None:
+            task()
+        else:
+            self._search_future = executor.submit(task, lane="io")
+
+    def _on_search_done(self, generation: int, payload) -> None:
+        if generation != self._search_generation:
             return
+        self._search_future = None
+        result, jump = payload
+        self._search_result = result
+        self._highlighted_range = range(0)
+        if jump or self._current_search_index >= len(result):
+            self._current_search_index = 0
+        self.prev_btn.setEnabled(len(result) > 1)
+        self.next_btn.setEnabled(len(result) > 1)
+        if jump:
+            self._move_to_current_match()
+        self._highlight_visible_matches()
+
+    def _on_log_text_changed(self) -> None:
+        if self._search_query is not None:
+            self._research_timer.start()
+
+    def _rerun_search(self) -> None:
+        if self._search_query is not None:
+            self._start_search(self._search_query, jump=False)
+
+    def _highlight_visible_matches(self, *_args) -> None:
+        """Highlight the matches that fall inside the visible viewport."""
+        result = self._search_result
+        if not len(result):
+            if self._highlighted_range:
+                self._highlighted_range = range(0)
+                self.log_view.setExtraSelections([])
+            return
+        document = self.log_view.document()
+        if document is None:
+            return
+        first = self.log_view.firstVisibleBlock()
+        start = first.position() if first.isValid() else 0
+        viewport = self.log_view.viewport()
+        if viewport is None:
+            return
+        corner = QPoint(viewport.width(), viewport.height())
+        last = self.log_view.cursorForPosition(corner).block()
+        end = last.position() + last.length() if last.isValid() else document.characterCount()
+        visible = result.between(start, end)
+        if visible == self._highlighted_range:
+            # setting selections repaints, which would trigger us again
+            return
+        self._highlighted_range = visible
 
-        # Highlight all matches
         selections = []
-        for pos in self._search_positions:
-            cursor = self.log_view.textCursor()
+        for i in visible[:MAX_VISIBLE_HIGHLIGHTS]:
+            pos, length = result.span(i)
+            cursor = QTextCursor(document)
             cursor.setPosition(pos)
-            cursor.movePosition(
-                QTextCursor.MoveOperation.Right,
-                QTextCursor.MoveMode.KeepAnchor,
-                len(text),
-            )
+            cursor.setPosition(pos + length, QTextCursor.MoveMode.KeepAnchor)
             selection = QTextEdit.ExtraSelection()
             selection.cursor = cursor
             selection.format.setBackground(Qt.GlobalColor.yellow)
             selections.append(selection)
         self.log_view.setExtraSelections(selections)
 
-        self._current_search_index = 0
-        self.prev_btn.setEnabled(len(self._search_positions) > 1)
-        self.next_btn.setEnabled(len(self._search_positions) > 1)
-        self._move_to_current_match(len(text))
-
-    def _move_to_current_match(self, length: int) -> None:
-        if not self._search_positions:
+    def _move_to_current_match(self) -> None:
+        if not len(self._search_result):
             return
-        pos = self._search_positions[self._current_search_index]
+        pos, length = self._search_result.span(self._current_search_index)
         cursor = self.log_view.textCursor()
         cursor.setPosition(pos)
-        cursor.movePosition(
-            QTextCursor.MoveOperation.Right,
-            QTextCursor.MoveMode.KeepAnchor,
-            length,
-        )
+        cursor.setPosition(pos + length, QTextCursor.MoveMode.KeepAnchor)
         self.log_view.setTextCursor(cursor)
         self.log_view.ensureCursorVisible()
 
     def cycle_match(self, delta: int) -> None:
-        if not self._search_positions:
+        count = len(self._search_result)
+        if not count:
             return
-        length = len(self.search_edit.text().strip())
-        if length == 0:
+        self._current_search_index = (self._current_search_index + delta) % count
+        self._move_to_current_match()
+
+    def show_histogram(self, bins: list[HistogramBin]) -> None:
+        """Show entries per minute of the loaded logs above the log view."""
+        self.metrics_strip.set_bins(bins)
+        self.metrics_strip.setVisible(bool(bins))
+
+    def jump_to_time(self, start: float, end: float) -> None:
+        """Scroll the log view to the first entry logged at or after ``start``."""
+        document = self.log_view.document()
+        if document is None:
             return
-        self._current_search_index = (self._current_search_index + delta) % len(
-            self._search_positions
-        )
-        self._move_to_current_match(length)
-
-    def open_selected_log(self) -> None:
-        """Open the currently selected log file with the system default app."""
+        framework = getattr(self.main_window, "current_framework", lambda: "")()
+        parser = LogParser(framework)
+        block = document.begin()
+        while block.isValid():
+            text = block.text()
+            record = parser.parse_header(text)
+            if record is None:
+                # merged timelines and container output prefix each entry
+                # with its file or service name
+                separator = "] " if text.startswith("[") else " | "
+                record = parser.parse_header(text.partition(separator)[2])
+            if record is not None and record.timestamp is not None and record.timestamp >= start:
+                if record.timestamp >= end:
+                    print("No entries of that minute are shown with the current level filter")
+                cursor = QTextCursor(block)
+                self.log_view.setTextCursor(cursor)
+                self.log_view.centerCursor()
+                return
+            block = block.next()
+        print("No entries of that minute are shown in the log view")
+
+    def _selected_log_path(self) -> Path | None:
         path = self.log_selector.currentData()
         if not path:
-            return
+            return None
         p = PurePath(path)
         if not p.is_absolute():
-            p = Path(self.main_window.project_path) / p
-        else:
-            p = Path(p)
+            return Path(self.main_window.project_path) / p
+        return Path(p)
+
+    def open_selected_log(self) -> None:
+        """Open the currently selected log file with the system default app."""
+        p = self._selected_log_path()
+        if p is None:
+            return
         self.main_window.open_file(str(p))
 
-    def _on_log_text_changed(self) -> None:
-        if self._colorizing:
+    def browse_selected_log(self) -> None:
+        """Show the whole selected log file in a virtualized viewer."""
+        p = self._selected_log_path()
+        if p is None:
+            return
+        if is_compressed(str(p)):
+            print(f"Compressed logs cannot be browsed: {p}")
+            return
+        try:
+            dialog = LogViewerDialog(str(p), self)
+        except OSError as e:
+            print(f"Failed to open log file: {e}")
+            return
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
+
+    def on_group_errors_toggled(self, checked: bool) -> None:
+        self.group_table.setVisible(checked)
+        if checked:
+            self.update_error_groups()
+        else:
+            self._groupers.clear()
+
+    def update_error_groups(self) -> None:
+        """Count error groups of the selected log on a background worker."""
+        if not self.group_checkbox.isChecked():
+            return
+        if self._grouping:
+            # picked up once the running pass finishes
+            self._grouping_dirty = True
+            return
+        p = self._selected_log_path()
+        if p is None or not p.exists():
+            self.group_table.setRowCount(0)
+            return
+        path = str(p)
+        grouper = self._groupers.get(path)
+        if grouper is None:
+            framework = getattr(self.main_window, "current_framework", lambda: "")()
+            grouper = self._groupers[path] = FileErrorGroups(path, framework)
+
+        def task() -> None:
+            rows: list[tuple] = []
+            try:
+                grouper.update()
+                rows = [
+                    (g.count, level_name(g.level), g.template, g.frame, g.first_seen, g.last_seen)
+                    for g in grouper.groups.top(MAX_ERROR_GROUPS)
+                ]
+            except OSError as e:
+                print(f"Failed to group log file: {e}")
+            finally:
+                self._groups_done.emit(path, rows)
+
+        self._grouping = True
+        executor = getattr(self.main_window, "executor", None)
+        if executor is None:
+            task()
+        else:
+            executor.submit(task, lane="index")
+
+    def _on_groups_done(self, path: str, rows: list) -> None:
+        self._grouping = False
+        selected = self._selected_log_path()
+        if selected is not None and str(selected) == path:
+            self._show_error_groups(rows)
+        if self._grouping_dirty:
+            self._grouping_dirty = False
+            self.update_error_groups()
+
+    def _show_error_groups(self, rows: list) -> None:
+        def fmt(ts: float | None) -> str:
+            return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S") if ts is not None else ""
+
+        self.group_table.setRowCount(len(rows))
+        for row, (count, level, template, frame, first, last) in enumerate(rows):
+            values = [str(count), level, template, frame, fmt(first), fmt(last)]
+            for column, value in enumerate(values):
+                self.group_table.setItem(row, column, QTableWidgetItem(value))
+
+    def update_follow_controls(self) -> None:
+        """Offer following container logs only for docker projects."""
+        enabled = bool(getattr(self.main_window, "use_docker", False))
+        self.follow_checkbox.setVisible(enabled)
+        self.services_edit.setVisible(enabled)
+        if not enabled and self.follow_checkbox.isChecked():
+            self.follow_checkbox.setChecked(False)
+
+    def on_follow_toggled(self, checked: bool) -> None:
+        self.services_edit.setEnabled(not checked)
+        if checked:
+            services = [s for s in re.split(r"[,\s]+", self.services_edit.text()) if s]
+            self.main_window.follow_container_logs(services)
+        else:
+            self.main_window.stop_following_logs()
+
+    def set_following(self, following: bool) -> None:
+        """Reflect a stream started or ended elsewhere without restarting it."""
+        self.follow_checkbox.blockSignals(True)
+        self.follow_checkbox.setChecked(following)
+        self.follow_checkbox.blockSignals(False)
+        self.services_edit.setEnabled(not following)
+
+    def _log_index(self):
+        get_index = getattr(self.main_window, "log_index", None)
+        return get_index() if get_index is not None else None
+
+    def update_index_controls(self) -> None:
+        """Show the history query only for projects that index their logs."""
+        enabled = bool(getattr(self.main_window, "index_logs", False))
+        self.query_row.setVisible(enabled)
+        if not enabled:
+            self.query_view.setVisible(False)
+
+    def update_log_index(self) -> None:
+        """Store new records of the project's logs in the index on a background worker."""
+        index = self._log_index()
+        if index is None:
+            return
+        if self._indexing:
+            # picked up once the running pass finishes
+            self._indexing_dirty = True
+            return
+        paths = self.main_window.log_index_files()
+        framework = getattr(self.main_window, "current_framework", lambda: "")()
+
+        def task() -> None:
+            try:
+                index.ingest_all(paths, framework)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Failed to index logs: {e}")
+            finally:
+                self._index_done.emit()
+
+        self._indexing = True
+        executor = getattr(self.main_window, "executor", None)
+        if executor is None:
+            task()
+        else:
+            executor.submit(task, lane="index")
+
+    def _on_index_done(self) -> None:
+        self._indexing = False
+        if self._indexing_dirty:
+            self._indexing_dirty = False
+            self.update_log_index()
+
+    def query_log_index(self) -> None:
+        """Run the history query on a background worker."""
+        index = self._log_index()
+        if index is None:
+            print("Log indexing is disabled for this project")
+            return
+        text = self.query_edit.text().strip()
+        self._query_generation += 1
+        generation = self._query_generation
+        if not text:
+            self.query_view.clear()
+            self.query_view.setVisible(False)
             return
-        self._colorizing = True
         try:
-            text = self.log_view.toPlainText()
-            cursor = self.log_view.textCursor()
-            cursor.beginEditBlock()
-            pos = 0
-            for line in text.splitlines():
-                fmt = QTextCharFormat()
-                for lvl, color in self._level_colors.items():
-                    if lvl in line:
-                        fmt.setForeground(QColor(color))
-                        break
-                cursor.setPosition(pos)
-                cursor.movePosition(
-                    QTextCursor.MoveOperation.Right,
-                    QTextCursor.MoveMode.KeepAnchor,
-                    len(line),
-                )
-                cursor.mergeCharFormat(fmt)
-                pos += len(line) + 1
-            cursor.endEditBlock()
-        finally:
-            self._colorizing = False
+            query = parse_query(text)
+        except ValueError as e:
+            print(f"Invalid query: {e}")
+            return
+
+        def task() -> None:
+            hits = None
+            try:
+                hits = index.search(query)
+            except (ValueError, sqlite3.Error) as e:
+                print(f"Log query failed: {e}")
+            finally:
+                self._query_done.emit(generation, hits)
+
+        executor = getattr(self.main_window, "executor", None)
+        if executor is None:
+            task()
+        else:
+            executor.submit(task, lane="io")
+
+    def _on_query_done(self, generation: int, hits) -> None:
+        if generation != self._query_generation or hits is None:
+            return
+        base = Path(self.main_window.project_path)
+        lines: list[str] = []
+        for hit in hits:
+            path = Path(hit.path)
+            name = path.relative_to(base) if path.is_relative_to(base) else path
+            lines.append(f"[{name}] {hit.text}")
+        self.query_view.setPlainText("\n".join(lines) if lines else "No matching records")
+        self.query_view.setVisible(True)
 
     def update_responsive_layout(self, width: int) -> None:
         """Adjust layout visibility based on parent window width."""
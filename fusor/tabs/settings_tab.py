@@ -130,11 +130,8 @@ class SettingsTab(QWidget):
         docker_form.addRow("Docker Project Path:", self.docker_project_path_edit)
 
         self.remote_combo = QComboBox()
-        remotes = self.main_window.git_tab.get_remotes()
-        if remotes:
-            self.remote_combo.addItems(remotes)
-        if self.main_window.git_remote in remotes:
-            self.remote_combo.setCurrentText(self.main_window.git_remote)
+        if self.main_window.git_remote:
+            self.remote_combo.addItem(self.main_window.git_remote)
         self.remote_label = QLabel("Git Remote:")
         project_form.addRow(self.remote_label, self.remote_combo)
 
@@ -185,6 +182,14 @@ class SettingsTab(QWidget):
         self.add_log_btn = add_log_btn
         logs_form.addRow("", self._wrap(add_log_btn))
 
+        self.index_logs_checkbox = QCheckBox("Index logs for history queries")
+        self.index_logs_checkbox.setToolTip(
+            "Keep a searchable copy of log records, even after a log is cleared"
+        )
+        if hasattr(self.main_window, "index_logs"):
+            self.index_logs_checkbox.setChecked(self.main_window.index_logs)
+        logs_form.addRow("", self.index_logs_checkbox)
+
         self.refresh_spin = QSpinBox()
         self.refresh_spin.setRange(1, 3600)
         self.refresh_spin.setValue(self.main_window.auto_refresh_secs)
@@ -276,8 +281,11 @@ class SettingsTab(QWidget):
         self.main_window.theme_combo = self.theme_combo
         self.main_window.terminal_checkbox = self.terminal_checkbox
         self.main_window.open_browser_checkbox = self.open_browser_checkbox
+        self.main_window.index_logs_checkbox = self.index_logs_checkbox
         self.main_window.console_output_checkbox = self.console_output_checkbox
         self.main_window.tray_checkbox = self.tray_checkbox
+        if hasattr(self.main_window.git_tab, "load_remotes"):
+            self.main_window.git_tab.load_remotes(self.main_window.set_remote_choices)
 
         self.on_docker_toggled(self.docker_checkbox.isChecked())
         self.on_terminal_toggled(self.terminal_checkbox.isChecked())
@@ -319,6 +327,9 @@ class SettingsTab(QWidget):
         self.open_browser_checkbox.toggled.connect(
             self.main_window.mark_settings_dirty
         )
+        self.index_logs_checkbox.toggled.connect(
+            self.main_window.mark_settings_dirty
+        )
         self.console_output_checkbox.toggled.connect(
             self.main_window.mark_settings_dirty
         )
@@ -1,18 +1,100 @@
 from __future__ import annotations
 
+import os
+import re
+import stat
+import threading
+import time
 from pathlib import Path
 from typing import Iterable, List
 
+# Log files and their rotated or compressed siblings, e.g. ``app.log.1``,
+# ``app.log.2.gz`` or ``laravel-2026-10-01.log.gz``
+ROTATED_LOG_PATTERN = re.compile(r"\.log(?:\.(\d+))?(?:\.(?:gz|bz2|xz))?$")
 
-def expand_log_paths(project_path: str, paths: Iterable[str]) -> List[str]:
-    """Expand directories in ``paths`` to the ``*.log`` files they contain."""
+# A directory listing is only reused once it is this much younger than the
+# directory's mtime; files added within the same mtime tick would otherwise
+# go unnoticed on filesystems with coarse timestamps
+RACY_LISTING_NS = 2_000_000_000
+
+# Directory listings kept by ``expand_log_paths``
+MAX_CACHED_LISTINGS = 256
+
+# (directory, rotated) -> (directory mtime, time of listing, files)
+_listings: dict[tuple[str, bool], tuple[int, int, list[Path]]] = {}
+_listings_lock = threading.Lock()
+
+
+def _log_sort_key(path: Path) -> tuple[str, int, str]:
+    # keep each family together with the live file first, then .1, .2, ...
+    match = ROTATED_LOG_PATTERN.search(path.name)
+    if match is None:
+        return path.name, 0, path.name
+    return path.name[:match.start()], int(match.group(1) or 0), path.name
+
+
+def _log_files_in(directory: Path, rotated: bool) -> list[Path]:
+    if not rotated:
+        return sorted(directory.glob("*.log"))
+    files = [f for f in directory.glob("*.log*") if ROTATED_LOG_PATTERN.search(f.name)]
+    return sorted(files, key=_log_sort_key)
+
+
+def _cached_log_files(directory: Path, rotated: bool) -> list[Path] | None:
+    """Return the log files in ``directory`` or ``None`` if it is not a directory.
+
+    Listings are reused while the directory's mtime is unchanged, so
+    repeated calls cost a single ``stat``.
+    """
+    try:
+        st = os.stat(directory)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return None
+    key = (str(directory), rotated)
+    with _listings_lock:
+        cached = _listings.get(key)
+    if (
+        cached is not None
+        and cached[0] == st.st_mtime_ns
+        and cached[1] - st.st_mtime_ns >= RACY_LISTING_NS
+    ):
+        return cached[2]
+    listed_at = time.time_ns()
+    files = _log_files_in(directory, rotated)
+    with _listings_lock:
+        if len(_listings) >= MAX_CACHED_LISTINGS:
+            _listings.clear()
+        _listings[key] = (st.st_mtime_ns, listed_at, files)
+    return files
+
+
+def invalidate_log_paths(directory: str | None = None) -> None:
+    """Forget cached listings of ``directory``, or of every directory."""
+    with _listings_lock:
+        if directory is None:
+            _listings.clear()
+            return
+        path = str(Path(directory))
+        for key in [k for k in _listings if k[0] == path]:
+            del _listings[key]
+
+
+def expand_log_paths(project_path: str, paths: Iterable[str], rotated: bool = False) -> List[str]:
+    """Expand directories in ``paths`` to the ``*.log`` files they contain.
+
+    With ``rotated`` set, rotated and compressed logs are included as well.
+    Directory listings are cached, see :func:`invalidate_log_paths`.
+    """
     result: List[str] = []
     base = Path(project_path)
     for p in paths:
         p_obj = Path(p)
         resolved = p_obj if p_obj.is_absolute() else base / p_obj
-        if resolved.is_dir():
-            for file in sorted(resolved.glob("*.log")):
+        files = _cached_log_files(resolved, rotated)
+        if files is not None:
+            for file in files:
                 if p_obj.is_absolute():
                     result.append(str(file))
                 else:
@@ -32,3 +32,22 @@ def test_buttons_run_commands(monkeypatch, qtbot):
         ["docker", "compose", "restart"],
         ["docker", "compose", "exec", "php", "sh"],
     ]
+
+
+def test_follow_logs_switches_to_logs_tab(qtbot):
+    from PyQt6.QtWidgets import QCheckBox, QTabWidget, QWidget
+
+    main = DummyMainWindow()
+    main.tabs = QTabWidget()
+    qtbot.addWidget(main.tabs)
+    main.logs_tab = QWidget()
+    main.logs_tab.follow_checkbox = QCheckBox()
+    main.tabs.addTab(QWidget(), "Project")
+    main.tabs.addTab(main.logs_tab, "Logs")
+    tab = DockerTab(main)
+    qtbot.addWidget(tab)
+
+    qtbot.mouseClick(tab.follow_btn, Qt.MouseButton.LeftButton)
+
+    assert main.tabs.currentWidget() is main.logs_tab
+    assert main.logs_tab.follow_checkbox.isChecked()
@@ -1,7 +1,11 @@
 import subprocess
+from pathlib import Path
+
 from PyQt6.QtWidgets import QMessageBox, QPushButton, QDialog
 from PyQt6.QtCore import Qt
 
+from fusor.git import BranchInfo, GitState, RemoteHeadsCache
+from fusor.jobs import CommandResult
 from fusor.tabs.git_tab import GitTab
 
 class DummyMainWindow:
@@ -17,12 +21,14 @@ class DummyMainWindow:
     git_remote = "origin"
 
 
-def test_load_branches_and_run_git_command(monkeypatch, qtbot):
-    main = DummyMainWindow()
+def test_load_branches_uses_one_cached_probe(tmp_path: Path, monkeypatch, qtbot):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    main = DummyMainWindow(str(tmp_path))
     tab = GitTab(main)
     qtbot.addWidget(tab)
+    tab.watch_repository()
 
-    results = {}
+    calls = []
 
     class DummyResult:
         def __init__(self, stdout="", returncode=0):
@@ -32,23 +38,58 @@ def test_load_branches_and_run_git_command(monkeypatch, qtbot):
 
     def fake_run(cmd, capture_output=True, text=True, cwd=None):
         assert cwd == main.project_path
-        if cmd[:3] == ["git", "branch", "--format=%(refname:short)"]:
-            res = DummyResult("main\ndevelop\n")
-        elif cmd[:2] == ["git", "rev-parse"]:
-            res = DummyResult("main")
-        else:
-            res = DummyResult("status")
-        results[tuple(cmd)] = res
-        return res
+        calls.append(cmd[1])
+        if cmd[1] == "for-each-ref":
+            return DummyResult("*\0main\0origin/main\0ahead 2, behind 1\n \0develop\0\0\n")
+        if cmd[1] == "remote":
+            return DummyResult("origin\nupstream\n")
+        raise AssertionError(cmd)
 
     monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
 
     tab.load_branches()
     assert tab.current_branch_label.text() == "main"
     assert tab.current_branch == "main"
+    assert tab.sync_label.text() == "\u21912 \u21931"
+
+    remotes = []
+    tab.load_remotes(remotes.extend)
+    tab.load_branches()
+    assert remotes == ["origin", "upstream"]
+    assert calls == ["for-each-ref", "remote"]
+
+    tab.load_branches(refresh=True)
+    assert calls == ["for-each-ref", "remote"] * 2
+
+
+def test_load_remotes_drops_results_of_previous_project(monkeypatch, qtbot):
+    main = DummyMainWindow("/first")
+    tab = GitTab(main)
+    qtbot.addWidget(tab)
+    pending = []
+    monkeypatch.setattr(tab.git, "state", lambda path, callback, refresh=False: pending.append(callback))
 
-    res = tab.run_git_command("status")
-    assert res is results[("git", "status")]
+    remotes = []
+    tab.load_remotes(remotes.append)
+    main.project_path = "/second"
+    pending[0](GitState("main", remotes=("origin",)))
+
+    assert remotes == []
+
+def test_run_git_command_reports_result(tmp_path: Path, qtbot):
+    main = DummyMainWindow(str(tmp_path))
+    tab = GitTab(main)
+    qtbot.addWidget(tab)
+
+    results = []
+    busy = []
+    tab.git.busy_changed.connect(busy.append)
+    tab.run_git_command("init", callback=results.append)
+
+    assert results[0].returncode == 0
+    assert any("Initialized" in line for line in results[0].tail)
+    assert busy == [True, False]
+    assert tab.progress_row.isHidden()
 
 
 def test_checkout_updates_current_branch(monkeypatch, qtbot):
@@ -58,8 +99,9 @@ def test_checkout_updates_current_branch(monkeypatch, qtbot):
 
     called = {}
 
-    def fake_run_git_command(*args):
+    def fake_run_git_command(*args, callback=None):
         called["args"] = args
+        callback(CommandResult(0, []))
 
     monkeypatch.setattr(tab, "run_git_command", fake_run_git_command, raising=True)
 
@@ -90,9 +132,9 @@ def test_hard_reset_runs_command(monkeypatch, qtbot):
             self.stderr = ""
             self.returncode = returncode
 
-    def fake_run_git_command(*args):
+    def fake_run_git_command(*args, callback=None):
         called["args"] = args
-        return DummyResult()
+        callback(DummyResult())
 
     monkeypatch.setattr(tab, "run_git_command", fake_run_git_command, raising=True)
 
@@ -101,10 +143,8 @@ def test_hard_reset_runs_command(monkeypatch, qtbot):
     assert called["args"] == ("reset", "--hard")
 
 
-def test_remote_helpers(monkeypatch, qtbot):
-    main = DummyMainWindow()
-    tab = GitTab(main)
-    qtbot.addWidget(tab)
+def test_remote_helpers(monkeypatch):
+    from fusor.git import ls_remote_heads
 
     class DummyResult:
         def __init__(self, stdout=""):
@@ -113,18 +153,16 @@ def test_remote_helpers(monkeypatch, qtbot):
             self.returncode = 0
 
     outputs = {
-        ("git", "remote"): DummyResult("origin\nupstream\n"),
         ("git", "ls-remote", "--heads", "origin"): DummyResult("sha\trefs/heads/main\nsha\trefs/heads/feature\n"),
     }
 
     def fake_run(cmd, capture_output=True, text=True, cwd=None):
-        assert cwd == main.project_path
+        assert cwd == "/repo"
         return outputs[tuple(cmd)]
 
     monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
 
-    assert tab.get_remotes() == ["origin", "upstream"]
-    assert tab.fetch_remote_branches() == ["main", "feature"]
+    assert ls_remote_heads("/repo", "origin") == ["main", "feature"]
 
 
 def test_push_button_runs_push(monkeypatch, qtbot):
@@ -134,7 +172,7 @@ def test_push_button_runs_push(monkeypatch, qtbot):
 
     called = {}
 
-    def fake_run_git_command(*args):
+    def fake_run_git_command(*args, callback=None):
         called["args"] = args
 
     monkeypatch.setattr(tab, "run_git_command", fake_run_git_command, raising=True)
@@ -158,8 +196,9 @@ def test_create_branch_button(monkeypatch, qtbot):
 
     called = {}
 
-    def fake_run_git_command(*args):
+    def fake_run_git_command(*args, callback=None):
         called["args"] = args
+        callback(CommandResult(0, []))
 
     monkeypatch.setattr(tab, "run_git_command", fake_run_git_command, raising=True)
 
@@ -173,6 +212,7 @@ def test_create_branch_button(monkeypatch, qtbot):
     tab.branch_name_edit.setText("feature")
     qtbot.mouseClick(create_btn, Qt.MouseButton.LeftButton)
 
+    assert called["args"] == ("checkout", "-b", "feature")
     assert tab.current_branch_label.text() == "feature"
 
 
@@ -183,7 +223,7 @@ def test_view_log_button_runs_log(monkeypatch, qtbot):
 
     called = {}
 
-    def fake_run_git_command(*args):
+    def fake_run_git_command(*args, callback=None):
         called["args"] = args
 
     monkeypatch.setattr(tab, "run_git_command", fake_run_git_command, raising=True)
@@ -207,7 +247,7 @@ def test_status_button_runs_status(monkeypatch, qtbot):
 
     called = {}
 
-    def fake_run_git_command(*args):
+    def fake_run_git_command(*args, callback=None):
         called["args"] = args
 
     monkeypatch.setattr(tab, "run_git_command", fake_run_git_command, raising=True)
@@ -224,17 +264,24 @@ def test_status_button_runs_status(monkeypatch, qtbot):
     assert called["args"] == ("status",)
 
 
-def test_diff_button_runs_diff(monkeypatch, qtbot):
+def test_diff_button_opens_viewer(monkeypatch, qtbot):
     main = DummyMainWindow()
     tab = GitTab(main)
     qtbot.addWidget(tab)
 
-    called = {}
+    opened = []
 
-    def fake_run_git_command(*args):
-        called["args"] = args
+    class DummyViewer:
+        def __init__(self, path, executor=None, parent=None):
+            opened.append(path)
 
-    monkeypatch.setattr(tab, "run_git_command", fake_run_git_command, raising=True)
+        def setAttribute(self, attribute):
+            pass
+
+        def show(self):
+            pass
+
+    monkeypatch.setattr("fusor.tabs.git_tab.DiffViewerDialog", DummyViewer, raising=True)
 
     diff_btn: QPushButton | None = None
     for btn in tab.findChildren(QPushButton):
@@ -245,7 +292,8 @@ def test_diff_button_runs_diff(monkeypatch, qtbot):
 
     qtbot.mouseClick(diff_btn, Qt.MouseButton.LeftButton)
 
-    assert called["args"] == ("diff",)
+    assert opened == ["/repo"]
+
 
 def test_branch_dialog_get_branch(qtbot):
     from fusor.branch_dialog import BranchDialog
@@ -253,18 +301,53 @@ def test_branch_dialog_get_branch(qtbot):
     dialog = BranchDialog(["main", "dev"])
     qtbot.addWidget(dialog)
     dialog.search_edit.setText("dev")
-    assert dialog.list_widget.count() == 1
-    dialog.list_widget.setCurrentRow(0)
+    assert dialog.proxy.rowCount() == 1
+    dialog.list_view.setCurrentIndex(dialog.proxy.index(0, 0))
     assert dialog.get_branch() == "dev"
 
 
-def test_show_branch_dialog_checks_out(monkeypatch, qtbot):
+def test_branch_dialog_fuzzy_ranking(qtbot):
+    from fusor.branch_dialog import BranchDialog, fuzzy_key
+
+    branches = ["feature/login-form", "fix/logging", "release/1.0", "feat/lf"]
+    dialog = BranchDialog(branches)
+    qtbot.addWidget(dialog)
+    dialog.search_edit.setText("lf")
+    shown = [dialog.proxy.text(row) for row in range(dialog.proxy.rowCount())]
+
+    assert shown == ["feat/lf", "feature/login-form"]
+    assert dialog.get_branch() == "feat/lf"
+    assert fuzzy_key("LF", "feature/login-form") == (1 + 5, 8, 18)
+    assert fuzzy_key("lf", "release/1.0") is None
+
+
+def test_branch_dialog_filter_narrows_incrementally(qtbot):
+    from fusor.branch_dialog import BranchDialog, fuzzy_key
+
+    branches = [f"team{i % 7}/topic-{i}" for i in range(500)]
+    dialog = BranchDialog(branches)
+    qtbot.addWidget(dialog)
+    for query in ("t", "t3", "t3/", "t3/t1", "t3/t"):
+        dialog.search_edit.setText(query)
+        expected = sorted(
+            (b for b in branches if fuzzy_key(query, b) is not None),
+            key=lambda b: (fuzzy_key(query, b), branches.index(b)),
+        )
+        assert [dialog.proxy.text(row) for row in range(dialog.proxy.rowCount())] == expected
+
+
+def test_show_branch_dialog_checks_out(tmp_path: Path, monkeypatch, qtbot):
     main = DummyMainWindow()
     tab = GitTab(main)
     qtbot.addWidget(tab)
+    tab.git.remote_heads_cache = RemoteHeadsCache(tmp_path / "heads.json")
 
-    monkeypatch.setattr(tab, "fetch_local_branches", lambda: ["main"], raising=True)
-    monkeypatch.setattr(tab, "fetch_remote_branches", lambda: ["feature"], raising=True)
+    monkeypatch.setattr(
+        "fusor.git.service.probe_git_state",
+        lambda path: GitState("main", (BranchInfo("main"),)),
+        raising=True,
+    )
+    monkeypatch.setattr("fusor.git.service.ls_remote_heads", lambda path, remote: ["feature"], raising=True)
 
     called = {}
     monkeypatch.setattr(tab, "checkout_remote_branch", lambda b: called.setdefault("remote", b), raising=True)
@@ -273,15 +356,21 @@ def test_show_branch_dialog_checks_out(monkeypatch, qtbot):
     class DummyDialog:
         def __init__(self, branches, parent=None):
             self.branches = branches
+        def set_branches(self, branches):
+            self.branches = branches
+            dialogs.append(self)
         def exec(self):
             return QDialog.DialogCode.Accepted
         def get_branch(self):
             return "origin/feature"
 
+    dialogs = []
     monkeypatch.setattr("fusor.tabs.git_tab.BranchDialog", DummyDialog, raising=True)
 
     tab.show_branch_dialog()
 
+    # the dialog opened without remote branches and received them once listed
+    assert dialogs[0].branches == ["main", "origin/feature"]
     assert called.get("remote") == "feature"
 
 
@@ -307,7 +396,7 @@ def test_commit_button_runs_commit(monkeypatch, qtbot):
 
     called = {}
 
-    def fake_run_git_command(*args):
+    def fake_run_git_command(*args, callback=None):
         called["args"] = args
 
     monkeypatch.setattr(tab, "run_git_command", fake_run_git_command, raising=True)
@@ -323,3 +412,430 @@ def test_commit_button_runs_commit(monkeypatch, qtbot):
     qtbot.mouseClick(commit_btn, Qt.MouseButton.LeftButton)
 
     assert called["args"] == ("commit", "-m", "initial commit")
+
+
+def test_busy_state_disables_commands(qtbot):
+    main = DummyMainWindow()
+    tab = GitTab(main)
+    qtbot.addWidget(tab)
+
+    tab.git.busy_changed.emit(True)
+    assert not tab.checkout_btn.isEnabled()
+    assert not tab.progress_row.isHidden()
+
+    tab.git.progress.emit("Receiving objects", 45)
+    assert tab.progress_label.text() == "Receiving objects"
+    assert tab.progress_bar.value() == 45
+
+    tab.git.busy_changed.emit(False)
+    assert tab.checkout_btn.isEnabled()
+    assert tab.progress_row.isHidden()
+
+
+def test_cancel_before_start_stops_command(tmp_path: Path, monkeypatch, qtbot):
+    import sys
+    import fusor.git.service as service_module
+    from fusor.git import GitService
+
+    queued = []
+
+    class Executor:
+        def submit(self, fn, **_kw):
+            queued.append(fn)
+
+    monkeypatch.setattr(
+        service_module, "git_command", lambda args: [sys.executable, "-c", "import time; time.sleep(10)"]
+    )
+    service = GitService(Executor())
+    results = []
+    assert service.run(["fetch"], str(tmp_path), results.append)
+
+    # pressed while the command waits for a worker
+    service.cancel()
+    queued[0]()
+
+    assert results[0].returncode != 0
+    assert not service.busy
+
+def test_git_output_keeps_crlf_lines_and_reports_progress(tmp_path: Path, monkeypatch, capsys, qtbot):
+    import sys
+    import fusor.git.service as service_module
+    from fusor.git import GitService
+
+    output = (
+        "remote: hello\r\n"
+        "Receiving objects:  50% (1/2)\r"
+        "Receiving objects: 100% (2/2), done.\r\n"
+        "hook: checking\r"
+        "line two\n"
+    )
+    code = f"import sys; sys.stdout.buffer.write({output.encode()!r})"
+    monkeypatch.setattr(service_module, "git_command", lambda args: [sys.executable, "-c", code])
+    service = GitService()
+    progress = []
+    service.progress.connect(lambda phase, percent: progress.append((phase, percent)))
+    results = []
+    service.run(["fetch"], str(tmp_path), results.append)
+
+    assert results[0].tail == ["remote: hello", "hook: checking", "line two"]
+    assert progress == [("Receiving objects", 50), ("Receiving objects", 100)]
+    printed = capsys.readouterr().out
+    assert "remote: hello\n" in printed
+    assert "hook: checking\n" in printed
+
+def test_parse_progress_lines():
+    from fusor.git import git_command, parse_progress
+
+    assert parse_progress("Receiving objects:  45% (123/456), 1.20 MiB | 2.40 MiB/s") == ("Receiving objects", 45)
+    assert parse_progress("remote: Counting objects: 100% (5/5), done.") == ("Counting objects", 100)
+    assert parse_progress("Already up to date.") is None
+    assert git_command(["pull"]) == ["git", "pull", "--progress"]
+    assert git_command(["status"]) == ["git", "status"]
+
+
+def test_parse_branches_reads_upstream_distance():
+    from fusor.git import parse_branches
+
+    head, branches = parse_branches(" \0dev\0origin/dev\0behind 3\n*\0main\0\0\n \0old\0origin/old\0gone\n")
+    assert head == "main"
+    assert branches == [
+        BranchInfo("dev", "origin/dev", 0, 3),
+        BranchInfo("main"),
+        BranchInfo("old", "origin/old"),
+    ]
+
+
+def test_ref_change_invalidates_cached_state(tmp_path: Path, qtbot):
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=tmp_path, check=True)
+
+    git("init", "-q", "-b", "main")
+    git("commit", "-q", "--allow-empty", "-m", "init")
+    main = DummyMainWindow(str(tmp_path))
+    tab = GitTab(main)
+    qtbot.addWidget(tab)
+    tab.watch_repository()
+    assert tab.git.is_watched(str(tmp_path))
+
+    states = []
+    tab.git.state(str(tmp_path), states.append)
+    assert states[-1].branch_names() == ["main"]
+    assert tab.git.cached_state(str(tmp_path)) is states[-1]
+
+    with qtbot.waitSignal(tab.git.state_changed, timeout=3000):
+        git("branch", "feature/nested")
+    assert tab.git.cached_state(str(tmp_path)) is None
+
+    tab.git.state(str(tmp_path), states.append)
+    assert states[-1].branch_names() == ["feature/nested", "main"]
+
+    # directories of new branch namespaces are watched too
+    with qtbot.waitSignal(tab.git.state_changed, timeout=3000):
+        git("branch", "feature/other")
+
+
+def test_capped_ref_walk_marks_watcher_unreliable(tmp_path: Path, monkeypatch, qtbot):
+    import fusor.git.watcher as watcher_module
+
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=tmp_path, check=True)
+
+    git("init", "-q", "-b", "main")
+    git("commit", "-q", "--allow-empty", "-m", "init")
+    git("branch", "feature/nested")
+    watcher = watcher_module.GitWatcher()
+
+    monkeypatch.setattr(watcher_module, "MAX_REF_DIRS", 2)
+    watcher.watch(str(tmp_path))
+    assert watcher.is_reliable()
+
+    # refs/heads/feature is left out, so its branches would go unnoticed
+    monkeypatch.setattr(watcher_module, "MAX_REF_DIRS", 1)
+    watcher.watch(str(tmp_path))
+    assert not watcher.is_reliable()
+    watcher.watch("")
+
+
+def test_git_watcher_waits_for_events_to_stop(monkeypatch, qtbot):
+    import fusor.git.watcher as watcher_module
+
+    monkeypatch.setattr(watcher_module, "DEBOUNCE_MS", 100)
+    monkeypatch.setattr(watcher_module, "MAX_DEBOUNCE_MS", 400)
+    watcher = watcher_module.WorkTreeWatcher()
+    emitted = []
+    watcher.changed.connect(lambda: emitted.append(True))
+
+    for _ in range(6):
+        watcher._on_event("")
+        qtbot.wait(40)
+    assert emitted == []
+    qtbot.waitUntil(lambda: bool(emitted), timeout=3000)
+
+    # a steady stream of events is still reported
+    emitted.clear()
+    for _ in range(20):
+        watcher._on_event("")
+        qtbot.wait(40)
+    assert emitted
+
+
+def test_git_watch_paths_cover_worktrees(tmp_path: Path):
+    from fusor.git import git_dirs, git_watch_paths
+
+    repo = tmp_path / "repo"
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "init"],
+        cwd=repo,
+        check=True,
+    )
+    subprocess.run(["git", "worktree", "add", "-q", str(tmp_path / "wt")], cwd=repo, check=True)
+
+    git_dir, common = git_dirs(str(tmp_path / "wt"))
+    assert Path(common) == repo / ".git"
+    assert Path(git_dir).parent == repo / ".git" / "worktrees"
+    paths = git_watch_paths(str(tmp_path / "wt"))
+    assert str(Path(git_dir) / "HEAD") in paths
+    assert str(repo / ".git" / "refs" / "heads") in paths
+
+
+def test_remote_heads_cache_persists_and_expires(tmp_path: Path):
+    cache = RemoteHeadsCache(tmp_path / "heads.json")
+    assert cache.get("/repo", "origin") is None
+    cache.put("/repo", "origin", ["main", "dev"])
+
+    reloaded = RemoteHeadsCache(tmp_path / "heads.json")
+    heads = reloaded.get("/repo", "origin")
+    assert heads.branches == ("main", "dev")
+    assert heads.is_fresh()
+
+    reloaded.expire("/repo")
+    assert not reloaded.get("/repo", "origin").is_fresh()
+    assert RemoteHeadsCache(tmp_path / "heads.json").get("/repo", "origin").branches == ("main", "dev")
+
+
+def test_branch_dialog_opens_with_cached_remote_heads(tmp_path: Path, monkeypatch, qtbot):
+    from fusor.branch_dialog import BranchDialog
+
+    main = DummyMainWindow()
+    tab = GitTab(main)
+    qtbot.addWidget(tab)
+    tab.git.remote_heads_cache = RemoteHeadsCache(tmp_path / "heads.json")
+    tab.git.remote_heads_cache.put("/repo", "origin", ["cached"])
+    monkeypatch.setattr(
+        "fusor.git.service.probe_git_state",
+        lambda path: GitState("main", (BranchInfo("main"),)),
+        raising=True,
+    )
+
+    def fail(path, remote):
+        raise AssertionError("fresh list fetched again")
+
+    monkeypatch.setattr("fusor.git.service.ls_remote_heads", fail, raising=True)
+    shown = []
+    monkeypatch.setattr(BranchDialog, "exec", lambda self: shown.append(self.branches) or 0, raising=True)
+
+    tab.show_branch_dialog()
+
+    assert shown == [["main", "origin/cached"]]
+
+
+def test_branch_dialog_set_branches_keeps_selection(qtbot):
+    from fusor.branch_dialog import BranchDialog
+
+    dialog = BranchDialog(["main", "dev"])
+    qtbot.addWidget(dialog)
+    dialog.search_edit.setText("d")
+    dialog.set_branches(["main", "dev", "origin/dev", "origin/old"])
+    assert dialog.proxy.rowCount() == 3
+    assert dialog.get_branch() == "dev"
+
+
+def test_parse_status_groups_porcelain_v2():
+    from fusor.git import StatusEntry, parse_status
+
+    output = (
+        b"# branch.oid 0123\0"
+        b"1 .M N... 100644 100644 100644 aaaa aaaa src/app.py\0"
+        b"1 MM N... 100644 100644 100644 aaaa bbbb with space.txt\0"
+        b"2 R. N... 100644 100644 100644 cccc cccc R100 new name.py\0old name.py\0"
+        b"u UU N... 100644 100644 100644 100644 dddd eeee ffff conflict.txt\0"
+        b"? node_modules/\0"
+        b"! ignored.log\0"
+    )
+    status = parse_status(output)
+
+    assert status.staged == (
+        StatusEntry("with space.txt", "MM"),
+        StatusEntry("new name.py", "R.", "old name.py"),
+    )
+    assert status.unstaged == (StatusEntry("src/app.py", ".M"), StatusEntry("with space.txt", "MM"))
+    assert status.untracked == (StatusEntry("node_modules/", "??"),)
+    assert status.conflicted == (StatusEntry("conflict.txt", "UU"),)
+    assert not status.is_clean()
+    assert parse_status(b"").is_clean()
+
+
+def test_status_options_use_fsmonitor_where_available():
+    from fusor.git import status_options
+
+    assert status_options((2, 39), "linux") == ["-c", "core.untrackedCache=true"]
+    assert status_options((2, 35), "darwin") == ["-c", "core.untrackedCache=true"]
+    assert status_options((2, 36), "win32")[-2:] == ["-c", "core.fsmonitor=true"]
+    assert status_options((2, 40), "darwin", fsmonitor=False) == ["-c", "core.untrackedCache=true"]
+
+
+def test_invalidate_rereads_fsmonitor_config(tmp_path: Path):
+    import fusor.git.status as status_module
+    from fusor.git import GitService
+
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    service = GitService()
+    service.invalidate(str(tmp_path))
+    assert not status_module._fsmonitor_configured(str(tmp_path))
+
+    subprocess.run(["git", "config", "core.fsmonitor", "true"], cwd=tmp_path, check=True)
+    service.invalidate(str(tmp_path))
+    assert status_module._fsmonitor_configured(str(tmp_path))
+
+
+def test_status_panel_follows_working_tree(tmp_path: Path, qtbot):
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=tmp_path, check=True)
+
+    (tmp_path / "tracked.txt").write_text("one\n")
+    git("init", "-q", "-b", "main")
+    git("add", "tracked.txt")
+    git("commit", "-q", "-m", "init")
+    index_mtime = (tmp_path / ".git" / "index").stat().st_mtime_ns
+    main = DummyMainWindow(str(tmp_path))
+    tab = GitTab(main)
+    qtbot.addWidget(tab)
+    tab.watch_repository()
+
+    tab.refresh_status()
+    assert tab.status_summary_label.text() == "Nothing to commit, working tree clean"
+
+    (tmp_path / "tracked.txt").write_text("two\n")
+    (tmp_path / "new.txt").write_text("new\n")
+    tab.refresh_status()
+    groups = [tab.status_tree.topLevelItem(i) for i in range(tab.status_tree.topLevelItemCount())]
+    assert [g.text(0) for g in groups] == ["Unstaged (1)", "Untracked (1)"]
+    assert groups[0].child(0).text(0) == "M tracked.txt"
+    assert tab.status_summary_label.text() == "1 unstaged, 1 untracked"
+    # probes do not rewrite the index, which would wake the repository watcher
+    assert (tmp_path / ".git" / "index").stat().st_mtime_ns == index_mtime
+
+    # files with pending changes are watched
+    with qtbot.waitSignal(tab.git.worktree_changed, timeout=3000):
+        (tmp_path / "tracked.txt").write_text("three\n")
+
+
+def test_status_refreshes_while_shown_and_on_activation(monkeypatch, qtbot):
+    from PyQt6.QtCore import QEvent
+    from PyQt6.QtWidgets import QApplication
+
+    tab = GitTab(DummyMainWindow())
+    qtbot.addWidget(tab)
+    refreshed = []
+    monkeypatch.setattr(tab.git, "refresh_status", lambda path, write_index=False: refreshed.append(path))
+
+    assert not tab._status_timer.isActive()
+    tab.show()
+    # edits far from pending changes are not watched, so the shown tab polls
+    assert tab._status_timer.isActive()
+
+    monkeypatch.setattr(tab, "isActiveWindow", lambda: True)
+    QApplication.sendEvent(tab, QEvent(QEvent.Type.ActivationChange))
+    assert refreshed == ["/repo"]
+
+    tab.hide()
+    assert not tab._status_timer.isActive()
+
+def test_parse_name_status_reads_renames():
+    from fusor.git import DiffFile, parse_name_status
+
+    assert parse_name_status(b"M\0app.py\0R087\0old name.py\0new name.py\0D\0gone.txt\0") == [
+        DiffFile("app.py", "M"),
+        DiffFile("new name.py", "R", "old name.py"),
+        DiffFile("gone.txt", "D"),
+    ]
+
+
+def test_diff_viewer_streams_files_and_collapses_huge_ones(tmp_path: Path, monkeypatch, qtbot):
+    import fusor.git.diff as diff_module
+    from fusor.git import DiffViewerDialog
+
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=tmp_path, check=True)
+
+    monkeypatch.setattr(diff_module, "COLLAPSE_LINES", 50)
+    (tmp_path / "app.py").write_text("a = 1\nb = 2\n")
+    (tmp_path / "lock.json").write_text("".join(f"{i}\n" for i in range(100)))
+    git("init", "-q", "-b", "main")
+    git("add", ".")
+    git("commit", "-q", "-m", "init")
+    (tmp_path / "app.py").write_text("a = 1\nb = 3\n")
+    (tmp_path / "lock.json").write_text("".join(f"v{i}\n" for i in range(100)))
+
+    dialog = DiffViewerDialog(str(tmp_path))
+    qtbot.addWidget(dialog)
+    model = dialog.model
+    assert model.complete
+    assert model.file_count() == 2
+
+    rows = [model.data(model.index(row, 0)) for row in range(model.rowCount())]
+    assert rows[0] == "\u25be M app.py  +1 \u22121"
+    assert rows[1:5] == ["@@ -1,2 +1,2 @@", " a = 1", "-b = 2", "+b = 3"]
+    assert rows[5] == "\u25b8 M lock.json  +100 \u2212100, 201 lines collapsed"
+    assert model.rowCount() == 6
+    assert model.data(model.index(4, 0), Qt.ItemDataRole.ForegroundRole).name() == "#008000"
+    assert dialog.summary_label.text() == "2 files changed, +101 \u2212101"
+
+    # lines of a collapsed file are only located once they are shown
+    assert list(model._offsets) == [(0, 0)]
+    model.toggle(5)
+    assert model.rowCount() == 6 + 201
+    assert model.data(model.index(7, 0)) == "-0"
+    assert model.data(model.index(model.rowCount() - 1, 0)) == "+v99"
+    assert (1, 0) in model._offsets
+
+    model.toggle(0)
+    assert model.locate(1) == (1, -1)
+    dialog.close()
+
+
+def test_header_path_handles_spaces_renames_and_quoting():
+    from fusor.git import header_path
+
+    assert header_path("diff --git a/my file.py b/my file.py") == "my file.py"
+    assert header_path("diff --git a/old.py b/new name.py") == "new name.py"
+    assert header_path('diff --git "a/\\303\\244 x.txt" "b/\\303\\244 x.txt"') == "\u00e4 x.txt"
+    assert header_path("diff --cc conflict.txt") == "conflict.txt"
+
+
+def test_diff_viewer_matches_sections_to_files_by_path(tmp_path: Path, qtbot):
+    from fusor.git import DiffViewerDialog
+
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=tmp_path, check=True)
+
+    (tmp_path / "link").write_text("plain\n")
+    (tmp_path / "my notes.txt").write_text("one\n")
+    git("init", "-q", "-b", "main")
+    git("add", ".")
+    git("commit", "-q", "-m", "init")
+    (tmp_path / "link").unlink()
+    (tmp_path / "link").symlink_to("my notes.txt")
+    (tmp_path / "my notes.txt").write_text("two\n")
+
+    dialog = DiffViewerDialog(str(tmp_path))
+    qtbot.addWidget(dialog)
+    model = dialog.model
+
+    # the type change diffs as a removal plus an addition of the same file
+    assert model.file_count() == 2
+    headers = [model.data(model.index(model.start(f), 0)) for f in range(2)]
+    assert headers == ["\u25be T link  +1 \u22121", "\u25be M my notes.txt  +1 \u22121"]
+    assert dialog.summary_label.text() == "2 files changed, +2 \u22122"
+    dialog.close()
@@ -0,0 +1,163 @@
+import sys
+import threading
+
+import pytest
+
+from fusor.jobs import MAX_LINE_LENGTH, JobScheduler, stream_command
+
+
+def test_service_lane_does_not_block_commands():
+    scheduler = JobScheduler({"service": 1, "command": 1})
+    release = threading.Event()
+    try:
+        scheduler.submit(release.wait, lane="service")
+        future = scheduler.submit(lambda: "done")
+        assert future.result(timeout=2) == "done"
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_resource_limit_serializes_jobs():
+    scheduler = JobScheduler({"command": 4}, {"composer": 1})
+    release = threading.Event()
+    started = threading.Event()
+    order: list[str] = []
+
+    def first():
+        started.set()
+        release.wait(2)
+        order.append("first")
+
+    try:
+        f1 = scheduler.submit(first, resource="composer:/repo")
+        started.wait(2)
+        f2 = scheduler.submit(lambda: order.append("second"), resource="composer:/repo")
+        other = scheduler.submit(lambda: "other", resource="composer:/other")
+
+        assert other.result(timeout=2) == "other"
+        assert scheduler.pending("composer:/repo") == 1
+        assert not f2.done()
+
+        release.set()
+        f1.result(timeout=2)
+        f2.result(timeout=2)
+        assert order == ["first", "second"]
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_unlimited_resource_runs_in_parallel():
+    scheduler = JobScheduler({"command": 3}, {})
+    barrier = threading.Barrier(3, timeout=2)
+    try:
+        futures = [
+            scheduler.submit(barrier.wait, resource="git:/repo") for _ in range(3)
+        ]
+        for f in futures:
+            f.result(timeout=2)
+    finally:
+        scheduler.shutdown()
+
+
+def test_queued_job_can_be_cancelled():
+    scheduler = JobScheduler({"command": 2}, {"npm": 1})
+    release = threading.Event()
+    ran: list[bool] = []
+    try:
+        first = scheduler.submit(release.wait, resource="npm:/repo")
+        queued = scheduler.submit(lambda: ran.append(True), resource="npm:/repo")
+        assert queued.cancel()
+        release.set()
+        first.result(timeout=2)
+        follow = scheduler.submit(lambda: "ok", resource="npm:/repo")
+        assert follow.result(timeout=2) == "ok"
+        assert ran == []
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_job_exception_is_reported():
+    scheduler = JobScheduler({}, {"composer": 1})
+
+    def boom():
+        raise ValueError("bad")
+
+    try:
+        future = scheduler.submit(boom, resource="composer:/repo")
+        assert isinstance(future.exception(timeout=2), ValueError)
+        assert scheduler.submit(lambda: 1, resource="composer:/repo").result(timeout=2) == 1
+    finally:
+        scheduler.shutdown()
+
+
+def test_stream_command_delivers_lines_in_order():
+    code = (
+        "import sys\n"
+        "print('out', flush=True)\n"
+        "sys.stderr.write('err\\n'); sys.stderr.flush()\n"
+        "print('done', flush=True)\n"
+    )
+    lines: list[str] = []
+    result = stream_command([sys.executable, "-c", code], lines.append)
+
+    assert lines == ["out", "err", "done"]
+    assert result.returncode == 0
+
+
+def test_stream_command_bounds_tail_and_line_length():
+    code = "print('x' * (MAX + 10)); [print(i) for i in range(50)]".replace(
+        "MAX", str(MAX_LINE_LENGTH)
+    )
+    lines: list[str] = []
+    result = stream_command([sys.executable, "-c", code], lines.append, tail_lines=5)
+
+    assert len(lines[0]) == MAX_LINE_LENGTH
+    assert lines[1] == "x" * 10
+    assert result.tail == [str(i) for i in range(45, 50)]
+
+
+def test_stream_command_missing_program():
+    with pytest.raises(FileNotFoundError):
+        stream_command(["definitely-not-a-command-fusor"], lambda _l: None)
+
+
+def test_stream_command_keeps_blank_lines_and_splits_progress():
+    code = (
+        "import sys, time\n"
+        "sys.stdout.write('a\\n\\nb\\r\\n'); sys.stdout.flush()\n"
+        "sys.stdout.write('10%\\r'); sys.stdout.flush(); time.sleep(0.2)\n"
+        "sys.stdout.write('100%\\r\\ndone')\n"
+    )
+    lines: list[tuple[float, str]] = []
+    import time
+
+    result = stream_command([sys.executable, "-c", code], lambda line: lines.append((time.monotonic(), line)))
+
+    assert [line for _t, line in lines] == ["a", "", "b", "10%", "100%", "done"]
+    # the progress line arrived before the process finished writing
+    assert lines[4][0] - lines[3][0] >= 0.1
+    assert result.tail[-1] == "done"
+
+
+def test_stream_command_waits_when_callback_fails():
+    def fail(_line: str) -> None:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        stream_command([sys.executable, "-c", "print('x')"], fail)
+
+
+def test_stream_command_hands_redraws_to_on_redraw():
+    code = "import sys; sys.stdout.write('1%\\r50%\\r100%\\r\\ndone\\n')"
+    lines: list[str] = []
+    redraws: list[str] = []
+
+    result = stream_command([sys.executable, "-c", code], lines.append, on_redraw=redraws.append)
+
+    assert redraws == ["1%", "50%"]
+    assert lines == ["100%", "done"]
+    # the tail shows the progress as a terminal would
+    assert result.tail == ["100%", "done"]
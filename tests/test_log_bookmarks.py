@@ -0,0 +1,45 @@
+from fusor.logs import Bookmark, LogTailer, bookmark_file, dump_bookmarks, load_bookmarks, unread_bytes
+
+
+def test_unread_bytes_compares_offsets(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("one\n")
+    bookmark = bookmark_file(str(log))
+    assert unread_bytes(str(log), bookmark) == 0
+
+    with log.open("a") as fh:
+        fh.write("two\n")
+    assert unread_bytes(str(log), bookmark) == 4
+    assert unread_bytes(str(log), None) == 8
+    assert unread_bytes(str(tmp_path / "missing.log"), bookmark) == 0
+
+
+def test_truncated_file_is_unread_as_a_whole(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("one\ntwo\n")
+    bookmark = bookmark_file(str(log))
+    log.write_text("x\n")
+    assert unread_bytes(str(log), bookmark) == 2
+
+
+def test_load_skips_malformed_entries():
+    data = {"a.log": [1, 10, 2.5], "b.log": "broken", "c.log": [1, 2]}
+    bookmarks = load_bookmarks(data)
+    assert bookmarks == {"a.log": Bookmark(1, 10, 2.5)}
+    assert dump_bookmarks(bookmarks) == {"a.log": [1, 10, 2.5]}
+    assert load_bookmarks(None) == {}
+
+
+def test_tailer_counts_lines_after_offset(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("one\ntwo\n")
+    tailer = LogTailer(10)
+    tailer.poll(str(log))
+    offset = log.stat().st_size
+    with log.open("a") as fh:
+        fh.write("three\nfour")
+    tailer.poll(str(log))
+
+    assert tailer.lines_after(str(log), offset) == 2
+    assert tailer.lines_after(str(log), 0) == 4
+    assert tailer.lines_after(str(log), log.stat().st_size) == 0
@@ -0,0 +1,68 @@
+import bz2
+import gzip
+
+import fusor.logs.compressed as compressed_module
+from fusor.logs import GzipIndex, LogTailer, gzip_index, is_compressed
+
+
+def _payload(count):
+    return "".join(f"line {i}\n" for i in range(count)).encode()
+
+
+def test_gzip_index_random_access_across_members(tmp_path):
+    data = _payload(50000)
+    path = tmp_path / "app.log.1.gz"
+    half = len(data) // 2
+    path.write_bytes(gzip.compress(data[:half]) + gzip.compress(data[half:]))
+
+    index = GzipIndex(str(path), spacing=64 * 1024)
+
+    assert index.size == len(data)
+    assert len(index._checkpoints) > 1
+    for offset in (0, 1234, half - 3, half, len(data) - 20):
+        assert index.read(offset, 100) == data[offset:offset + 100]
+    assert index.read(len(data), 10) == b""
+
+
+def test_gzip_index_is_cached_until_file_changes(tmp_path):
+    path = tmp_path / "app.log.gz"
+    path.write_bytes(gzip.compress(b"a\n"))
+    first = gzip_index(str(path))
+    assert gzip_index(str(path)) is first
+
+    path.write_bytes(gzip.compress(b"a\nb\n"))
+    assert gzip_index(str(path)) is not first
+
+
+def test_tailer_reads_end_of_gzip_through_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(compressed_module, "CHECKPOINT_SPACING", 64 * 1024)
+    path = tmp_path / "app.log.2.gz"
+    path.write_bytes(gzip.compress(_payload(50000)))
+    tailer = LogTailer(3)
+
+    update = tailer.poll(str(path))
+    assert update.reset
+    assert update.lines == ["line 49997", "line 49998", "line 49999"]
+    assert tailer.poll(str(path)) == ([], False)
+
+    inflated = []
+    real_inflate = GzipIndex._inflate
+
+    def counting(self, *args, **kwargs):
+        for chunk in real_inflate(self, *args, **kwargs):
+            inflated.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(GzipIndex, "_inflate", counting)
+    tailer.forget()
+    assert tailer.poll(str(path)).lines[-1] == "line 49999"
+    assert sum(inflated) < 4 * 64 * 1024
+
+
+def test_tailer_reads_bz2(tmp_path):
+    path = tmp_path / "app.log.bz2"
+    path.write_bytes(bz2.compress(_payload(10)))
+
+    assert LogTailer(2).poll(str(path)).lines == ["line 8", "line 9"]
+    assert is_compressed(str(path))
+    assert not is_compressed(str(tmp_path / "app.log"))
@@ -0,0 +1,67 @@
+from fusor.logs import LEVELS, ErrorGroups, FileErrorGroups, LogParser, normalize_message, top_frame
+
+
+def test_normalize_strips_variable_parts():
+    a = normalize_message(
+        "User 42 not found at /var/www/app/User.php:17 (req 9f1c2e3a-1b2c-4d5e-8f90-123456789abc) 2024-05-01 10:00:00"
+    )
+    b = normalize_message(
+        "User 7 not found at /srv/app/User.php:99 (req 00000000-1111-2222-3333-444444444444) 2024-06-02 11:11:11"
+    )
+    assert a == b == "User <n> not found at <path>:<n> (req <uuid>) <ts>"
+    assert normalize_message("App\\Models\\User missing") == "App\\Models\\User missing"
+
+
+def test_top_frame_uses_first_php_frame():
+    lines = [
+        "[stacktrace]",
+        "#0 /app/vendor/laravel/Connection.php(760): Illuminate\\Database\\Connection->runQueryCallback('select')",
+        "#1 {main}",
+    ]
+    assert top_frame(lines) == "Connection.php: Illuminate\\Database\\Connection->runQueryCallback"
+
+
+def test_groups_count_repeated_errors():
+    lines = []
+    for i in range(3):
+        lines += [
+            f"[2024-05-01 10:00:0{i}] local.ERROR: Order {i} failed",
+            "#0 /app/Order.php(12): App\\Order->save()",
+        ]
+    lines.append("[2024-05-01 10:00:05] local.INFO: fine")
+    lines.append("[2024-05-01 10:00:06] local.ERROR: Order 9 failed")
+
+    groups = ErrorGroups()
+    for record in LogParser("Laravel").feed(lines):
+        groups.add(record)
+
+    top = groups.top()
+    assert [(g.count, g.template, g.frame) for g in top] == [
+        (3, "Order <n> failed", "Order.php: App\\Order->save"),
+        (1, "Order <n> failed", ""),
+    ]
+    assert top[0].level == LEVELS["ERROR"]
+    assert top[0].last_seen - top[0].first_seen == 2
+
+
+def test_file_groups_update_incrementally(tmp_path):
+    log = tmp_path / "laravel.log"
+    log.write_text("[2024-05-01 10:00:00] local.ERROR: Boom 1\n")
+    grouper = FileErrorGroups(str(log), "Laravel")
+
+    assert grouper.update()
+    assert [(g.count, g.frame) for g in grouper.groups.top()] == [(1, "")]
+
+    # a trace written after the header refines the pending record's group
+    with log.open("a") as fh:
+        fh.write("#0 /app/Job.php(3): App\\Job->run()\n")
+        fh.write("[2024-05-01 10:00:01] local.ERROR: Boom 2\n")
+        fh.write("#0 /app/Job.php(3): App\\Job->run()\n")
+    assert grouper.update()
+    assert [(g.count, g.frame) for g in grouper.groups.top()] == [(2, "Job.php: App\\Job->run")]
+
+    assert not grouper.update()
+
+    log.write_text("[2024-05-01 11:00:00] local.WARNING: Reset\n")
+    assert grouper.update()
+    assert [g.template for g in grouper.groups.top()] == ["Reset"]
@@ -0,0 +1,141 @@
+import builtins
+import gzip
+import threading
+
+import pytest
+
+import fusor.logs.index as index_module
+from fusor.logs.index import LogIndex, parse_query
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = LogIndex(str(tmp_path), tmp_path / "index.sqlite3")
+    yield idx
+    idx.close()
+
+
+def test_parse_query_builds_filters_and_match():
+    query = parse_query('level>=ERROR AND message:"SQLSTATE" since:2h conn*', now=10000.0)
+
+    assert query.conditions == ["r.level >= ?", "r.ts >= ?"]
+    assert query.params == [400, 10000.0 - 7200]
+    assert query.match == 'message : "SQLSTATE" AND "conn"*'
+
+
+@pytest.mark.parametrize("text", ["level>=LOUD", "color:red", "a OR b", "since:soon"])
+def test_parse_query_rejects_invalid_input(text):
+    with pytest.raises(ValueError):
+        parse_query(text)
+
+
+def test_ingest_reads_only_new_lines_and_extends_traces(tmp_path, index):
+    log = tmp_path / "laravel.log"
+    log.write_text(
+        "[2024-01-01 10:00:00] local.ERROR: SQLSTATE[23000] duplicate\n"
+        "#0 /app/User.php(10): User->save()\n"
+    )
+    assert index.ingest(str(log), "Laravel") == 1
+
+    with log.open("a") as f:
+        f.write("#1 /app/Job.php(5): Job->handle()\n[2024-01-01 10:00:05] local.INFO: done\npartial")
+    assert index.ingest(str(log), "Laravel") == 1
+    assert index.ingest(str(log), "Laravel") == 0
+
+    hits = index.search('level>=ERROR AND message:"SQLSTATE"')
+    assert len(hits) == 1
+    assert hits[0].text.endswith("Job->handle()")
+    # frames are searchable through the record they belong to
+    assert [h.level for h in index.search("handle")] == [400]
+    assert index.search("partial") == []
+
+
+def test_concurrent_ingests_do_not_duplicate_records(tmp_path, index, monkeypatch):
+    log = tmp_path / "app.log"
+    log.write_text("[2024-01-01 10:00:00] local.ERROR: once\n")
+    reading = threading.Event()
+    release = threading.Event()
+
+    def slow_open(*args, **kwargs):
+        reading.set()
+        release.wait(5)
+        return builtins.open(*args, **kwargs)
+
+    monkeypatch.setattr(index_module, "open", slow_open)
+    results = []
+    first = threading.Thread(target=lambda: results.append(index.ingest(str(log), "Laravel")))
+    first.start()
+    assert reading.wait(5)
+    second = threading.Thread(target=lambda: results.append(index.ingest(str(log), "Laravel")))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert sorted(results) == [0, 1]
+    assert len(index) == 1
+
+
+def test_history_survives_clearing_the_file(tmp_path, index):
+    log = tmp_path / "app.log"
+    log.write_text("[2024-01-01 10:00:00] local.ERROR: first failure\n")
+    index.ingest(str(log), "Laravel")
+
+    log.write_text("")
+    assert index.ingest(str(log), "Laravel") == 0
+    log.write_text("[2024-01-02 10:00:00] local.ERROR: second failure\n")
+    index.ingest(str(log), "Laravel")
+
+    texts = [h.text for h in index.search("failure since:2024-01-01")]
+    assert texts == [
+        "[2024-01-02 10:00:00] local.ERROR: second failure",
+        "[2024-01-01 10:00:00] local.ERROR: first failure",
+    ]
+    assert [h.text for h in index.search("until:2024-01-02")] == texts[1:]
+
+
+def test_index_persists_between_sessions(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("ERROR one\n")
+    db = tmp_path / "index.sqlite3"
+    first = LogIndex(str(tmp_path), db)
+    first.ingest(str(log))
+    first.close()
+
+    with log.open("a") as f:
+        f.write("  continued\nWARNING two\n")
+    second = LogIndex(str(tmp_path), db)
+    assert second.ingest(str(log)) == 1
+    assert [h.text for h in second.search("level>=WARNING")] == ["WARNING two", "ERROR one\n  continued"]
+    second.close()
+
+
+def test_ingest_compressed_and_filter_by_file(tmp_path, index):
+    archive = tmp_path / "app.log.1.gz"
+    with gzip.open(archive, "wt") as f:
+        f.write("ERROR archived\n")
+    log = tmp_path / "app.log"
+    log.write_text("ERROR current\n")
+
+    assert index.ingest_all([str(archive), str(log), str(tmp_path / "missing.log")]) == 2
+    assert [h.text for h in index.search("file:.gz")] == ["ERROR archived"]
+
+
+def test_ingest_compressed_in_blocks_and_drops_a_failed_read(tmp_path, index, monkeypatch):
+    monkeypatch.setattr(index_module, "INGEST_BLOCK_SIZE", 64)
+    archive = tmp_path / "laravel.log.1.gz"
+    lines = [f"[2024-01-01 10:00:{i:02}] local.ERROR: failure {i}\n#0 /app/Job.php({i})\n" for i in range(10)]
+    data = gzip.compress("".join(lines).encode())
+    archive.write_bytes(data[:len(data) // 2])
+
+    with pytest.raises(EOFError):
+        index.ingest(str(archive), "Laravel")
+    assert len(index) == 0
+
+    archive.write_bytes(data)
+    assert index.ingest(str(archive), "Laravel") == 10
+    assert index.ingest(str(archive), "Laravel") == 0
+    # traces split across blocks stay with their record
+    assert [h.text.splitlines()[1] for h in index.search("failure")] == [
+        f"#0 /app/Job.php({i})" for i in reversed(range(10))
+    ]
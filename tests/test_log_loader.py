@@ -0,0 +1,158 @@
+from fusor.logs import LEVELS, LogLoader, LogRequest
+
+
+class ManualExecutor:
+    """Collects submitted jobs so tests decide when they run."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, **_kw):
+        job = Job(fn)
+        self.jobs.append(job)
+        return job
+
+
+class Job:
+    def __init__(self, fn):
+        self.fn = fn
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        return True
+
+
+def _request(tmp_path, min_level=None):
+    return LogRequest(str(tmp_path), "Laravel", ["app.log"], min_level, 100)
+
+
+def test_load_replaces_then_appends(tmp_path, qtbot):
+    log = tmp_path / "app.log"
+    log.write_text("INFO one\n")
+    loader = LogLoader()
+    updates = []
+    loader.loaded.connect(updates.append)
+
+    loader.request(_request(tmp_path))
+    with log.open("a") as fh:
+        fh.write("ERROR two\n")
+    loader.request(_request(tmp_path))
+    loader.request(_request(tmp_path))
+
+    assert [(u.text, u.append) for u in updates if u] == [("INFO one", False), ("ERROR two", True)]
+    assert updates[-1] is None
+
+
+def test_changing_filter_rebuilds(tmp_path, qtbot):
+    (tmp_path / "app.log").write_text("INFO one\nERROR two\n")
+    loader = LogLoader()
+    updates = []
+    loader.loaded.connect(updates.append)
+
+    loader.request(_request(tmp_path))
+    loader.request(_request(tmp_path, LEVELS["ERROR"]))
+
+    assert updates[-1].text == "ERROR two"
+    assert not updates[-1].append
+
+
+def test_newer_request_supersedes_stale_one(tmp_path, qtbot):
+    log = tmp_path / "app.log"
+    log.write_text("INFO one\n")
+    executor = ManualExecutor()
+    loader = LogLoader(executor)
+    updates = []
+    loader.loaded.connect(updates.append)
+
+    loader.request(_request(tmp_path))
+    executor.jobs[0].fn()
+    assert updates[-1].text == "INFO one"
+
+    with log.open("a") as fh:
+        fh.write("INFO two\n")
+    loader.request(_request(tmp_path))
+    stale = executor.jobs[1]
+    loader.request(_request(tmp_path))
+    assert stale.cancelled
+
+    # a superseded job that gets to run anyway does no work
+    stale.fn()
+    assert len(updates) == 1
+
+    executor.jobs[2].fn()
+    assert updates[-1][:2] == ("INFO two", True)
+
+
+def test_dropped_result_forces_rebuild(tmp_path, qtbot):
+    log = tmp_path / "app.log"
+    log.write_text("INFO one\n")
+    loader = LogLoader()
+    updates = []
+    loader.loaded.connect(updates.append)
+    loader.request(_request(tmp_path))
+
+    # a result computed for generation 2 but never shown
+    with log.open("a") as fh:
+        fh.write("INFO two\n")
+    loader.load(_request(tmp_path), generation=2, shown=1)
+
+    loader.request(_request(tmp_path))
+    assert updates[-1][:2] == ("INFO one\nINFO two", False)
+
+
+def test_merged_timeline_interleaves_files(tmp_path, qtbot):
+    (tmp_path / "a.log").write_text(
+        "[2024-05-01 10:00:00] local.INFO: first\n[2024-05-01 10:00:02] local.ERROR: third\n"
+    )
+    (tmp_path / "b.log").write_text("[2024-05-01 10:00:01] local.INFO: second\n")
+    loader = LogLoader()
+    updates = []
+    loader.loaded.connect(updates.append)
+
+    loader.request(LogRequest(str(tmp_path), "Laravel", ["."], None, 100, merged=True))
+
+    assert updates[-1].text.splitlines() == [
+        "[a.log] [2024-05-01 10:00:00] local.INFO: first",
+        "[b.log] [2024-05-01 10:00:01] local.INFO: second",
+        "[a.log] [2024-05-01 10:00:02] local.ERROR: third",
+    ]
+
+
+def test_histogram_counts_entries_hidden_by_level_filter(tmp_path, qtbot):
+    log = tmp_path / "app.log"
+    log.write_text("[2024-01-01 10:00:00] local.ERROR: one\n")
+    loader = LogLoader()
+    updates = []
+    loader.loaded.connect(updates.append)
+
+    loader.request(_request(tmp_path, LEVELS["ERROR"]))
+    with log.open("a") as fh:
+        fh.write("[2024-01-01 10:00:30] local.INFO: two\n[2024-01-01 10:01:10] local.ERROR: three\n")
+    loader.request(_request(tmp_path, LEVELS["ERROR"]))
+
+    assert updates[-1].text == "[2024-01-01 10:01:10] local.ERROR: three"
+    assert [b.counts for b in updates[-1].histogram[-2:]] == [(1, 0, 1, 0), (0, 0, 1, 0)]
+
+
+def test_rebuild_reports_first_unread_line(tmp_path, qtbot):
+    log = tmp_path / "app.log"
+    log.write_text("INFO one\nDEBUG two\n")
+    st = log.stat()
+    with log.open("a") as fh:
+        fh.write("ERROR three\nINFO four\n")
+    loader = LogLoader()
+    updates = []
+    loader.loaded.connect(updates.append)
+
+    request = _request(tmp_path)._replace(bookmarks={str(log): (st.st_ino, st.st_size)})
+    loader.request(request)
+
+    assert updates[-1].text == "INFO one\nDEBUG two\nERROR three\nINFO four"
+    assert updates[-1].unread_from == 2
+    assert updates[-1].positions == {str(log): (st.st_ino, log.stat().st_size)}
+
+    loader.invalidate()
+    loader.request(request._replace(min_level=LEVELS["INFO"]))
+    assert updates[-1].text == "INFO one\nERROR three\nINFO four"
+    assert updates[-1].unread_from == 1
@@ -0,0 +1,45 @@
+from fusor.logs import LogParser, merge_records
+
+
+def _records(lines):
+    return LogParser("Laravel").iter_records(lines)
+
+
+def test_merge_orders_by_timestamp_and_keeps_traces():
+    backend = _records([
+        "[2024-05-01 10:00:00] local.INFO: b1",
+        "[2024-05-01 10:00:02] local.ERROR: b2",
+        "#0 trace",
+    ])
+    frontend = _records([
+        "[2024-05-01 10:00:01] local.INFO: f1",
+        "[2024-05-01 10:00:03] local.INFO: f2",
+    ])
+
+    merged = [(i, r.message, len(r.lines)) for i, r in merge_records([backend, frontend])]
+
+    assert merged == [(0, "b1", 1), (1, "f1", 1), (0, "b2", 2), (1, "f2", 1)]
+
+
+def test_merge_is_lazy():
+    pulled = []
+
+    def stream(name, count):
+        for i in range(count):
+            pulled.append(name)
+            yield from _records([f"[2024-05-01 10:00:0{i}] local.INFO: {name}{i}"])
+
+    merged = merge_records([stream("a", 5), stream("b", 5)])
+    next(merged)
+    assert len(pulled) <= 3
+
+
+def test_records_without_timestamp_keep_their_place():
+    a = _records(["orphan line", "[2024-05-01 10:00:05] local.INFO: a"])
+    b = _records(["[2024-05-01 10:00:01] local.INFO: b"])
+
+    assert [r.lines[0] for _i, r in merge_records([a, b])] == [
+        "orphan line",
+        "[2024-05-01 10:00:01] local.INFO: b",
+        "[2024-05-01 10:00:05] local.INFO: a",
+    ]
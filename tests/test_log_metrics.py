@@ -0,0 +1,54 @@
+from PyQt6.QtCore import QPoint, Qt
+
+from fusor.logs import LEVELS, LogRecord
+from fusor.logs.metrics import HistogramBin, LevelHistogram, LogHistogramStrip
+
+
+def test_histogram_counts_levels_per_bin():
+    hist = LevelHistogram(bins=3, bin_seconds=60)
+    hist.add(0, LEVELS["INFO"])
+    hist.add(10, LEVELS["ERROR"])
+    hist.add(70, LEVELS["WARNING"])
+    hist.add(75, LEVELS["EMERGENCY"])
+    hist.add(None, LEVELS["ERROR"])
+
+    assert hist.snapshot() == [
+        HistogramBin(-60.0, (0, 0, 0, 0)),
+        HistogramBin(0.0, (1, 0, 1, 0)),
+        HistogramBin(60.0, (0, 1, 0, 1)),
+    ]
+
+
+def test_histogram_ring_drops_old_bins():
+    hist = LevelHistogram(bins=3, bin_seconds=60)
+    hist.add(0, LEVELS["ERROR"])
+    hist.add(120, LEVELS["ERROR"])
+    hist.add(180, LEVELS["ERROR"])
+    # too old for the window
+    hist.add(30, LEVELS["ERROR"])
+
+    assert [(b.start, b.total) for b in hist.snapshot()] == [(60.0, 0), (120.0, 1), (180.0, 1)]
+
+    hist.add(10_000, LEVELS["INFO"])
+    assert [b.total for b in hist.snapshot()] == [0, 0, 1]
+
+
+def test_continued_records_are_not_counted():
+    hist = LevelHistogram()
+    record = LogRecord(0.0, LEVELS["ERROR"], "", 0, ["x"])
+    hist.add_record(record)
+    hist.add_record(record._replace(continued=True))
+
+    assert sum(b.total for b in hist.snapshot()) == 1
+
+
+def test_strip_emits_clicked_bin_range(qtbot):
+    strip = LogHistogramStrip()
+    qtbot.addWidget(strip)
+    strip.resize(200, 40)
+    strip.set_bins([HistogramBin(0.0, (1, 0, 0, 0)), HistogramBin(60.0, (0, 0, 2, 0))])
+
+    with qtbot.waitSignal(strip.binClicked) as blocker:
+        qtbot.mouseClick(strip, Qt.MouseButton.LeftButton, pos=QPoint(150, 20))
+
+    assert blocker.args == [60.0, 120.0]
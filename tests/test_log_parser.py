@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from fusor.logs import LEVELS, LogParser, filter_records, level_rank
+from fusor.logs.parser import UNKNOWN_LEVEL
+
+
+def test_laravel_record_with_stack_trace():
+    parser = LogParser("Laravel")
+    records = parser.feed([
+        "[2024-05-01 10:00:00] local.ERROR: SQLSTATE[HY000] boom",
+        "#0 /app/vendor/foo.php(12): bar()",
+        "#1 {main}",
+        "[2024-05-01 10:00:01] local.INFO: ok",
+    ])
+
+    assert [r.level for r in records] == [LEVELS["ERROR"], LEVELS["INFO"]]
+    assert records[0].channel == "local"
+    assert records[0].message == "SQLSTATE[HY000] boom"
+    assert len(records[0].lines) == 3
+    assert records[0].timestamp == datetime(2024, 5, 1, 10, 0, 0).timestamp()
+
+
+def test_symfony_iso_timestamp_and_channel():
+    parser = LogParser("Symfony")
+    (record,) = parser.feed([
+        "[2024-05-01T10:00:00.123456+00:00] request.CRITICAL: Uncaught PHP Exception",
+    ])
+    assert record.level == LEVELS["CRITICAL"]
+    assert record.channel == "request"
+    assert record.timestamp == datetime.fromisoformat("2024-05-01T10:00:00.123456+00:00").timestamp()
+
+
+def test_yii_level_and_category():
+    parser = LogParser("Yii")
+    (record,) = parser.feed([
+        "2024-05-01 10:00:00 [127.0.0.1][-][-][warning][yii\\db\\Command] slow query",
+    ])
+    assert record.level == LEVELS["WARNING"]
+    assert record.channel == "yii\\db\\Command"
+    assert record.message == "slow query"
+
+
+def test_message_mentioning_level_does_not_change_level():
+    parser = LogParser("Laravel")
+    (record,) = parser.feed(["[2024-05-01 10:00:00] local.INFO: no ERROR here"])
+    assert record.level == LEVELS["INFO"]
+
+
+def test_continuation_lines_across_feeds():
+    parser = LogParser("Laravel")
+    parser.feed(["[2024-05-01 10:00:00] local.ERROR: boom"])
+    (record,) = parser.feed(["#0 trace line"])
+
+    assert record.continued
+    assert record.level == LEVELS["ERROR"]
+    assert record.lines == ["#0 trace line"]
+
+
+def test_orphan_lines_have_unknown_level():
+    (record,) = LogParser("Laravel").feed(["just text"])
+    assert record.level == UNKNOWN_LEVEL
+    assert level_rank("nope") == UNKNOWN_LEVEL
+
+
+def test_filter_records_by_level_and_time():
+    parser = LogParser("Laravel")
+    records = parser.feed([
+        "[2024-05-01 10:00:00] local.DEBUG: a",
+        "[2024-05-01 11:00:00] local.ERROR: b",
+        "  detail",
+        "[2024-05-01 09:00:00] local.ERROR: c",
+    ])
+
+    assert filter_records(records, LEVELS["WARNING"]) == [
+        "[2024-05-01 11:00:00] local.ERROR: b",
+        "  detail",
+        "[2024-05-01 09:00:00] local.ERROR: c",
+    ]
+    since = datetime(2024, 5, 1, 10, 30).timestamp()
+    assert filter_records(records, since=since) == [
+        "[2024-05-01 11:00:00] local.ERROR: b",
+        "  detail",
+    ]
@@ -0,0 +1,50 @@
+import re
+
+import pytest
+
+from fusor.logs import SearchQuery, compile_query, find_matches
+
+
+def test_plain_search_is_case_insensitive():
+    result = find_matches("Foo bar FOO foo", SearchQuery("foo"))
+    assert list(result.starts) == [0, 8, 12]
+    assert list(result.lengths) == [3, 3, 3]
+
+
+def test_plain_search_keeps_offsets_when_lowercase_changes_length():
+    text = "İ foo"  # lowercases to two characters
+    result = find_matches(text, SearchQuery("foo"))
+    assert list(result.starts) == [text.index("foo")]
+
+
+def test_offsets_count_utf16_code_units():
+    text = "\U0001F600 foo \U0001F600\U0001F600 foo"
+    result = find_matches(text, SearchQuery("foo"))
+    assert list(result.starts) == [3, 12]
+
+    spans = find_matches("x a\U0001F600b", SearchQuery("a.b", regex=True))
+    assert [spans.span(i) for i in range(len(spans))] == [(2, 4)]
+
+
+def test_whole_word_and_regex():
+    text = "error errors ERROR: 42"
+    words = find_matches(text, SearchQuery("error", whole_word=True))
+    assert list(words.starts) == [0, 13]
+
+    digits = find_matches(text, SearchQuery(r"\d+", regex=True))
+    assert [digits.span(i) for i in range(len(digits))] == [(20, 2)]
+
+
+def test_empty_regex_matches_are_skipped():
+    assert len(find_matches("abc", SearchQuery("x*", regex=True))) == 0
+
+
+def test_between_includes_match_crossing_start():
+    result = find_matches("aaa foo bbb foo", SearchQuery("foo"))
+    assert result.between(5, 10) == range(0, 1)
+    assert result.between(8, 16) == range(1, 2)
+
+
+def test_invalid_regex_raises():
+    with pytest.raises(re.error):
+        compile_query(SearchQuery("(", regex=True))
@@ -0,0 +1,83 @@
+import sys
+
+import fusor.logs.stream as stream_module
+from fusor.logs import LEVELS, LogStream, split_compose_line
+
+
+def _printer(*lines):
+    script = "\n".join(f"print({line!r})" for line in lines)
+    return [sys.executable, "-c", script]
+
+
+def test_split_compose_line():
+    service, ts, text = split_compose_line(
+        "web-1  | 2024-01-01T10:00:00.123456789Z [2024-01-01 10:00:00] local.ERROR: boom"
+    )
+    assert service == "web-1"
+    assert ts == 1704103200.123456
+    assert text == "[2024-01-01 10:00:00] local.ERROR: boom"
+    assert split_compose_line("plain output") == ("", None, "plain output")
+
+
+def test_stream_filters_by_record_level(qtbot):
+    stream = LogStream()
+    updates = []
+    finished = []
+    stream.received.connect(updates.append)
+    stream.finished.connect(finished.append)
+    stream.min_level = LEVELS["ERROR"]
+
+    stream.start(_printer(
+        "app-1  | 2024-01-01T10:00:00Z INFO started",
+        "app-1  | 2024-01-01T10:00:01Z ERROR failed",
+        "app-1  | 2024-01-01T10:00:01Z   at handler",
+        "db-1   | 2024-01-01T10:00:02Z WARNING slow query",
+    ))
+
+    assert finished == [0]
+    assert not stream.running
+    assert updates[-1].append
+    assert updates[-1].text == "app-1 | ERROR failed\napp-1 |   at handler"
+    # filtered entries still count towards the histogram
+    assert sum(b.total for b in updates[-1].histogram) == 3
+
+
+def test_plain_output_counts_towards_the_histogram(qtbot):
+    stream = LogStream()
+    updates = []
+    stream.received.connect(updates.append)
+
+    stream.start(_printer(
+        "web-1  | 2024-01-01T10:00:00Z GET / 200",
+        "web-1  | 2024-01-01T10:00:01Z GET /favicon.ico 404",
+        "app-1  | 2024-01-01T10:00:02Z ERROR failed",
+        "app-1  | 2024-01-01T10:00:02Z   at handler",
+    ))
+
+    qtbot.waitUntil(lambda: not stream.running, timeout=3000)
+    assert sum(b.total for b in updates[-1].histogram) == 3
+
+
+def test_stream_summarizes_lines_it_cannot_keep_up_with(qtbot, monkeypatch):
+    monkeypatch.setattr(stream_module, "MAX_PENDING_LINES", 2)
+    stream = LogStream()
+    updates = []
+    stream.received.connect(updates.append)
+
+    stream.start(_printer("a-1 | one", "b-1 | two", "a-1 | three", "a-1 | four"))
+
+    assert updates[-1].text.splitlines() == [
+        "... 2 lines skipped to keep up (a-1: 1, b-1: 1)",
+        "a-1 | three",
+        "a-1 | four",
+    ]
+
+
+def test_missing_command_reports_failure(qtbot):
+    stream = LogStream()
+    finished = []
+    stream.finished.connect(finished.append)
+
+    stream.start(["fusor-no-such-command"])
+
+    assert finished == [None]
@@ -0,0 +1,125 @@
+import os
+
+import pytest
+
+import fusor.logs.tail as tail_module
+from fusor.logs.tail import LogTailer
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_first_poll_loads_last_lines(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("".join(f"line {i}\n" for i in range(50)))
+    tailer = LogTailer(10)
+
+    update = tailer.poll(str(log))
+
+    assert update.reset
+    assert update.lines == [f"line {i}" for i in range(40, 50)]
+
+
+def test_poll_reads_only_appended_bytes(tmp_path, monkeypatch):
+    log = tmp_path / "app.log"
+    log.write_text("old 1\nold 2\n")
+    tailer = LogTailer(10)
+    tailer.poll(str(log))
+
+    _append(log, "new 1\nnew 2\n")
+    reads = []
+    real_open = tail_module.open
+
+    class Recorder:
+        def __init__(self, f):
+            self.f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.f.close()
+
+        def seek(self, *args):
+            return self.f.seek(*args)
+
+        def read(self, size=-1):
+            data = self.f.read(size)
+            reads.append(data)
+            return data
+
+    monkeypatch.setattr(tail_module, "open", lambda *a, **k: Recorder(real_open(*a, **k)))
+
+    update = tailer.poll(str(log))
+
+    assert not update.reset
+    assert update.lines == ["new 1", "new 2"]
+    assert reads == [b"new 1\nnew 2\n"]
+    assert tailer.lines(str(log)) == ["old 1", "old 2", "new 1", "new 2"]
+
+
+def test_poll_without_changes_does_not_open_file(tmp_path, monkeypatch):
+    log = tmp_path / "app.log"
+    log.write_text("a\n")
+    tailer = LogTailer(10)
+    tailer.poll(str(log))
+
+    def forbid(*_a, **_k):
+        raise AssertionError("unexpected read")
+
+    monkeypatch.setattr(tail_module, "open", forbid)
+
+    update = tailer.poll(str(log))
+    assert update.lines == []
+    assert not update.reset
+
+
+def test_truncation_resets(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("a\nb\nc\n")
+    tailer = LogTailer(10)
+    tailer.poll(str(log))
+
+    log.write_text("x\n")
+    update = tailer.poll(str(log))
+
+    assert update.reset
+    assert update.lines == ["x"]
+
+
+def test_rotation_resets(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("before\n")
+    tailer = LogTailer(10)
+    tailer.poll(str(log))
+
+    os.rename(log, tmp_path / "app.log.1")
+    log.write_text("after rotation with more bytes\n")
+    update = tailer.poll(str(log))
+
+    assert update.reset
+    assert update.lines == ["after rotation with more bytes"]
+
+
+def test_partial_line_completed(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("done\npart")
+    tailer = LogTailer(10)
+    assert tailer.poll(str(log)).lines == ["done", "part"]
+
+    _append(log, "ial\nnext\n")
+    update = tailer.poll(str(log))
+
+    assert update.reset
+    assert update.lines == ["done", "partial", "next"]
+
+    _append(log, "more\n")
+    assert tailer.poll(str(log)).lines == ["more"]
+
+
+def test_missing_file_raises(tmp_path):
+    tailer = LogTailer(10)
+    with pytest.raises(OSError):
+        tailer.poll(str(tmp_path / "missing.log"))
@@ -0,0 +1,151 @@
+from PyQt6.QtCore import QModelIndex
+
+import fusor.logs.viewer as viewer_module
+from fusor.logs import LineIndex, LogFileModel, LogViewerDialog
+
+
+def test_line_index_is_built_lazily(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("".join(f"line {i}\n" for i in range(100)) + "tail")
+
+    index = LineIndex(str(log))
+    try:
+        assert len(index) == 0
+        assert index.index_more(10) == 10
+        assert len(index) == 10
+        assert not index.complete
+        assert index.line(9) == "line 9"
+
+        index.index_all()
+        assert index.complete
+        assert len(index) == 101
+        assert index.line(100) == "tail"
+    finally:
+        index.close()
+
+
+def test_line_index_handles_empty_and_growing_files(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("")
+    index = LineIndex(str(log))
+    try:
+        assert len(index) == 0
+        assert index.index_more() == 0
+
+        log.write_text("a\r\nb")
+        assert index.remap() is False
+        index.index_all()
+        assert [index.line(i) for i in range(len(index))] == ["a", "b"]
+
+        log.write_text("x\n")
+        assert index.remap() is True
+        index.index_all()
+        assert [index.line(i) for i in range(len(index))] == ["x"]
+    finally:
+        index.close()
+
+
+def test_long_lines_are_truncated_for_display(tmp_path, monkeypatch):
+    monkeypatch.setattr(viewer_module, "MAX_DISPLAY_CHARS", 5)
+    log = tmp_path / "app.log"
+    log.write_text("abcdefghij\n")
+    index = LineIndex(str(log))
+    try:
+        index.index_all()
+        assert index.line(0) == "abcde"
+    finally:
+        index.close()
+
+
+def test_model_fetches_rows_on_demand(tmp_path, monkeypatch):
+    monkeypatch.setattr(viewer_module, "FETCH_LINES", 50)
+    log = tmp_path / "app.log"
+    log.write_text("".join(f"{i}\n" for i in range(120)))
+
+    model = LogFileModel(str(log))
+    try:
+        root = QModelIndex()
+        assert model.rowCount() == 0
+        assert model.canFetchMore(root)
+        model.fetchMore(root)
+        assert model.rowCount() == 50
+        assert model.data(model.index(49, 0)) == "49"
+
+        model.fetch_all()
+        assert model.rowCount() == 120
+        assert not model.canFetchMore(root)
+
+        with log.open("a") as fh:
+            fh.write("120\n")
+        model.reload()
+        assert model.rowCount() == 121
+        assert model.data(model.index(120, 0)) == "120"
+    finally:
+        model.close()
+
+
+def test_viewer_dialog_scrolls_to_end(tmp_path, qtbot):
+    log = tmp_path / "app.log"
+    log.write_text("".join(f"{i}\n" for i in range(500)))
+
+    dialog = LogViewerDialog(str(log))
+    qtbot.addWidget(dialog)
+    dialog.scroll_to_end()
+
+    assert dialog.model.rowCount() == 500
+    dialog.reject()
+
+
+def test_line_index_keeps_sparse_marks(tmp_path, monkeypatch):
+    monkeypatch.setattr(viewer_module, "SCAN_BYTES", 64)
+    monkeypatch.setattr(viewer_module, "CACHED_SEGMENTS", 2)
+    log = tmp_path / "app.log"
+    lines = [f"entry {i} " + "x" * (i % 13) for i in range(300)]
+    log.write_text("\n".join(lines))
+
+    index = LineIndex(str(log))
+    try:
+        index.index_all()
+        assert len(index) == 300
+        # one mark per scanned slice, not one offset per line
+        assert len(index._mark_offsets) < 300
+        assert [index.line(i) for i in range(300)] == lines
+        assert index.line(0) == lines[0]
+    finally:
+        index.close()
+
+
+def test_line_index_follows_replaced_file(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("old 1\nold 2\nold 3\n")
+    index = LineIndex(str(log))
+    try:
+        index.index_all()
+        rotated = tmp_path / "app.log.1"
+        log.rename(rotated)
+        # missing until the writer recreates it: keep the old file
+        assert index.remap() is False
+
+        log.write_text("new 1\nnew 2\nnew 3\nnew 4\n")
+        assert index.remap() is True
+        index.index_all()
+        assert [index.line(i) for i in range(len(index))] == ["new 1", "new 2", "new 3", "new 4"]
+    finally:
+        index.close()
+
+
+def test_viewer_dialog_indexes_to_end_in_steps(tmp_path, qtbot, monkeypatch):
+    monkeypatch.setattr(viewer_module, "INDEX_STEP_BYTES", 1000)
+    log = tmp_path / "app.log"
+    log.write_text("".join(f"{i}\n" for i in range(5000)))
+
+    dialog = LogViewerDialog(str(log))
+    qtbot.addWidget(dialog)
+    dialog.scroll_to_end()
+    assert dialog.model.rowCount() < 5000
+    assert dialog.status_label.text().startswith("Indexing")
+
+    qtbot.waitUntil(lambda: dialog.model.rowCount() == 5000, timeout=3000)
+    assert dialog.status_label.text() == ""
+    assert dialog.model.data(dialog.model.index(4999, 0)) == "4999"
+    dialog.reject()
@@ -0,0 +1,93 @@
+import fusor.logs.watcher as watcher_module
+from fusor.logs.watcher import LogWatcher, supports_notify
+
+
+def test_change_is_debounced(tmp_path, qtbot):
+    log = tmp_path / "app.log"
+    log.write_text("")
+    watcher = LogWatcher()
+    watcher.watch([str(log), str(tmp_path)])
+    emitted = []
+    watcher.changed.connect(lambda: emitted.append(True))
+
+    for i in range(5):
+        with open(log, "a", encoding="utf-8") as f:
+            f.write(f"line {i}\n")
+
+    qtbot.waitUntil(lambda: bool(emitted), timeout=3000)
+    qtbot.wait(watcher_module.DEBOUNCE_MS * 2)
+    assert emitted == [True]
+    assert not watcher.needs_polling()
+
+
+def test_debounce_waits_for_events_to_stop(tmp_path, monkeypatch, qtbot):
+    monkeypatch.setattr(watcher_module, "DEBOUNCE_MS", 100)
+    watcher = LogWatcher()
+    emitted = []
+    watcher.changed.connect(lambda: emitted.append(True))
+
+    for _ in range(6):
+        watcher._on_event(str(tmp_path))
+        qtbot.wait(40)
+    assert emitted == []
+
+    qtbot.waitUntil(lambda: bool(emitted), timeout=3000)
+    assert emitted == [True]
+
+
+def test_steady_events_still_report_changes(tmp_path, monkeypatch, qtbot):
+    monkeypatch.setattr(watcher_module, "DEBOUNCE_MS", 100)
+    monkeypatch.setattr(watcher_module, "MAX_DEBOUNCE_MS", 200)
+    watcher = LogWatcher()
+    emitted = []
+    watcher.changed.connect(lambda: emitted.append(True))
+
+    for _ in range(20):
+        watcher._on_event(str(tmp_path))
+        qtbot.wait(40)
+    assert emitted
+
+
+def test_new_file_in_directory_is_reported(tmp_path, qtbot):
+    watcher = LogWatcher()
+    watcher.watch([str(tmp_path)])
+
+    with qtbot.waitSignal(watcher.changed, timeout=3000):
+        (tmp_path / "new.log").write_text("hello\n")
+
+
+def test_directory_event_drops_cached_listing(tmp_path, monkeypatch, qtbot):
+    invalidated = []
+    monkeypatch.setattr(watcher_module, "invalidate_log_paths", invalidated.append, raising=True)
+    watcher = LogWatcher()
+    watcher.watch([str(tmp_path)])
+
+    with qtbot.waitSignal(watcher.changed, timeout=3000):
+        (tmp_path / "new.log").write_text("hello\n")
+
+    assert str(tmp_path) in invalidated
+
+
+def test_missing_paths_are_ignored(tmp_path):
+    watcher = LogWatcher()
+    watcher.watch([str(tmp_path / "missing.log")])
+
+    assert watcher.watched() == set()
+    assert not watcher.needs_polling()
+
+
+def test_network_filesystem_needs_polling(tmp_path, monkeypatch):
+    monkeypatch.setattr(watcher_module.sys, "platform", "linux")
+    monkeypatch.setattr(
+        watcher_module,
+        "_mount_types",
+        lambda: [(str(tmp_path), "fuse.grpcfuse"), ("/", "ext4")],
+    )
+
+    assert not supports_notify(str(tmp_path / "app.log"))
+    assert supports_notify("/etc")
+
+    watcher = LogWatcher()
+    watcher.watch([str(tmp_path)])
+    assert watcher.needs_polling()
+    assert watcher.watched() == set()
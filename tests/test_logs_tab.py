@@ -1,5 +1,5 @@
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QTextCursor, QColor
+from PyQt6.QtGui import QColor
 import os
 import sys
 import subprocess
@@ -59,7 +59,7 @@ def test_search_cycle_multiple_matches(qtbot):
     qtbot.mouseClick(tab.search_btn, Qt.MouseButton.LeftButton)
     qtbot.wait(10)
 
-    assert tab._search_positions == [0, 8, 16]
+    assert list(tab._search_positions) == [0, 8, 16]
     assert tab.next_btn.isEnabled()
     assert tab.prev_btn.isEnabled()
 
@@ -108,6 +108,137 @@ def test_search_empty_clears_highlighting(qtbot):
     assert not tab.next_btn.isEnabled()
     assert not tab.prev_btn.isEnabled()
 
+def test_search_runs_on_executor_and_highlights_viewport(qtbot):
+    from fusor.jobs import JobScheduler
+
+    main = DummyMainWindow()
+    main.executor = JobScheduler()
+    tab = LogsTab(main)
+    qtbot.addWidget(tab)
+    tab.show()
+
+    lines = [f"line {i} match" for i in range(2000)]
+    tab.log_view.setPlainText("\n".join(lines))
+    tab.search_edit.setText("match")
+    tab.search_btn.click()
+
+    try:
+        qtbot.waitUntil(lambda: len(tab._search_positions) == 2000)
+        selections = tab.log_view.extraSelections()
+        assert 0 < len(selections) < 2000
+        assert tab.log_view.textCursor().selectedText() == "match"
+    finally:
+        main.executor.shutdown()
+
+
+def test_search_regex_whole_word_and_invalid_pattern(qtbot, capsys):
+    main = DummyMainWindow()
+    tab = LogsTab(main)
+    qtbot.addWidget(tab)
+
+    tab.log_view.setPlainText("foo food foo")
+    tab.search_edit.setText("foo")
+    tab.word_checkbox.setChecked(True)
+    tab.search_btn.click()
+    assert list(tab._search_positions) == [0, 9]
+
+    tab.word_checkbox.setChecked(False)
+    tab.regex_checkbox.setChecked(True)
+    tab.search_edit.setText("fo+d")
+    tab.search_btn.click()
+    assert list(tab._search_positions) == [4]
+
+    tab.search_edit.setText("(")
+    tab.search_btn.click()
+    assert "Invalid search pattern" in capsys.readouterr().out
+    assert len(tab._search_positions) == 0
+
+
+def test_browse_opens_virtualized_viewer(tmp_path, qtbot):
+    from fusor.logs import LogViewerDialog
+
+    log = tmp_path / "app.log"
+    log.write_text("first\nsecond\n")
+
+    main = DummyMainWindow()
+    main.project_path = str(tmp_path)
+    main.log_dirs = ["app.log"]
+    tab = LogsTab(main)
+    qtbot.addWidget(tab)
+
+    tab.browse_btn.click()
+    dialogs = tab.findChildren(LogViewerDialog)
+    assert len(dialogs) == 1
+    assert dialogs[0].model.path == str(log)
+    dialogs[0].close()
+
+
+def test_group_errors_table(tmp_path, qtbot):
+    log = tmp_path / "app.log"
+    log.write_text(
+        "ERROR Payment 1 declined\nERROR Payment 2 declined\nINFO ok\nWARNING Disk 91% full\n"
+    )
+    main = DummyMainWindow()
+    main.project_path = str(tmp_path)
+    main.log_dirs = ["app.log"]
+    tab = LogsTab(main)
+    qtbot.addWidget(tab)
+
+    tab.group_checkbox.setChecked(True)
+
+    assert tab.group_table.isVisibleTo(tab)
+    rows = [
+        [tab.group_table.item(r, c).text() for c in range(3)]
+        for r in range(tab.group_table.rowCount())
+    ]
+    assert rows == [["2", "ERROR", "Payment <n> declined"], ["1", "WARNING", "Disk <n>% full"]]
+
+
+def test_group_errors_run_on_index_lane(tmp_path, qtbot):
+    log = tmp_path / "app.log"
+    log.write_text("ERROR Payment 1 declined\n")
+    lanes = []
+
+    class Executor:
+        def submit(self, fn, lane="command", resource=None):
+            lanes.append(lane)
+            fn()
+
+    main = DummyMainWindow()
+    main.project_path = str(tmp_path)
+    main.log_dirs = ["app.log"]
+    main.executor = Executor()
+    tab = LogsTab(main)
+    qtbot.addWidget(tab)
+
+    tab.group_checkbox.setChecked(True)
+
+    # a first pass over a big file must not hold up the io lane
+    assert lanes == ["index"]
+    assert tab.group_table.rowCount() == 1
+
+def test_histogram_click_jumps_to_time(qtbot):
+    from datetime import datetime
+    from fusor.logs import LevelHistogram, LogParser
+
+    main = DummyMainWindow()
+    main.current_framework = lambda: "Laravel"
+    tab = LogsTab(main)
+    qtbot.addWidget(tab)
+    lines = [f"[2024-01-01 10:{m:02d}:30] local.INFO: minute {m}" for m in range(30)]
+    tab.log_view.setPlainText("\n".join(lines))
+    hist = LevelHistogram()
+    for record in LogParser("Laravel").feed(lines):
+        hist.add_record(record)
+    tab.show_histogram(hist.snapshot())
+    assert tab.metrics_strip.isVisibleTo(tab)
+
+    start = datetime(2024, 1, 1, 10, 12).timestamp()
+    tab.metrics_strip.binClicked.emit(start, start + 60)
+
+    assert tab.log_view.textCursor().block().text() == lines[12]
+
+
 def test_auto_refresh_truncates_large_file(tmp_path, qtbot, monkeypatch):
     from PyQt6.QtCore import QTimer
     from fusor import main_window as mw_module
@@ -131,8 +262,8 @@ def test_auto_refresh_truncates_large_file(tmp_path, qtbot, monkeypatch):
     lines = [f"line {i}" for i in range(2000)]
     (log_dir / "big.log").write_text("\n".join(lines))
 
-    win.logs_tab.auto_checkbox.setChecked(True)
-    qtbot.wait(10)
+    with qtbot.waitSignal(win._log_loader.loaded, timeout=3000):
+        win.logs_tab.auto_checkbox.setChecked(True)
 
     result = win.log_view.toPlainText().splitlines()
     assert result == lines[-1000:]
@@ -170,6 +301,24 @@ def test_set_log_dirs_expands_directory(tmp_path, qtbot):
     assert items == expected
 
 
+def test_set_log_dirs_lists_rotated_logs(tmp_path, qtbot):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    (logs / "app.log").write_text("")
+    (logs / "app.log.1").write_text("")
+    (logs / "app.log.2.gz").write_bytes(b"")
+
+    main = DummyMainWindow()
+    main.project_path = str(tmp_path)
+    main.log_dirs = [str(logs)]
+    main.current_framework = lambda: "Symfony"
+    tab = LogsTab(main)
+    qtbot.addWidget(tab)
+
+    items = [tab.log_selector.itemText(i) for i in range(tab.log_selector.count())]
+    assert items == [str(logs / "app.log"), str(logs / "app.log.1"), str(logs / "app.log.2.gz")]
+
+
 def _make_tab_for_open(tmp_path, qtbot):
     log_file = tmp_path / "test.log"
     log_file.write_text("")
@@ -284,6 +433,42 @@ def _make_window_with_log(tmp_path, qtbot, monkeypatch, lines):
     return win, log_file
 
 
+def _refresh(win, qtbot):
+    with qtbot.waitSignal(win._log_loader.loaded, timeout=3000):
+        win.refresh_logs()
+
+
+def test_refresh_logs_appends_new_lines(tmp_path, qtbot, monkeypatch):
+    lines = ["INFO first", "INFO second"]
+    win, log_file = _make_window_with_log(tmp_path, qtbot, monkeypatch, lines)
+    log_file.write_text("\n".join(lines) + "\n")
+    _refresh(win, qtbot)
+
+    rebuilt = []
+    monkeypatch.setattr(win.log_view, "setPlainText", lambda text: rebuilt.append(text))
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("ERROR third\n")
+    _refresh(win, qtbot)
+    _refresh(win, qtbot)
+
+    assert rebuilt == []
+    assert win.log_view.toPlainText().splitlines() == lines + ["ERROR third"]
+
+
+def test_auto_refresh_follows_file_changes(tmp_path, qtbot, monkeypatch):
+    win, log_file = _make_window_with_log(tmp_path, qtbot, monkeypatch, ["INFO start"])
+    win.logs_tab.auto_checkbox.setChecked(True)
+
+    assert not win.logs_tab._timer.isActive()
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("\nERROR boom\n")
+
+    qtbot.waitUntil(lambda: "ERROR boom" in win.log_view.toPlainText(), timeout=3000)
+
+    win.logs_tab.auto_checkbox.setChecked(False)
+    assert win.logs_tab._watcher.watched() == set()
+
+
 def test_refresh_logs_filters_by_level(tmp_path, qtbot, monkeypatch):
     lines = [
         "DEBUG debug msg",
@@ -296,12 +481,33 @@ def test_refresh_logs_filters_by_level(tmp_path, qtbot, monkeypatch):
     win, _ = _make_window_with_log(tmp_path, qtbot, monkeypatch, lines)
     win.logs_tab.level_selector.setCurrentText("WARNING")
 
-    win.refresh_logs()
+    _refresh(win, qtbot)
 
     result = win.log_view.toPlainText().splitlines()
     assert result == lines[2:]
 
 
+def test_refresh_logs_level_filter_keeps_stack_traces(tmp_path, qtbot, monkeypatch):
+    lines = [
+        "[2024-05-01 10:00:00] local.INFO: request mentions ERROR",
+        "[2024-05-01 10:00:01] local.ERROR: boom",
+        "#0 /app/Foo.php(3): bar()",
+        "#1 {main}",
+    ]
+
+    win, log_file = _make_window_with_log(tmp_path, qtbot, monkeypatch, lines)
+    win.logs_tab.level_selector.setCurrentText("ERROR")
+    _refresh(win, qtbot)
+
+    assert win.log_view.toPlainText().splitlines() == lines[1:]
+
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("\n#2 appended frame\n[2024-05-01 10:00:02] local.DEBUG: noise\n")
+    _refresh(win, qtbot)
+
+    assert win.log_view.toPlainText().splitlines() == lines[1:] + ["#2 appended frame"]
+
+
 def test_refresh_logs_level_all_shows_everything(tmp_path, qtbot, monkeypatch):
     lines = [
         "DEBUG debug msg",
@@ -314,12 +520,31 @@ def test_refresh_logs_level_all_shows_everything(tmp_path, qtbot, monkeypatch):
     win, _ = _make_window_with_log(tmp_path, qtbot, monkeypatch, lines)
     win.logs_tab.level_selector.setCurrentText("All")
 
-    win.refresh_logs()
+    _refresh(win, qtbot)
 
     result = win.log_view.toPlainText().splitlines()
     assert result == lines
 
 
+def test_highlighter_defers_offscreen_blocks(qtbot):
+    main = DummyMainWindow()
+    tab = LogsTab(main)
+    qtbot.addWidget(tab)
+    tab.resize(800, 600)
+    tab.show()
+
+    lines = [f"ERROR line {i}" for i in range(2000)]
+    tab.log_view.setPlainText("\n".join(lines))
+    qtbot.wait(10)
+
+    doc = tab.log_view.document()
+    assert doc.firstBlock().layout().formats()
+    assert not doc.lastBlock().layout().formats()
+
+    tab.log_view.verticalScrollBar().setValue(tab.log_view.verticalScrollBar().maximum())
+    qtbot.waitUntil(lambda: bool(doc.lastBlock().layout().formats()))
+
+
 def test_refresh_logs_colors_levels(tmp_path, qtbot, monkeypatch):
     lines = [
         "DEBUG debug msg",
@@ -330,17 +555,15 @@ def test_refresh_logs_colors_levels(tmp_path, qtbot, monkeypatch):
     ]
 
     win, _ = _make_window_with_log(tmp_path, qtbot, monkeypatch, lines)
-    win.refresh_logs()
+    _refresh(win, qtbot)
     qtbot.wait(10)
 
-    cursor = win.log_view.textCursor()
-    cursor.movePosition(QTextCursor.MoveOperation.Start)
     colors = []
-    for _ in lines:
-        cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.KeepAnchor, 1)
-        colors.append(cursor.charFormat().foreground().color().name())
-        cursor.clearSelection()
-        cursor.movePosition(QTextCursor.MoveOperation.NextBlock)
+    block = win.log_view.document().firstBlock()
+    while block.isValid():
+        ranges = block.layout().formats()
+        colors.append(ranges[0].format.foreground().color().name() if ranges else None)
+        block = block.next()
 
     expected = [
         QColor(Qt.GlobalColor.darkGray).name(),
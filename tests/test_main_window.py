@@ -1,3 +1,4 @@
+import io
 import os
 import sys
 import subprocess
@@ -10,15 +11,31 @@ import pytest
 from PyQt6.QtCore import QTimer, Qt
 
 import fusor.main_window as mw_module
+import fusor.logs.tail as tail_module
 from fusor.main_window import MainWindow
 from fusor import APP_NAME
 from PyQt6.QtWidgets import QMainWindow, QMessageBox, QFileDialog, QLabel
+from fusor.git import GitState
 from fusor.tabs.git_tab import GitTab
 
 # ---------------------------------------------------------------------------
 # Helpers & fixtures
 # ---------------------------------------------------------------------------
 
+class FakePopen:
+    """Stand-in for ``subprocess.Popen`` used by streamed commands."""
+
+    def __init__(self, cmd, output="", **kwargs):
+        self.args = cmd
+        self.kwargs = kwargs
+        self.stdout = io.BytesIO(output.encode())
+
+    def wait(self, timeout=None):
+        return 0
+
+    def poll(self):
+        return 0
+
 class FakeLogView:
     def __init__(self):
         self.text = None
@@ -40,6 +57,11 @@ def main_window(monkeypatch, qtbot):
 
     win.close()
 
+def refresh_logs_and_wait(win, qtbot):
+    """Refresh logs and wait for the background loader to deliver them."""
+    with qtbot.waitSignal(win._log_loader.loaded, timeout=3000):
+        win.refresh_logs()
+
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -94,7 +116,7 @@ class TestMainWindow:
             return DummyProcess()
 
         monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
 
         main_window.start_project()
 
@@ -123,7 +145,7 @@ class TestMainWindow:
             return DummyProcess()
 
         monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
 
         main_window.start_project()
 
@@ -137,15 +159,12 @@ class TestMainWindow:
 
         captured = {}
 
-        def fake_run(cmd, capture_output=True, text=True, cwd=None):
+        def fake_popen(cmd, **kw):
             captured["cmd"] = cmd
-            class Result:
-                stdout = ""
-                stderr = ""
-            return Result()
+            return FakePopen(cmd, **kw)
 
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
-        monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
 
         main_window.start_project()
 
@@ -160,15 +179,12 @@ class TestMainWindow:
 
         captured = {}
 
-        def fake_run(cmd, capture_output=True, text=True, cwd=None):
+        def fake_popen(cmd, **kw):
             captured["cmd"] = cmd
-            class Result:
-                stdout = ""
-                stderr = ""
-            return Result()
+            return FakePopen(cmd, **kw)
 
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
-        monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
 
         main_window.start_project()
 
@@ -189,15 +205,12 @@ class TestMainWindow:
 
         captured = {}
 
-        def fake_run(cmd, capture_output=True, text=True, cwd=None):
+        def fake_popen(cmd, **kw):
             captured["cmd"] = cmd
-            class Result:
-                stdout = ""
-                stderr = ""
-            return Result()
+            return FakePopen(cmd, **kw)
 
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
-        monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
 
         main_window.stop_project()
 
@@ -210,15 +223,12 @@ class TestMainWindow:
 
         captured = {}
 
-        def fake_run(cmd, capture_output=True, text=True, cwd=None):
+        def fake_popen(cmd, **kw):
             captured["cmd"] = cmd
-            class Result:
-                stdout = ""
-                stderr = ""
-            return Result()
+            return FakePopen(cmd, **kw)
 
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
-        monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
 
         main_window.stop_project()
 
@@ -345,15 +355,12 @@ class TestMainWindow:
         main_window.php_service = "myphp"
         captured = {}
 
-        def fake_run(cmd, capture_output=True, text=True, cwd=None):
+        def fake_popen(cmd, **kw):
             captured["cmd"] = cmd
-            class Result:
-                stdout = ""
-                stderr = ""
-            return Result()
+            return FakePopen(cmd, **kw)
 
-        monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
 
         main_window.run_command(["php", "-v"])
 
@@ -364,15 +371,12 @@ class TestMainWindow:
         main_window.compose_files = ["a.yml", "b.yml"]
         captured = {}
 
-        def fake_run(cmd, capture_output=True, text=True, cwd=None):
+        def fake_popen(cmd, **kw):
             captured["cmd"] = cmd
-            class Result:
-                stdout = ""
-                stderr = ""
-            return Result()
+            return FakePopen(cmd, **kw)
 
-        monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
 
         main_window.run_command(["php", "-v"])
 
@@ -393,12 +397,12 @@ class TestMainWindow:
         main_window.project_path = "/repo"
         captured = {}
 
-        def fake_run(cmd, capture_output=True, text=True, cwd=None):
+        def fake_popen(cmd, cwd=None, **kw):
             captured["cwd"] = cwd
-            return type("R", (), {"stdout": "", "stderr": ""})()
+            return FakePopen(cmd, cwd=cwd, **kw)
 
-        monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
 
         main_window.run_command(["php", "-v"])
 
@@ -409,12 +413,12 @@ class TestMainWindow:
         main_window.project_path = "/repo"
         captured = {}
 
-        def fake_run(cmd, capture_output=True, text=True, cwd=None):
+        def fake_popen(cmd, cwd=None, **kw):
             captured["cwd"] = cwd
-            return type("R", (), {"stdout": "", "stderr": ""})()
+            return FakePopen(cmd, cwd=cwd, **kw)
 
-        monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
 
         main_window.run_command(["echo", "hi"])
 
@@ -437,14 +441,31 @@ class TestMainWindow:
                 notified.append((title, msg))
 
         monkeypatch.setattr(mw_module, "QSystemTrayIcon", DummyTray, raising=False)
-        monkeypatch.setattr(subprocess, "run", lambda *a, **k: type("R", (), {"stdout": "", "stderr": ""})(), raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", FakePopen, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
 
         main_window.run_command(["echo", "hi"])
 
         assert notified == [(APP_NAME, "Finished: echo hi")]
 
-    def test_refresh_logs_reads_custom_path(self, tmp_path: Path, main_window, monkeypatch):
+    def test_run_command_streams_output(self, main_window, monkeypatch, capsys):
+        captured = {}
+
+        def fake_popen(cmd, **kw):
+            captured.update(kw)
+            return FakePopen(cmd, output="one\ntwo\n", **kw)
+
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
+
+        main_window.run_command(["echo", "hi"])
+
+        out = capsys.readouterr().out.splitlines()
+        assert out[:3] == ["$ echo hi", "one", "two"]
+        assert captured["stdout"] == subprocess.PIPE
+        assert captured["stderr"] == subprocess.STDOUT
+
+    def test_refresh_logs_reads_custom_path(self, tmp_path: Path, main_window, monkeypatch, qtbot):
         log_dir = tmp_path / "logs"
         log_dir.mkdir()
         log_file = log_dir / "custom.log"
@@ -455,20 +476,20 @@ class TestMainWindow:
         main_window.logs_tab.set_log_dirs(main_window.log_dirs)
 
         opened = []
-        real_open = mw_module.open
+        real_open = tail_module.open
 
         def fake_open(path, *args, **kwargs):
             opened.append(path)
             return real_open(path, *args, **kwargs)
 
-        monkeypatch.setattr(mw_module, "open", fake_open, raising=True)
+        monkeypatch.setattr(tail_module, "open", fake_open, raising=True)
 
-        main_window.refresh_logs()
+        refresh_logs_and_wait(main_window, qtbot)
 
         assert opened == [str(log_file)]
         assert main_window.log_view.text == "log text"
 
-    def test_refresh_logs_reads_yii_basic_logs(self, tmp_path: Path, main_window, monkeypatch):
+    def test_refresh_logs_reads_yii_basic_logs(self, tmp_path: Path, main_window, monkeypatch, qtbot):
         log_file = tmp_path / "runtime" / "log" / "app.log"
         log_file.parent.mkdir(parents=True)
         log_file.write_text("basic log")
@@ -482,20 +503,20 @@ class TestMainWindow:
         main_window.log_view = FakeLogView()
 
         opened = []
-        real_open = mw_module.open
+        real_open = tail_module.open
 
         def fake_open(path, *args, **kwargs):
             opened.append(path)
             return real_open(path, *args, **kwargs)
 
-        monkeypatch.setattr(mw_module, "open", fake_open, raising=True)
+        monkeypatch.setattr(tail_module, "open", fake_open, raising=True)
 
-        main_window.refresh_logs()
+        refresh_logs_and_wait(main_window, qtbot)
 
         assert opened == [str(log_file)]
         assert "basic log" in main_window.log_view.text
 
-    def test_refresh_logs_reads_yii_advanced_logs(self, tmp_path: Path, main_window, monkeypatch):
+    def test_refresh_logs_reads_yii_advanced_logs(self, tmp_path: Path, main_window, monkeypatch, qtbot):
         files = []
         for part in ["frontend", "backend", "console"]:
             f = tmp_path / part / "runtime" / "logs" / "app.log"
@@ -512,21 +533,46 @@ class TestMainWindow:
         main_window.log_view = FakeLogView()
 
         opened = []
-        real_open = mw_module.open
+        real_open = tail_module.open
 
         def fake_open(path, *args, **kwargs):
             opened.append(path)
             return real_open(path, *args, **kwargs)
 
-        monkeypatch.setattr(mw_module, "open", fake_open, raising=True)
+        monkeypatch.setattr(tail_module, "open", fake_open, raising=True)
 
-        main_window.refresh_logs()
+        refresh_logs_and_wait(main_window, qtbot)
 
         assert opened == [str(f) for f in files]
         for part in ["frontend", "backend", "console"]:
             assert f"{part} log" in main_window.log_view.text
 
-    def test_refresh_logs_truncates_large_files(self, tmp_path: Path, main_window):
+    def test_refresh_logs_shows_picked_rotated_log(self, tmp_path: Path, main_window, qtbot):
+        logs = tmp_path / "var" / "log"
+        logs.mkdir(parents=True)
+        (logs / "dev.log").write_text("dev log")
+        (logs / "prod.log").write_text("prod log")
+        (logs / "prod.log.1").write_text("old log")
+        main_window.project_path = str(tmp_path)
+        main_window.framework_choice = "Symfony"
+        if hasattr(main_window, "framework_combo"):
+            main_window.framework_combo.setCurrentText("Symfony")
+        main_window.log_dirs = [str(logs)]
+        main_window.log_view = FakeLogView()
+        main_window.logs_tab.set_log_dirs(main_window.log_dirs)
+
+        # the live logs are shown together
+        refresh_logs_and_wait(main_window, qtbot)
+        assert "dev log" in main_window.log_view.text
+        assert "prod log" in main_window.log_view.text
+        assert "old log" not in main_window.log_view.text
+
+        selector = main_window.logs_tab.log_selector
+        selector.setCurrentIndex(selector.findData(str(logs / "prod.log.1")))
+        refresh_logs_and_wait(main_window, qtbot)
+        assert main_window.log_view.text == "old log"
+
+    def test_refresh_logs_truncates_large_files(self, tmp_path: Path, main_window, qtbot):
         log_dir = tmp_path / "logs"
         log_dir.mkdir()
         log_file = log_dir / "large.log"
@@ -538,12 +584,12 @@ class TestMainWindow:
         main_window.logs_tab.set_log_dirs(main_window.log_dirs)
         main_window.max_log_lines = 1000
 
-        main_window.refresh_logs()
+        refresh_logs_and_wait(main_window, qtbot)
 
         result = main_window.log_view.text.splitlines()
         assert result == lines[-1000:]
 
-    def test_refresh_logs_reads_all_configured_files(self, tmp_path: Path, main_window, monkeypatch):
+    def test_refresh_logs_reads_all_configured_files(self, tmp_path: Path, main_window, monkeypatch, qtbot):
         paths = []
         for i in range(3):
             d = tmp_path / f"dir{i}"
@@ -558,20 +604,20 @@ class TestMainWindow:
         main_window.logs_tab.set_log_dirs(main_window.log_dirs)
 
         opened = []
-        real_open = mw_module.open
+        real_open = tail_module.open
 
         def fake_open(path, *args, **kwargs):
             opened.append(path)
             return real_open(path, *args, **kwargs)
 
-        monkeypatch.setattr(mw_module, "open", fake_open, raising=True)
+        monkeypatch.setattr(tail_module, "open", fake_open, raising=True)
 
-        main_window.refresh_logs()
+        refresh_logs_and_wait(main_window, qtbot)
 
         assert opened == [str(paths[0])]
         assert "msg0" in main_window.log_view.text
 
-    def test_refresh_logs_reads_directory(self, tmp_path: Path, main_window, monkeypatch):
+    def test_refresh_logs_reads_directory(self, tmp_path: Path, main_window, monkeypatch, qtbot):
         logs_dir = tmp_path / "logs"
         logs_dir.mkdir()
         files = []
@@ -586,15 +632,15 @@ class TestMainWindow:
         main_window.logs_tab.set_log_dirs(main_window.log_dirs)
 
         opened = []
-        real_open = mw_module.open
+        real_open = tail_module.open
 
         def fake_open(path, *args, **kwargs):
             opened.append(path)
             return real_open(path, *args, **kwargs)
 
-        monkeypatch.setattr(mw_module, "open", fake_open, raising=True)
+        monkeypatch.setattr(tail_module, "open", fake_open, raising=True)
 
-        main_window.refresh_logs()
+        refresh_logs_and_wait(main_window, qtbot)
 
         assert opened == [str(files[0])]
         assert "msg0" in main_window.log_view.text
@@ -1034,10 +1080,136 @@ class TestMainWindow:
             raising=True,
         )
 
+        lanes = []
+        submit = main_window.executor.submit
+
+        def record_lane(fn, **kw):
+            lanes.append(kw.get("lane"))
+            return submit(fn, **kw)
+
+        monkeypatch.setattr(main_window.executor, "submit", record_lane, raising=True)
+        refreshed = []
+        monkeypatch.setattr(main_window, "refresh_logs", lambda: refreshed.append(True), raising=True)
+
         qtbot.mouseClick(main_window.logs_tab.clear_btn, Qt.MouseButton.LeftButton)
-        qtbot.wait(10)
+        qtbot.waitUntil(lambda: bool(refreshed), timeout=3000)
 
         assert log_file.read_text() == ""
+        assert lanes == ["index"]
+
+    def test_cleared_log_stays_queryable(self, tmp_path: Path, main_window, qtbot, monkeypatch):
+        import fusor.logs.index as index_module
+
+        monkeypatch.setattr(index_module, "INDEX_DIR", tmp_path / "index", raising=True)
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        log_file = logs / "app.log"
+        log_file.write_text("[2024-01-01 10:00:00] local.ERROR: SQLSTATE[42S02] missing table\n")
+        main_window.project_path = str(tmp_path)
+        main_window.log_dirs = ["logs"]
+        main_window.logs_tab.set_log_dirs(main_window.log_dirs)
+        main_window.index_logs = True
+        main_window.logs_tab.update_index_controls()
+        assert main_window.logs_tab.query_row.isVisibleTo(main_window.logs_tab)
+
+        monkeypatch.setattr(
+            "PyQt6.QtWidgets.QMessageBox.question",
+            lambda *a, **k: QMessageBox.StandardButton.Yes,
+            raising=True,
+        )
+        qtbot.mouseClick(main_window.logs_tab.clear_btn, Qt.MouseButton.LeftButton)
+        qtbot.waitUntil(lambda: log_file.read_text() == "", timeout=3000)
+
+        tab = main_window.logs_tab
+        tab.query_edit.setText('level>=ERROR AND message:"SQLSTATE"')
+        with qtbot.waitSignal(tab._query_done, timeout=3000):
+            tab.query_log_index()
+
+        assert tab.query_view.toPlainText() == (
+            f"[{Path('logs') / 'app.log'}] [2024-01-01 10:00:00] local.ERROR: SQLSTATE[42S02] missing table"
+        )
+
+    def test_logs_tab_badge_tracks_unread_output(self, tmp_path: Path, main_window, qtbot, monkeypatch):
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        log_file = logs / "app.log"
+        log_file.write_text("[2024-01-01 10:00:00] local.INFO: seen\n")
+        main_window.project_path = str(tmp_path)
+        main_window.log_dirs = ["logs"]
+        main_window.logs_tab.set_log_dirs(main_window.log_dirs)
+        main_window.tabs.setCurrentIndex(main_window.logs_index)
+        with qtbot.waitSignal(main_window._log_loader.loaded, timeout=3000):
+            main_window.refresh_logs()
+        saved = []
+        monkeypatch.setattr(main_window, "_save_log_bookmarks", lambda: saved.append(True), raising=True)
+        main_window.tabs.setCurrentIndex(0)
+        # what the view loaded is bookmarked
+        assert main_window.log_bookmarks[str(log_file)].offset == log_file.stat().st_size
+        assert saved == [True]
+
+        main_window.update_log_badge()
+        qtbot.waitUntil(lambda: not main_window._checking_unread, timeout=3000)
+        assert main_window.tabs.tabText(main_window.logs_index) == "Logs"
+
+        with log_file.open("a") as fh:
+            fh.write("[2024-01-01 10:01:00] local.ERROR: new\n")
+        main_window.update_log_badge()
+        qtbot.waitUntil(lambda: main_window.tabs.tabText(main_window.logs_index) == "Logs \u2022", timeout=3000)
+
+        with qtbot.waitSignal(main_window._log_loader.loaded, timeout=3000):
+            main_window.tabs.setCurrentIndex(main_window.logs_index)
+        assert main_window.tabs.tabText(main_window.logs_index) == "Logs"
+        assert main_window.log_view.textCursor().block().text() == "[2024-01-01 10:01:00] local.ERROR: new"
+
+        # switching away without new output leaves the config alone
+        main_window.tabs.setCurrentIndex(0)
+        assert len(saved) == 2
+        main_window.tabs.setCurrentIndex(main_window.logs_index)
+        main_window.tabs.setCurrentIndex(0)
+        assert len(saved) == 2
+
+    def test_follow_container_logs_uses_compose_settings(self, tmp_path: Path, main_window, qtbot, monkeypatch):
+        main_window.project_path = str(tmp_path)
+        main_window.use_docker = True
+        main_window.compose_files = ["docker-compose.dev.yml"]
+        main_window.compose_profile = "debug"
+        main_window.max_log_lines = 100
+        main_window.logs_tab.update_follow_controls()
+        started = []
+        monkeypatch.setattr(
+            main_window._log_stream, "start", lambda cmd, **kw: started.append((cmd, kw)), raising=True
+        )
+
+        main_window.logs_tab.services_edit.setText("php, nginx")
+        main_window.logs_tab.follow_checkbox.setChecked(True)
+
+        assert started == [(
+            [
+                "docker", "compose", "-f", "docker-compose.dev.yml", "--profile", "debug",
+                "logs", "-f", "--timestamps", "--no-color", "--tail", "100", "php", "nginx",
+            ],
+            {"cwd": str(tmp_path), "framework": main_window.current_framework()},
+        )]
+        assert not main_window.logs_tab.services_edit.isEnabled()
+
+        main_window._on_log_stream_finished(1)
+        assert not main_window.logs_tab.follow_checkbox.isChecked()
+
+    def test_followed_output_skips_grouping_and_indexing(self, main_window, monkeypatch):
+        from fusor.logs import LogUpdate
+
+        calls = []
+        monkeypatch.setattr(main_window.logs_tab, "update_error_groups", lambda: calls.append("groups"))
+        monkeypatch.setattr(main_window.logs_tab, "update_log_index", lambda: calls.append("index"))
+        main_window.log_view.setPlainText("")
+
+        main_window._log_stream.received.emit(LogUpdate("php | started", True))
+
+        assert main_window.log_view.toPlainText() == "php | started"
+        assert calls == []
+
+        main_window._log_loader.loaded.emit(LogUpdate("[app.log] line", False))
+        assert calls == ["groups", "index"]
 
     def test_clear_log_button_aborts_on_no(self, tmp_path: Path, main_window, qtbot, monkeypatch):
         logs = tmp_path / "logs"
@@ -1178,15 +1350,12 @@ class TestMainWindow:
 
         captured = {}
 
-        def fake_run(cmd, capture_output=True, text=True, cwd=None):
+        def fake_popen(cmd, **kw):
             captured["cmd"] = cmd
-            class Result:
-                stdout = ""
-                stderr = ""
-            return Result()
+            return FakePopen(cmd, **kw)
 
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
-        monkeypatch.setattr(subprocess, "run", fake_run, raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
+        monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
 
         main_window.start_project()
 
@@ -1216,7 +1385,7 @@ class TestMainWindow:
             stdout: list[str] = []
 
         monkeypatch.setattr(subprocess, "Popen", lambda *a, **k: DummyProcess(), raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
 
         opened = []
         monkeypatch.setattr(webbrowser, "open", lambda url: opened.append(url), raising=True)
@@ -1257,7 +1426,7 @@ class TestMainWindow:
             return DummyProcess()
 
         monkeypatch.setattr(subprocess, "Popen", fake_popen, raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
 
         main_window.server_process = None
         main_window.start_project()
@@ -1311,7 +1480,11 @@ class TestMainWindow:
         monkeypatch.setattr(QTimer, "singleShot", lambda *a, **k: None, raising=True)
         monkeypatch.setattr(mw_module, "load_config", lambda: {}, raising=True)
         monkeypatch.setattr(mw_module, "save_config", lambda *a, **k: None, raising=True)
-        monkeypatch.setattr(GitTab, "get_remotes", lambda self: remotes, raising=True)
+        monkeypatch.setattr(
+            "fusor.git.service.probe_git_state",
+            lambda path: GitState("main", (), tuple(remotes)),
+            raising=True,
+        )
 
         win = MainWindow()
         qtbot.addWidget(win)
@@ -1327,8 +1500,8 @@ class TestMainWindow:
 
         win.settings_tab.add_project()
 
-        items = [win.remote_combo.itemText(i) for i in range(win.remote_combo.count())]
-        assert "origin" in items
+        # remotes are listed in the background
+        qtbot.waitUntil(lambda: win.remote_combo.findText("origin") >= 0, timeout=3000)
         win.close()
 
     def test_start_and_stop_project_notify(self, tmp_path: Path, main_window, monkeypatch):
@@ -1361,7 +1534,7 @@ class TestMainWindow:
 
         monkeypatch.setattr(mw_module, "QSystemTrayIcon", DummyTray, raising=False)
         monkeypatch.setattr(subprocess, "Popen", lambda *a, **k: DummyProc(), raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
         monkeypatch.setattr(os, "killpg", lambda *a, **k: None, raising=False)
 
         main_window.project_path = str(tmp_path)
@@ -1392,7 +1565,7 @@ class TestMainWindow:
                 pass
 
         monkeypatch.setattr(subprocess, "Popen", lambda *a, **k: DummyProc(), raising=True)
-        monkeypatch.setattr(main_window.executor, "submit", lambda fn: fn(), raising=True)
+        monkeypatch.setattr(main_window.executor, "submit", lambda fn, **_kw: fn(), raising=True)
         monkeypatch.setattr(os, "killpg", lambda *a, **k: None, raising=False)
 
         main_window.project_path = str(tmp_path)
@@ -0,0 +1,87 @@
+import io
+import threading
+
+from PyQt6.QtWidgets import QPlainTextEdit
+
+from fusor.output_sink import OutputSink
+
+
+def _make_sink(qtbot, **kwargs):
+    view = QPlainTextEdit()
+    qtbot.addWidget(view)
+    sink = OutputSink(view, io.StringIO(), echo=False, **kwargs)
+    return view, sink
+
+
+def test_writes_are_batched_into_single_append(qtbot, monkeypatch):
+    view, sink = _make_sink(qtbot)
+    calls = []
+    real_append = view.appendPlainText
+    monkeypatch.setattr(view, "appendPlainText", lambda text: (calls.append(text), real_append(text)))
+
+    for i in range(100):
+        print(f"line {i}", file=sink)
+
+    qtbot.waitUntil(lambda: bool(calls))
+    assert len(calls) == 1
+    assert view.toPlainText().splitlines() == [f"line {i}" for i in range(100)]
+
+
+def test_writes_from_worker_thread(qtbot):
+    view, sink = _make_sink(qtbot)
+
+    def worker():
+        for i in range(10):
+            sink.write(f"msg {i}\n")
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    qtbot.waitUntil(lambda: "msg 9" in view.toPlainText())
+    assert view.toPlainText().splitlines() == [f"msg {i}" for i in range(10)]
+
+
+def test_output_is_bounded(qtbot):
+    view, sink = _make_sink(qtbot, max_lines=10)
+
+    for i in range(25):
+        sink.write(f"row {i}")
+    sink.drain()
+
+    lines = view.toPlainText().splitlines()
+    assert view.document().blockCount() <= 10
+    assert lines[-1] == "row 24"
+    assert "row 0" not in lines
+
+
+def test_echo_writes_to_original_stream(qtbot):
+    view = QPlainTextEdit()
+    qtbot.addWidget(view)
+    original = io.StringIO()
+    sink = OutputSink(view, original, echo=True)
+
+    sink.write("hello\n")
+
+    assert original.getvalue() == "hello\n"
+
+
+def test_blank_lines_are_kept_and_redraws_replace_the_line(qtbot):
+    view, sink = _make_sink(qtbot)
+
+    print("start", file=sink)
+    print("", file=sink)
+    print("10%", end="\r", file=sink)
+    sink.drain()
+    assert view.toPlainText().splitlines() == ["start", "", "10%"]
+
+    print("50%", end="\r", file=sink)
+    print("100%", end="\r", file=sink)
+    sink.drain()
+    assert view.toPlainText().splitlines() == ["start", "", "100%"]
+
+    # "\r\n" split across writes ends the line instead of redrawing it
+    sink.write("done\r")
+    sink.write("\nnext\n")
+    sink.drain()
+    assert view.toPlainText().splitlines() == ["start", "", "done", "next"]
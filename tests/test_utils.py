@@ -12,3 +12,61 @@ def test_is_git_repo_false(tmp_path):
     path = tmp_path / "no_repo"
     path.mkdir()
     assert not is_git_repo(str(path))
+
+def test_expand_log_paths_rotated_families(tmp_path):
+    from fusor.utils import expand_log_paths
+
+    for name in ["app.log", "app.log.10", "app.log.2.gz", "app.log.1", "notes.txt", "web.log.1.bz2"]:
+        (tmp_path / name).write_text("")
+
+    assert expand_log_paths(str(tmp_path), ["."]) == ["app.log"]
+    assert expand_log_paths(str(tmp_path), ["."], rotated=True) == [
+        "app.log",
+        "app.log.1",
+        "app.log.2.gz",
+        "app.log.10",
+        "web.log.1.bz2",
+    ]
+
+
+def test_expand_log_paths_caches_directory_listings(tmp_path, monkeypatch):
+    import os
+    import fusor.utils as utils
+
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    (logs / "app.log").write_text("")
+    old = 1_000_000_000
+    os.utime(logs, ns=(old, old))
+    listings = []
+    real = utils._log_files_in
+    monkeypatch.setattr(
+        utils, "_log_files_in", lambda d, r: listings.append(d) or real(d, r), raising=True
+    )
+
+    assert utils.expand_log_paths(str(tmp_path), ["logs"]) == [os.path.join("logs", "app.log")]
+    assert utils.expand_log_paths(str(tmp_path), ["logs"]) == [os.path.join("logs", "app.log")]
+    assert len(listings) == 1
+
+    # a change the mtime does not reveal is picked up once notified
+    (logs / "web.log").write_text("")
+    os.utime(logs, ns=(old, old))
+    assert len(utils.expand_log_paths(str(tmp_path), ["logs"])) == 1
+    utils.invalidate_log_paths(str(logs))
+    assert len(utils.expand_log_paths(str(tmp_path), ["logs"])) == 2
+
+    # a new mtime invalidates the listing on its own
+    (logs / "api.log").write_text("")
+    os.utime(logs, ns=(old + 1, old + 1))
+    assert len(utils.expand_log_paths(str(tmp_path), ["logs"])) == 3
+    assert len(listings) == 3
+
+
+def test_recent_listing_is_not_reused(tmp_path):
+    from fusor.utils import expand_log_paths
+
+    # the directory was just modified, so a file added within the same
+    # mtime tick must still show up
+    assert expand_log_paths(str(tmp_path), ["."]) == []
+    (tmp_path / "app.log").write_text("")
+    assert expand_log_paths(str(tmp_path), ["."]) == ["app.log"]